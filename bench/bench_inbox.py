@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import random
+import time
+
+import bson
+
+import bench.env  # noqa: F401
+import src.database as db
+from bench.seed import seed
+from bench.stats import format_table
+from src.keyboards import INBOX_PAGE_SIZE
+
+
+def inbox_query(user_id: int) -> dict:
+    return {
+        "recipient_id": user_id,
+        "status": "delivered",
+        "is_archived": {"$ne": True},
+    }
+
+
+async def legacy_inbox(user_id: int, page: int) -> list[dict]:
+    await db.letters_collection.count_documents(inbox_query(user_id))
+    cursor = (
+        db.letters_collection.find(inbox_query(user_id))
+        .sort([("is_read", 1), ("delivered_at", -1)])
+        .skip(page * INBOX_PAGE_SIZE)
+        .limit(INBOX_PAGE_SIZE)
+    )
+    letters = await cursor.to_list(length=INBOX_PAGE_SIZE)
+
+    for letter in letters:
+        await db.get_conversation_nickname(user_id, letter["sender_id"])
+
+    return letters
+
+
+async def projected_inbox(user_id: int, page: int) -> list[dict]:
+    letters, _ = await db.get_inbox(user_id, page=page, page_size=INBOX_PAGE_SIZE)
+
+    return letters
+
+
+async def measure(load, pages: list[tuple[int, int]]) -> tuple[float, float]:
+    transferred = 0
+    started = time.perf_counter()
+
+    for user_id, page in pages:
+        letters = await load(user_id, page)
+        transferred += sum(len(bson.encode(letter)) for letter in letters)
+
+    elapsed = time.perf_counter() - started
+
+    return transferred / len(pages), elapsed / len(pages) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="BSON bytes and time per inbox page, full documents vs projected"
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--letters", type=int, default=20000)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    seeded = await seed(args.users, args.letters, seed=args.seed)
+    await db.backfill_previews()
+
+    rnd = random.Random(args.seed)
+    pages = []
+
+    for user_id in rnd.choices(seeded["user_ids"], k=args.pages):
+        total = await db.letters_collection.count_documents(inbox_query(user_id))
+        pages.append((user_id, rnd.randrange(max(1, total // INBOX_PAGE_SIZE))))
+
+    rows = []
+
+    for name, load in (
+        ("full documents", legacy_inbox),
+        ("projected", projected_inbox),
+    ):
+        per_page, ms = await measure(load, pages)
+        rows.append({"inbox page": name, "bytes/page": per_page, "ms/page": ms})
+
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
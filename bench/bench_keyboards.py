@@ -0,0 +1,89 @@
+import argparse
+import random
+import timeit
+import tracemalloc
+
+import src.keyboards as keyboards
+
+from bench.stats import format_table
+
+
+def legacy_personal_hobbies(page: int, selected: list[int]):
+    selected_mask = sum(1 << i for i in set(selected))
+
+    return keyboards._personal_hobbies.__wrapped__(page, selected_mask)
+
+
+def update_mix(cached: bool):
+    def factory(name):
+        function = getattr(keyboards, name)
+        return function if cached else function.__wrapped__
+
+    personal_hobbies = keyboards.personal_hobbies if cached else legacy_personal_hobbies
+
+    mix = {
+        "main menu": lambda rnd: factory("reply_options")(rnd.random() < 0.05),
+        "open letter": lambda rnd: factory("letter_options")(),
+        "cancel": lambda rnd: factory("cancel_menu")(),
+        "admin": lambda rnd: factory("admin_menu")(),
+        "profile": lambda rnd: factory("profile_settings")(rnd.random() < 0.5),
+        "hobbies": lambda rnd: personal_hobbies(
+            rnd.randrange(2), rnd.sample(range(len(keyboards.ALL_HOBBIES)), 3)
+        ),
+        "history nav": lambda rnd: factory("history_nav")(
+            rnd.randrange(5), rnd.random() < 0.5, rnd.random() < 0.5
+        ),
+    }
+
+    return mix
+
+
+def measure(build, number: int, seed: int) -> tuple[float, float]:
+    rnd = random.Random(seed)
+    peak = 0
+
+    tracemalloc.start()
+    for _ in range(number):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        build(rnd)
+        peak += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    rnd = random.Random(seed)
+    seconds = timeit.timeit(lambda: build(rnd), number=number)
+
+    return peak / number, seconds / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Peak allocation and time per keyboard build, uncached vs cached"
+    )
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = []
+    legacy_mix = update_mix(cached=False)
+    cached_mix = update_mix(cached=True)
+
+    for name in legacy_mix:
+        legacy = measure(legacy_mix[name], args.number, args.seed)
+        cached = measure(cached_mix[name], args.number, args.seed)
+
+        rows.append(
+            {
+                "keyboard": name,
+                "uncached peak B": legacy[0],
+                "cached peak B": cached[0],
+                "uncached us": legacy[1],
+                "cached us": cached[1],
+            }
+        )
+
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
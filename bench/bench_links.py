@@ -0,0 +1,87 @@
+import argparse
+import re
+import timeit
+
+from src.links import contains_links
+
+from bench.stats import format_table
+
+LEGACY_URL_PATTERN = re.compile(
+    r"(?:http[s]?://[^\s]+|"
+    r"www\.[^\s]+|"
+    r"ftp://[^\s]+|"
+    r"t\.me/[^\s]+|"
+    r"@\w+|"
+    r"(?:https?://)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s]*)",
+    re.IGNORECASE,
+)
+
+
+GLUED_LINKS = (
+    "лінк:t.me/abc",
+    "пиши,evil.com",
+    "дивись:https://evil.com/x",
+    "сайт(evil.com)",
+)
+
+
+def adversarial_inputs(length: int) -> dict[str, str]:
+    return {
+        "letters": "a" * length,
+        "dotted": ("a." * length)[:length],
+        "dashes": ("a-" * length)[:length] + "!",
+        "digits dots": ("1." * length)[:length],
+        "one-letter tld": ("ab." * length)[:length] + "x",
+        "cyrillic т.д.": ("т.д. і т.п. " * length)[:length],
+        "plain letter": ("Привіт, як справи? Я люблю музику і кіно. " * length)[
+            :length
+        ],
+        "glued links": ("Привіт, як справи? " * length)[: length - 15]
+        + "сайт(evil.com)",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Link detection cost on adversarial letters"
+    )
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1000, 4000])
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = []
+    for length in args.lengths:
+        for name, text in adversarial_inputs(length).items():
+            legacy = timeit.timeit(
+                lambda: LEGACY_URL_PATTERN.search(text), number=args.number
+            )
+            tokenizer = timeit.timeit(lambda: contains_links(text), number=args.number)
+
+            rows.append(
+                {
+                    "input": name,
+                    "chars": length,
+                    "regex ms": legacy / args.number * 1000,
+                    "tokenizer ms": tokenizer / args.number * 1000,
+                    "regex found": bool(LEGACY_URL_PATTERN.search(text)),
+                    "tokenizer found": contains_links(text),
+                }
+            )
+
+    print(format_table(rows))
+
+    glued = [
+        {
+            "glued link": text,
+            "regex found": bool(LEGACY_URL_PATTERN.search(text)),
+            "tokenizer found": contains_links(text),
+        }
+        for text in GLUED_LINKS
+    ]
+
+    print()
+    print(format_table(glued))
+
+
+if __name__ == "__main__":
+    main()
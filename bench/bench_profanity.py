@@ -0,0 +1,83 @@
+import argparse
+import random
+import timeit
+
+from src.profanity import ProfanityFilter, normalize
+from src.utils import BAD_WORDS
+
+from bench.stats import format_table
+
+ALPHABET = "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя"
+
+
+def synthetic_words(count: int, rnd: random.Random, texts: list[str]) -> list[str]:
+    words = list(BAD_WORDS)
+    normalized = [normalize(text)[0] for text in texts]
+
+    while len(words) < count:
+        word = "".join(rnd.choices(ALPHABET, k=rnd.randint(5, 9)))
+        if not any(normalize(word)[0] in text for text in normalized):
+            words.append(word)
+
+    return words
+
+
+def naive_contains(words: list[str], text: str) -> bool:
+    text_lower = text.lower()
+
+    for word in words:
+        if word in text_lower:
+            return True
+
+    return False
+
+
+def letter(rnd: random.Random, length: int) -> str:
+    words = []
+    while sum(len(w) + 1 for w in words) < length:
+        words.append("".join(rnd.choices(ALPHABET, k=rnd.randint(2, 9))))
+
+    return " ".join(words)[:length]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profanity check cost as the word list grows"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[42, 500, 2000, 5000])
+    parser.add_argument("--length", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    texts = [letter(rnd, args.length) for _ in range(20)]
+    rows = []
+
+    for size in args.sizes:
+        words = synthetic_words(size, rnd, texts)
+        clean = [t for t in texts if not naive_contains(words, t)]
+        profanity = ProfanityFilter(words)
+
+        naive = timeit.timeit(
+            lambda: [naive_contains(words, t) for t in clean], number=args.number
+        )
+        automaton = timeit.timeit(
+            lambda: [profanity.contains(t) for t in clean], number=args.number
+        )
+        calls = args.number * len(clean)
+
+        rows.append(
+            {
+                "words": size,
+                "naive us/call": naive / calls * 1e6,
+                "automaton us/call": automaton / calls * 1e6,
+                "states": len(profanity.automaton.goto),
+            }
+        )
+
+    print(f"{args.length}-character letters without matches (full scan)")
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import time
+
+import bench.env  # noqa: F401
+from aiogram import Dispatcher, F, Router
+from aiogram.filters import Command
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Message
+
+from bench.fake_bot import create_fake_bot
+from bench.stats import format_table
+from bench.updates import message_update, to_update
+from src.commands import CommandTable, dispatch
+
+
+class Writing(StatesGroup):
+    letter = State()
+
+
+USER_ID = 1
+
+
+async def handled(message: Message):
+    pass
+
+
+def labels(count: int) -> list[str]:
+    return [f"🔘 Пункт меню {i}" for i in range(count)]
+
+
+def filter_chain_dispatcher(count: int) -> Dispatcher:
+    router = Router()
+
+    for label in labels(count):
+        router.message.register(handled, F.text == label)
+
+    router.message.register(handled, Writing.letter, F.text)
+    router.message.register(handled, Command("start"))
+
+    dp = Dispatcher(storage=MemoryStorage())
+    dp.include_router(router)
+    return dp
+
+
+def table_dispatcher(count: int) -> Dispatcher:
+    table = CommandTable()
+
+    for label in labels(count):
+        table.label(label)(handled)
+
+    table.capture(Writing.letter)(handled)
+
+    router = Router()
+    router.message.register(dispatch, table.lookup)
+    router.message.register(handled, Command("start"))
+
+    dp = Dispatcher(storage=MemoryStorage())
+    dp.include_router(router)
+    return dp
+
+
+async def measure(dp: Dispatcher, bot, text: str, state, number: int) -> float:
+    await dp.fsm.storage.set_state(dp.fsm.get_context(bot, USER_ID, USER_ID).key, state)
+    updates = [to_update(message_update(USER_ID, text), bot) for _ in range(number)]
+
+    started = time.perf_counter()
+    for update in updates:
+        await dp.feed_update(bot, update)
+
+    return (time.perf_counter() - started) / number * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Per-message routing cost: F.text filter chain vs label table"
+    )
+    parser.add_argument("--menu-sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    bot = create_fake_bot(latency=0, jitter=0)
+    rows = []
+
+    for count in args.menu_sizes:
+        cases = {
+            "first label": (labels(count)[0], None),
+            "last label": (labels(count)[-1], None),
+            "letter body": ("Привіт! Як пройшла сесія?", Writing.letter),
+            "unmatched text": ("просто текст", None),
+        }
+
+        chain = filter_chain_dispatcher(count)
+        table = table_dispatcher(count)
+
+        for name, (text, state) in cases.items():
+            rows.append(
+                {
+                    "labels": count,
+                    "message": name,
+                    "filters us": await measure(chain, bot, text, state, args.number),
+                    "table us": await measure(table, bot, text, state, args.number),
+                }
+            )
+
+    print(format_table(rows))
+    await bot.session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,10 @@
+import os
+
+os.environ.setdefault("BOT_TOKEN", "123456789:bench-token")
+os.environ.setdefault("DATABASE_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DATABASE_NAME", "fit_chat_bot_bench")
+
+if not os.environ["DATABASE_NAME"].endswith("_bench"):
+    raise SystemExit(
+        "Benchmarks wipe their database, DATABASE_NAME must end with '_bench'"
+    )
@@ -0,0 +1,115 @@
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, Mapping, Optional
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from aiogram.methods import GetMe, TelegramMethod
+from aiogram.types import Chat, Message, User
+
+BOT_ID = 123456789
+
+
+class FakeSession(BaseSession):
+    def __init__(
+        self,
+        latency: float = 0.03,
+        jitter: float = 0.01,
+        rate_limit_ratio: float = 0.0,
+        retry_after: int = 1,
+        blocked_ids: Optional[set[int]] = None,
+        seed: int = 0,
+    ):
+        super().__init__()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.blocked_ids = blocked_ids or set()
+        self.calls: Counter = Counter()
+        self.rate_limited = 0
+        self.forbidden = 0
+        self._random = random.Random(seed)
+        self._message_id = 0
+
+    def reset(self):
+        self.calls.clear()
+        self.rate_limited = 0
+        self.forbidden = 0
+
+    async def make_request(
+        self, bot: Bot, method: TelegramMethod, timeout: Optional[int] = None
+    ) -> Any:
+        name = type(method).__name__
+        self.calls[name] += 1
+
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.rate_limit_ratio and self._random.random() < self.rate_limit_ratio:
+            self.rate_limited += 1
+            raise TelegramRetryAfter(
+                method=method,
+                message=f"Too Many Requests: retry after {self.retry_after}",
+                retry_after=self.retry_after,
+            )
+
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id in self.blocked_ids:
+            self.forbidden += 1
+            raise TelegramForbiddenError(
+                method=method, message="Forbidden: bot was blocked by the user"
+            )
+
+        return self._result(bot, method)
+
+    def _result(self, bot: Bot, method: TelegramMethod) -> Any:
+        if isinstance(method, GetMe):
+            return User(id=BOT_ID, is_bot=True, first_name="bench").as_(bot)
+
+        if method.__returning__ is bool:
+            return True
+
+        self._message_id += 1
+        chat_id = getattr(method, "chat_id", None) or 0
+        message = Message(
+            message_id=getattr(method, "message_id", None) or self._message_id,
+            date=datetime.now(),
+            chat=Chat(id=chat_id, type="private"),
+            text=getattr(method, "text", None),
+        )
+        return message.as_(bot)
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+    async def close(self):
+        pass
+
+
+def create_fake_bot(**session_kwargs: Any) -> Bot:
+    from aiogram.client.default import DefaultBotProperties
+    from aiogram.enums import ParseMode
+
+    from config import TOKEN
+
+    return Bot(
+        token=TOKEN,
+        session=FakeSession(**session_kwargs),
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+
+
+def calls_summary(calls: Mapping[str, int]) -> str:
+    return ", ".join(f"{name}={count}" for name, count in calls.most_common())
@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import itertools
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterator
+
+import bench.env  # noqa: F401
+from bson import ObjectId
+from config import DATABASE_NAME, DATABASE_URL
+from src.keyboards import ALL_HOBBIES
+from src.utils import letter_preview
+
+FIRST_USER_ID = 10_000_000
+
+COURSES = ["1-ий", "2-ий", "3-ий", "4-ий", "5-ий", "6-ий"]
+COURSE_WEIGHTS = [0.3, 0.25, 0.2, 0.14, 0.08, 0.03]
+
+STATUS_WEIGHTS = {
+    "delivered": 0.9,
+    "pending": 0.03,
+    "failed": 0.04,
+    "reported": 0.02,
+    "resolved": 0.01,
+}
+
+WORDS = (
+    "привіт як твої справи сьогодні я слухав музику читав книгу гуляв парком "
+    "хочу розповісти про подорож мрію спорт кіно навчання сесія пари викладач "
+    "кава осінь дощ сонце друзі гуртожиток бібліотека концерт фото малювання"
+).split()
+SYLLABLES = "ка ло ри ту ве на ми со да ні бу ра ко ле ти жа".split()
+VOCABULARY = WORDS + ["".join(word) for word in itertools.product(SYLLABLES, repeat=3)]
+
+
+def letter_text(rnd: random.Random, min_words: int = 6, max_words: int = 40) -> str:
+    return " ".join(rnd.choices(VOCABULARY, k=rnd.randint(min_words, max_words)))
+
+
+def zipf_cum_weights(n: int, exponent: float) -> list[float]:
+    return list(
+        itertools.accumulate(1.0 / (rank**exponent) for rank in range(1, n + 1))
+    )
+
+
+def deterministic_id(created_at: datetime, shard: int, counter: int) -> ObjectId:
+    return ObjectId(
+        struct.pack(">III", int(created_at.timestamp()) & 0xFFFFFFFF, shard, counter)
+    )
+
+
+def user_docs(rnd: random.Random, user_ids: list[int], hobby_exponent: float = 1.1):
+    hobby_order = ALL_HOBBIES[:]
+    rnd.shuffle(hobby_order)
+    hobby_weights = zipf_cum_weights(len(hobby_order), hobby_exponent)
+
+    for user_id in user_ids:
+        wanted = rnd.randint(2, 5)
+        hobbies = []
+        while len(hobbies) < wanted:
+            hobby = rnd.choices(hobby_order, cum_weights=hobby_weights)[0]
+            if hobby not in hobbies:
+                hobbies.append(hobby)
+
+        yield {
+            "user_id": user_id,
+            "hobbies": hobbies,
+            "course": rnd.choices(COURSES, weights=COURSE_WEIGHTS)[0],
+            "is_active": rnd.random() > 0.02,
+            "is_admin": False,
+            "settings": {"filter_course": rnd.random() < 0.15},
+        }
+
+
+class LetterGraph:
+    def __init__(
+        self,
+        rnd: random.Random,
+        users: int,
+        shard: int = 0,
+        days: int = 365,
+        reply_ratio: float = 0.35,
+        activity_exponent: float = 0.8,
+        now: datetime = None,
+    ):
+        self.rnd = rnd
+        self.users = users
+        self.shard = shard
+        self.days = days
+        self.reply_ratio = reply_ratio
+        self.now = now or datetime(2026, 1, 1)
+        self.cum_weights = zipf_cum_weights(users, activity_exponent)
+        self.permutation = list(range(users))
+        random.Random(0).shuffle(self.permutation)
+        self.statuses = list(STATUS_WEIGHTS)
+        self.status_weights = list(STATUS_WEIGHTS.values())
+        self.recent: list[tuple] = []
+        self.counter = 0
+
+    def _pick_user(self) -> int:
+        rank = self.rnd.choices(range(self.users), cum_weights=self.cum_weights)[0]
+        return FIRST_USER_ID + self.permutation[rank]
+
+    def _content(self) -> str:
+        return " ".join(self.rnd.choices(WORDS, k=self.rnd.randint(4, 60)))
+
+    def letters(self, count: int) -> Iterator[dict]:
+        rnd = self.rnd
+        span = self.days * 24 * 3600
+
+        for _ in range(count):
+            parent_id = None
+
+            if self.recent and rnd.random() < self.reply_ratio:
+                parent_id, parent_sender, parent_recipient, parent_at = rnd.choice(
+                    self.recent
+                )
+                sender_id, recipient_id = parent_recipient, parent_sender
+                created_at = min(
+                    self.now, parent_at + timedelta(minutes=rnd.randint(60, 60 * 72))
+                )
+            else:
+                sender_id = self._pick_user()
+                recipient_id = self._pick_user()
+                while recipient_id == sender_id:
+                    recipient_id = self._pick_user()
+                created_at = self.now - timedelta(seconds=rnd.randint(0, span))
+
+            status = rnd.choices(self.statuses, weights=self.status_weights)[0]
+            self.counter += 1
+            letter_id = deterministic_id(created_at, self.shard, self.counter)
+            content = self._content()
+
+            letter = {
+                "_id": letter_id,
+                "sender_id": sender_id,
+                "recipient_id": recipient_id,
+                "content": content,
+                "preview": letter_preview(content),
+                "status": status,
+                "is_read": status == "delivered" and rnd.random() < 0.7,
+                "is_archived": status == "delivered" and rnd.random() < 0.3,
+                "parent_id": parent_id,
+                "created_at": created_at,
+                "deliver_at": created_at + timedelta(hours=rnd.choice((0, 1, 2))),
+            }
+
+            if status in ("delivered", "reported", "resolved"):
+                letter["delivered_at"] = letter["deliver_at"]
+            if status == "failed":
+                letter["failure_reason"] = "user_blocked"
+                letter["failed_at"] = letter["deliver_at"]
+            if status in ("reported", "resolved"):
+                letter["reported_by"] = recipient_id
+            if status == "resolved":
+                letter["report_resolution"] = rnd.choice(("dismissed", "warned"))
+
+            if status == "delivered":
+                entry = (letter_id, sender_id, recipient_id, created_at)
+                if len(self.recent) < 10_000:
+                    self.recent.append(entry)
+                else:
+                    self.recent[rnd.randrange(len(self.recent))] = entry
+
+            yield letter
+
+
+def _batched(docs: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    while True:
+        batch = list(itertools.islice(docs, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _insert_users(seed: int, shard: int, user_ids: list[int], batch_size: int) -> int:
+    from pymongo import MongoClient
+
+    collection = MongoClient(DATABASE_URL)[DATABASE_NAME]["users"]
+    rnd = random.Random(f"{seed}:users:{shard}")
+    inserted = 0
+
+    for batch in _batched(user_docs(rnd, user_ids), batch_size):
+        collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+        inserted += len(batch)
+
+    return inserted
+
+
+def _insert_letters(
+    seed: int, shard: int, users: int, count: int, days: int, batch_size: int
+) -> int:
+    from pymongo import MongoClient
+
+    collection = MongoClient(DATABASE_URL)[DATABASE_NAME]["letters"]
+    rnd = random.Random(f"{seed}:letters:{shard}")
+    graph = LetterGraph(rnd, users, shard=shard, days=days)
+    inserted = 0
+
+    for batch in _batched(graph.letters(count), batch_size):
+        collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+        inserted += len(batch)
+
+    return inserted
+
+
+def _split(total: int, parts: int) -> list[int]:
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def generate(
+    users: int, letters: int, seed: int, workers: int, days: int, batch_size: int
+):
+    from pymongo import MongoClient
+
+    client = MongoClient(DATABASE_URL)
+    client.drop_database(DATABASE_NAME)
+
+    user_ids = list(range(FIRST_USER_ID, FIRST_USER_ID + users))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        started = time.perf_counter()
+        chunks = [user_ids[i::workers] for i in range(workers)]
+        futures = [
+            pool.submit(_insert_users, seed, shard, chunk, batch_size)
+            for shard, chunk in enumerate(chunks)
+        ]
+        inserted_users = sum(f.result() for f in futures)
+        print(
+            f"users: {inserted_users} in {time.perf_counter() - started:.1f}s",
+            flush=True,
+        )
+
+        started = time.perf_counter()
+        futures = [
+            pool.submit(_insert_letters, seed, shard, users, count, days, batch_size)
+            for shard, count in enumerate(_split(letters, workers))
+        ]
+        inserted_letters = sum(f.result() for f in futures)
+        print(
+            f"letters: {inserted_letters} in {time.perf_counter() - started:.1f}s",
+            flush=True,
+        )
+
+    import src.database as db
+
+    started = time.perf_counter()
+    asyncio.run(db.init_indexes())
+    print(f"indexes: {time.perf_counter() - started:.1f}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Deterministic synthetic users and letters for load fixtures"
+    )
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--letters", type=int, default=50_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--workers", type=int, default=8, help="part of the seed: shards per worker"
+    )
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    generate(
+        args.users, args.letters, args.seed, args.workers, args.days, args.batch_size
+    )
@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+import bench.env  # noqa: F401
+from pymongo import monitoring
+
+from bench.stats import Recorder, format_table, percentile
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.in_use = 0
+        self.max_in_use = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.checkouts = 0
+        self.failed = 0
+        self.opened = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.opened += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def connection_check_out_failed(self, event):
+        self.waiting -= 1
+        self.failed += 1
+
+    def connection_checked_out(self, event):
+        self.waiting -= 1
+        self.in_use += 1
+        self.checkouts += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+
+pool_monitor = PoolMonitor()
+monitoring.register(pool_monitor)
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class LoadDriver:
+    def __init__(self, ctx, think_time: float, new_user_ratio: float, seed: int):
+        self.ctx = ctx
+        self.think_time = think_time
+        self.new_user_ratio = new_user_ratio
+        self.rnd = random.Random(seed)
+        self.updates = Recorder("update")
+        self.sessions = 0
+
+    async def _step(self, raw: dict):
+        with self.updates.measure():
+            await self.ctx.feed(raw)
+
+        if self.think_time:
+            await asyncio.sleep(self.rnd.uniform(0, 2 * self.think_time))
+
+    async def new_student(self):
+        from bench.generate import letter_text
+        from bench.updates import callback_update, message_update
+        from src import callbacks
+
+        user_id = self.ctx.new_user_id()
+
+        await self._step(message_update(user_id, "/start"))
+        await self._step(
+            callback_update(user_id, callbacks.pack(callbacks.COURSE, course=0))
+        )
+        for hobby in self.rnd.sample(range(6), 3):
+            await self._step(
+                callback_update(
+                    user_id,
+                    callbacks.pack(callbacks.HOBBY_TOGGLE, hobby=hobby, page=0),
+                )
+            )
+        await self._step(
+            callback_update(user_id, callbacks.pack(callbacks.HOBBY_CONFIRM))
+        )
+        await self._step(message_update(user_id, "✍️ Написати листа"))
+        await self._step(message_update(user_id, letter_text(self.rnd)))
+
+    async def returning_student(self):
+        import src.database as db
+        from bench.generate import letter_text
+        from bench.updates import callback_update, message_update
+        from src import callbacks
+
+        user_id = self.rnd.choice(self.ctx.user_ids)
+
+        await self._step(message_update(user_id, "📬 Вхідні листи"))
+
+        letter = await db.letters_collection.find_one(
+            {"recipient_id": user_id, "status": "delivered"}, {"_id": 1}
+        )
+        if not letter:
+            return
+
+        await self._step(
+            callback_update(
+                user_id, callbacks.pack(callbacks.READ_LETTER, letter_id=letter["_id"])
+            )
+        )
+        await self._step(message_update(user_id, "✍️ Відповісти"))
+        await self._step(message_update(user_id, letter_text(self.rnd)))
+
+    async def session_loop(self, deadline: float):
+        while time.perf_counter() < deadline:
+            try:
+                if self.rnd.random() < self.new_user_ratio:
+                    await self.new_student()
+                else:
+                    await self.returning_student()
+            except Exception as e:
+                logging.getLogger(__name__).debug(f"Session failed: {e}")
+            self.sessions += 1
+
+
+async def run_level(ctx, concurrency: int, duration: float, args) -> dict:
+    from src.background import lane
+
+    driver = LoadDriver(ctx, args.think_time, args.new_user_ratio, args.seed)
+    lag = LoopLagMonitor()
+    pool_monitor.reset()
+    ctx.bot.session.reset()
+
+    lag.start()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(driver.session_loop(deadline) for _ in range(concurrency)))
+    await lane.idle()
+    driver.updates.stop()
+    await lag.stop()
+
+    row = driver.updates.row()
+    return {
+        "students": concurrency,
+        "updates": row["ops"],
+        "upd/s": row["ops/s"],
+        "errors": row["errors"],
+        "p50 ms": row["p50 ms"],
+        "p99 ms": row["p99 ms"],
+        "lag p99 ms": percentile(lag.samples, 99) * 1000,
+        "lag max ms": max(lag.samples, default=0.0) * 1000,
+        "pool max": pool_monitor.max_in_use,
+        "pool wait": pool_monitor.max_waiting,
+        "api calls": sum(ctx.bot.session.calls.values()),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Replay concurrent student sessions through dp.feed_update"
+    )
+    parser.add_argument("--levels", type=int, nargs="+", default=[50, 200, 500, 1000])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--new-user-ratio", type=float, default=0.2)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--letters", type=int, default=50000)
+    parser.add_argument(
+        "--no-seed",
+        action="store_true",
+        help="reuse fixtures written by bench.generate (--users must match)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    import run
+    from aiogram import Dispatcher
+    from aiogram.fsm.storage.memory import MemoryStorage
+
+    from bench.fake_bot import create_fake_bot
+    from bench.generate import FIRST_USER_ID
+    from bench.scenarios import BenchContext
+    from bench.seed import ADMIN_ID, seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    bot = create_fake_bot(latency=args.latency_ms / 1000, seed=args.seed)
+    dp = Dispatcher(storage=MemoryStorage())
+    run.setup_dispatcher(dp)
+
+    if args.no_seed:
+        user_ids = list(range(FIRST_USER_ID, FIRST_USER_ID + args.users))
+        seeded = {"user_ids": user_ids, "admin_id": ADMIN_ID, "pairs": []}
+    else:
+        print(f"Seeding {args.users} users and {args.letters} letters...")
+        seeded = await seed(args.users, args.letters, seed=args.seed)
+
+    ctx = BenchContext(
+        bot,
+        dp,
+        seeded,
+        seed=args.seed,
+        first_new_user_id=FIRST_USER_ID + args.users + 1_000_000,
+    )
+
+    rows = []
+    for level in args.levels:
+        print(f"Running {level} concurrent students for {args.duration:.0f}s...")
+        rows.append(await run_level(ctx, level, args.duration, args))
+
+    print()
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+import aiohttp
+
+from bench.stats import Recorder, format_table
+from bench.updates import callback_update, message_update
+from src import callbacks
+
+
+def load_updates(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_updates(count: int, users: int, seed: int) -> list[dict]:
+    from bench.generate import FIRST_USER_ID
+
+    rnd = random.Random(seed)
+    updates = []
+
+    for _ in range(count):
+        user_id = FIRST_USER_ID + rnd.randrange(users)
+        if rnd.random() < 0.7:
+            text = rnd.choice(["📬 Вхідні листи", "👤 Профіль", "📚 Історія листувань"])
+            updates.append(message_update(user_id, text))
+        else:
+            updates.append(callback_update(user_id, callbacks.pack(callbacks.NOOP)))
+
+    return updates
+
+
+async def post_all(url: str, secret: str, updates: list[dict], concurrency: int):
+    recorder = Recorder("webhook POST")
+    statuses: Counter = Counter()
+    pending = iter(updates)
+
+    async with aiohttp.ClientSession(
+        headers={"X-Telegram-Bot-Api-Secret-Token": secret}
+    ) as session:
+
+        async def worker():
+            for update in pending:
+                with recorder.measure():
+                    async with session.post(url, json=update) as response:
+                        statuses[response.status] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    recorder.stop()
+    return recorder, statuses
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="POST captured or synthetic updates to a local webhook"
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8080/webhook")
+    parser.add_argument("--secret", required=True)
+    parser.add_argument("--file", help="JSON lines file with raw Telegram updates")
+    parser.add_argument("--synthetic", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    if args.file:
+        updates = load_updates(args.file)
+    else:
+        updates = synthetic_updates(args.synthetic, args.users, args.seed)
+
+    started = time.perf_counter()
+    recorder, statuses = await post_all(
+        args.url, args.secret, updates, args.concurrency
+    )
+
+    print(format_table([recorder.row()]))
+    print(f"statuses: {dict(statuses)} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
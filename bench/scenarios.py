@@ -0,0 +1,137 @@
+import asyncio
+import itertools
+import random
+from typing import Awaitable, Callable
+
+from aiogram import Bot, Dispatcher
+
+import bench.env  # noqa: F401
+from bench.seed import add_due_letters
+from bench.updates import callback_update, message_update, to_update
+from src import callbacks
+from src.states import AdminState
+
+
+class BenchContext:
+    def __init__(
+        self,
+        bot: Bot,
+        dp: Dispatcher,
+        seeded: dict,
+        seed: int = 0,
+        first_new_user_id: int = None,
+    ):
+        self.bot = bot
+        self.dp = dp
+        self.user_ids = seeded["user_ids"]
+        self.admin_id = seeded["admin_id"]
+        self.pairs = seeded["pairs"]
+        self.rnd = random.Random(seed)
+        self._senders = itertools.cycle(self.user_ids)
+        self._new_users = itertools.count(
+            first_new_user_id or max(self.user_ids) + 1
+        )
+
+    async def feed(self, raw: dict):
+        return await self.dp.feed_update(self.bot, to_update(raw, self.bot))
+
+    def new_user_id(self) -> int:
+        return next(self._new_users)
+
+    def next_sender(self) -> int:
+        return next(self._senders)
+
+
+async def registration(ctx: BenchContext):
+    user_id = ctx.new_user_id()
+
+    await ctx.feed(message_update(user_id, "/start"))
+    await ctx.feed(callback_update(user_id, callbacks.pack(callbacks.COURSE, course=0)))
+    for hobby in (0, 1):
+        await ctx.feed(
+            callback_update(
+                user_id, callbacks.pack(callbacks.HOBBY_TOGGLE, hobby=hobby, page=0)
+            )
+        )
+    await ctx.feed(callback_update(user_id, callbacks.pack(callbacks.HOBBY_CONFIRM)))
+
+
+async def send_letter(ctx: BenchContext):
+    user_id = ctx.next_sender()
+
+    await ctx.feed(message_update(user_id, "✍️ Написати листа"))
+    await ctx.feed(
+        message_update(user_id, "Привіт! Це тестовий лист для бенчмарку бота.")
+    )
+
+
+async def open_inbox(ctx: BenchContext):
+    user_id = ctx.rnd.choice(ctx.user_ids)
+
+    await ctx.feed(message_update(user_id, "📬 Вхідні листи"))
+
+
+async def page_history(ctx: BenchContext):
+    me_id, other_id = ctx.rnd.choice(ctx.pairs)
+
+    await ctx.feed(message_update(me_id, "📚 Історія листувань"))
+    await ctx.feed(
+        callback_update(me_id, callbacks.pack(callbacks.BOOK_THREAD, other_id=other_id))
+    )
+    for page in (1, 0):
+        await ctx.feed(
+            callback_update(me_id, callbacks.pack(callbacks.HISTORY_PAGE, page=page))
+        )
+
+
+async def mailman_drain(ctx: BenchContext):
+    from run import send_due_letters
+
+    await add_due_letters(ctx.user_ids, 50, seed=ctx.rnd.randint(0, 1 << 30))
+    await send_due_letters(ctx.bot)
+
+
+async def broadcast(ctx: BenchContext):
+    state = ctx.dp.fsm.get_context(ctx.bot, ctx.admin_id, ctx.admin_id)
+    await state.set_state(AdminState.waiting_for_broadcast)
+
+    await ctx.feed(message_update(ctx.admin_id, "Тестова розсилка для бенчмарку"))
+
+
+Scenario = Callable[[BenchContext], Awaitable[None]]
+
+SCENARIOS: dict[str, tuple[Scenario, int]] = {
+    "registration": (registration, 1),
+    "send_letter": (send_letter, 1),
+    "open_inbox": (open_inbox, 1),
+    "page_history": (page_history, 1),
+    "mailman_drain": (mailman_drain, 50),
+    "broadcast": (broadcast, 0),
+}
+
+
+def iterations_for(name: str, iterations: int) -> int:
+    _, divisor = SCENARIOS[name]
+    if divisor == 0:
+        return 1
+
+    return max(1, iterations // divisor)
+
+
+async def run_scenario(
+    ctx: BenchContext, name: str, iterations: int, concurrency: int, recorder
+):
+    scenario, _ = SCENARIOS[name]
+    budget = iter(range(iterations_for(name, iterations)))
+    workers = 1 if name in ("mailman_drain", "broadcast") else concurrency
+
+    async def worker():
+        for _ in budget:
+            try:
+                with recorder.measure():
+                    await scenario(ctx)
+            except Exception:
+                pass
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    recorder.stop()
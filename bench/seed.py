@@ -0,0 +1,84 @@
+import random
+from datetime import datetime, timedelta
+
+import bench.env  # noqa: F401
+import src.database as db
+from bench.generate import FIRST_USER_ID, LetterGraph, user_docs
+from src.keyboards import ALL_HOBBIES
+from src.utils import letter_preview
+
+ADMIN_ID = FIRST_USER_ID - 1
+
+
+async def reset_database():
+    await db.client.drop_database(db.db.name)
+    await db.init_indexes()
+
+
+async def seed(users: int, letters: int, seed: int = 0) -> dict:
+    rnd = random.Random(seed)
+
+    await reset_database()
+
+    user_ids = list(range(FIRST_USER_ID, FIRST_USER_ID + users))
+    docs = list(user_docs(rnd, user_ids))
+    for doc in docs:
+        doc["is_active"] = True
+    docs.append(
+        {
+            "user_id": ADMIN_ID,
+            "hobbies": ALL_HOBBIES[:2],
+            "course": "1-ий",
+            "is_active": True,
+            "is_admin": True,
+            "settings": {"filter_course": False},
+        }
+    )
+    await db.users_collection.insert_many(docs, ordered=False)
+
+    pairs = []
+    graph = LetterGraph(rnd, users, days=60, now=datetime.now())
+    batch = []
+    for letter in graph.letters(letters):
+        batch.append(letter)
+        if letter["status"] == "delivered":
+            pairs.append((letter["sender_id"], letter["recipient_id"]))
+
+        if len(batch) >= 10_000:
+            await db.letters_collection.insert_many(batch, ordered=False)
+            batch = []
+
+    if batch:
+        await db.letters_collection.insert_many(batch, ordered=False)
+
+    await db.reconcile_counters()
+
+    return {"user_ids": user_ids, "admin_id": ADMIN_ID, "pairs": pairs}
+
+
+async def add_due_letters(user_ids: list[int], count: int, seed: int = 0):
+    rnd = random.Random(seed)
+    now = datetime.now()
+    docs = []
+
+    for i in range(count):
+        sender_id, recipient_id = rnd.sample(user_ids, 2)
+        content = f"Лист на доставку №{i}"
+        docs.append(
+            {
+                "sender_id": sender_id,
+                "recipient_id": recipient_id,
+                "content": content,
+                "preview": letter_preview(content),
+                "status": "pending",
+                "is_read": False,
+                "is_archived": False,
+                "parent_id": None,
+                "created_at": now,
+                "deliver_at": now - timedelta(seconds=1),
+            }
+        )
+
+    if docs:
+        await db.letters_collection.insert_many(docs, ordered=False)
+        await db.increment_counter("letters_total", amount=len(docs))
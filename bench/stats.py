@@ -0,0 +1,76 @@
+import math
+import time
+from contextlib import contextmanager
+from typing import Iterable
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+
+    return ordered[index]
+
+
+class Recorder:
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: list[float] = []
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @contextmanager
+    def measure(self):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.samples.append(time.perf_counter() - start)
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def row(self) -> dict:
+        ops = len(self.samples)
+        return {
+            "scenario": self.name,
+            "ops": ops,
+            "errors": self.errors,
+            "ops/s": ops / self.elapsed if self.elapsed else 0.0,
+            "p50 ms": percentile(self.samples, 50) * 1000,
+            "p95 ms": percentile(self.samples, 95) * 1000,
+            "p99 ms": percentile(self.samples, 99) * 1000,
+            "max ms": max(self.samples, default=0.0) * 1000,
+        }
+
+
+def format_table(rows: Iterable[dict]) -> str:
+    rows = list(rows)
+    if not rows:
+        return ""
+
+    headers = list(rows[0])
+    cells = [
+        [f"{row[h]:.2f}" if isinstance(row[h], float) else str(row[h]) for h in headers]
+        for row in rows
+    ]
+    widths = [
+        max(len(h), *(len(line[i]) for line in cells)) for i, h in enumerate(headers)
+    ]
+
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for line in cells:
+        lines.append("  ".join(c.ljust(w) for c, w in zip(line, widths)))
+
+    return "\n".join(lines)
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import logging
+
+import bench.env  # noqa: F401
+from aiogram import Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bench.fake_bot import calls_summary, create_fake_bot
+from bench.scenarios import SCENARIOS, BenchContext, run_scenario
+from bench.seed import seed
+from bench.stats import Recorder, format_table
+from src.background import lane
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Offline benchmark: fake Telegram API + local MongoDB"
+    )
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--letters", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    import run
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    bot = create_fake_bot(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        rate_limit_ratio=args.rate_limit,
+        seed=args.seed,
+    )
+    dp = Dispatcher(storage=MemoryStorage())
+    run.setup_dispatcher(dp)
+
+    print(f"Seeding {args.users} users and {args.letters} letters...")
+    seeded = await seed(args.users, args.letters, seed=args.seed)
+    ctx = BenchContext(bot, dp, seeded, seed=args.seed)
+
+    rows = []
+    for name in args.scenarios:
+        bot.session.reset()
+        recorder = Recorder(name)
+        await run_scenario(ctx, name, args.iterations, args.concurrency, recorder)
+        await lane.idle()
+
+        row = recorder.row()
+        row["api calls"] = sum(bot.session.calls.values())
+        row["429s"] = bot.session.rate_limited
+        rows.append(row)
+
+        print(f"{name}: {calls_summary(bot.session.calls)}")
+
+    print()
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main())
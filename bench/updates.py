@@ -0,0 +1,52 @@
+import itertools
+import time
+
+from aiogram import Bot
+from aiogram.types import Update
+
+_update_ids = itertools.count(1)
+_message_ids = itertools.count(1)
+_callback_ids = itertools.count(1)
+
+
+def _user(user_id: int) -> dict:
+    return {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"}
+
+
+def _message(user_id: int, text: str, message_id: int = None) -> dict:
+    message = {
+        "message_id": message_id or next(_message_ids),
+        "date": int(time.time()),
+        "chat": {"id": user_id, "type": "private"},
+        "from": _user(user_id),
+        "text": text,
+    }
+
+    if text.startswith("/"):
+        command = text.split()[0]
+        message["entities"] = [
+            {"type": "bot_command", "offset": 0, "length": len(command)}
+        ]
+
+    return message
+
+
+def message_update(user_id: int, text: str) -> dict:
+    return {"update_id": next(_update_ids), "message": _message(user_id, text)}
+
+
+def callback_update(user_id: int, data: str, message_text: str = "*") -> dict:
+    return {
+        "update_id": next(_update_ids),
+        "callback_query": {
+            "id": str(next(_callback_ids)),
+            "from": _user(user_id),
+            "chat_instance": str(user_id),
+            "message": _message(user_id, message_text),
+            "data": data,
+        },
+    }
+
+
+def to_update(raw: dict, bot: Bot) -> Update:
+    return Update.model_validate(raw, context={"bot": bot})
@@ -5,9 +5,68 @@ load_dotenv()
 
 TOKEN = os.getenv("BOT_TOKEN")
 DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "fit_chat_bot")
+
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "32"))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+
+FSM_STORAGE = os.getenv("FSM_STORAGE", "mongo")
+FSM_STATE_TTL_HOURS = int(os.getenv("FSM_STATE_TTL_HOURS", "72"))
+
+SPAM_WINDOW_DAYS = int(os.getenv("SPAM_WINDOW_DAYS", "3"))
+SPAM_INDEX_SIZE = int(os.getenv("SPAM_INDEX_SIZE", "50000"))
+SPAM_CHAIN_SENDERS = int(os.getenv("SPAM_CHAIN_SENDERS", "3"))
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "false").lower() == "true"
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "8"))
+PREFETCH_TTL_SECONDS = float(os.getenv("PREFETCH_TTL_SECONDS", "30"))
+
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "8"))
+BACKGROUND_QUEUE_SIZE = int(os.getenv("BACKGROUND_QUEUE_SIZE", "1000"))
+
+ADMIN_CACHE_SECONDS = int(os.getenv("ADMIN_CACHE_SECONDS", "300"))
+ADMIN_NOTIFY_WINDOW_SECONDS = int(os.getenv("ADMIN_NOTIFY_WINDOW_SECONDS", "60"))
+ADMIN_NOTIFY_RATE = float(os.getenv("ADMIN_NOTIFY_RATE", "20"))
+
+REPORT_LEASE_SECONDS = int(os.getenv("REPORT_LEASE_SECONDS", "300"))
+MAILMAN_LEASE_SECONDS = int(os.getenv("MAILMAN_LEASE_SECONDS", "300"))
+
+STATS_RECONCILE_MINUTES = int(os.getenv("STATS_RECONCILE_MINUTES", "60"))
+ROLLUP_INTERVAL_MINUTES = int(os.getenv("ROLLUP_INTERVAL_MINUTES", "15"))
+ROLLUP_MAX_HOURS = int(os.getenv("ROLLUP_MAX_HOURS", "168"))
+ROLLUP_GRACE_SECONDS = int(os.getenv("ROLLUP_GRACE_SECONDS", "60"))
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_INTERVAL_MINUTES = int(os.getenv("ARCHIVE_INTERVAL_MINUTES", "60"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_MAX_BATCHES = int(os.getenv("ARCHIVE_MAX_BATCHES", "20"))
+
+RETENTION_FAILED_DAYS = int(os.getenv("RETENTION_FAILED_DAYS", "30"))
+RETENTION_RESOLVED_DAYS = int(os.getenv("RETENTION_RESOLVED_DAYS", "180"))
+RETENTION_INTERVAL_MINUTES = int(os.getenv("RETENTION_INTERVAL_MINUTES", "60"))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", "20"))
+
+WRITE_BEHIND_INTERVAL_MS = int(os.getenv("WRITE_BEHIND_INTERVAL_MS", "500"))
+WRITE_BEHIND_MAX_OPS = int(os.getenv("WRITE_BEHIND_MAX_OPS", "500"))
 
 if not TOKEN:
     raise ValueError("No BOT_TOKEN found in environment variables")
 
 if not DATABASE_URL:
     raise ValueError("No DATABASE_URL found in environment variables")
+
+if BOT_MODE not in ("polling", "webhook"):
+    raise ValueError(f"Unknown BOT_MODE: {BOT_MODE}")
+
+if FSM_STORAGE not in ("mongo", "memory"):
+    raise ValueError(f"Unknown FSM_STORAGE: {FSM_STORAGE}")
+
+if BOT_MODE == "webhook" and not WEBHOOK_SECRET:
+    raise ValueError("No WEBHOOK_SECRET found in environment variables")
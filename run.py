@@ -10,16 +10,33 @@ from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 import src.database as db
+import config
 from config import TOKEN
 from src.handlers import router as main_router
-from src.middlewares import CheckRegistrationMiddleware
+from src.middlewares import (
+    CallbackDataMiddleware,
+    CheckRegistrationMiddleware,
+    PrefetchMiddleware,
+)
+from src.background import lane
 from src.messages import MESSAGES
+from src.notifications import notifier
+from src.storage import MongoStorage
+from src.webhook import WebhookServer
+from src.writebehind import write_behind
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 logger = logging.getLogger(__name__)
 
+if config.FSM_STORAGE == "memory":
+    storage = MemoryStorage()
+else:
+    storage = MongoStorage(
+        db.fsm_states_collection, state_ttl=config.FSM_STATE_TTL_HOURS * 3600
+    )
+
 bot = Bot(token=TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-dp = Dispatcher(storage=MemoryStorage())
+dp = Dispatcher(storage=storage)
 scheduler = AsyncIOScheduler()
 
 sending_lock = False
@@ -37,7 +54,7 @@ async def send_due_letters(bot: Bot):
     sending_lock = True
 
     try:
-        due_letters = await db.get_letters(limit=50)
+        due_letters = await db.claim_due_letters(limit=50)
 
         if not due_letters:
             return
@@ -67,6 +84,7 @@ async def send_due_letters(bot: Bot):
                     f"Mailman: hit rate limit, sleeping for {e.retry_after} seconds"
                 )
 
+                await db.release_letter(letter["_id"])
                 await asyncio.sleep(e.retry_after)
 
             except Exception as e:
@@ -83,20 +101,87 @@ async def send_due_letters(bot: Bot):
         sending_lock = False
 
 
+def setup_dispatcher(dispatcher: Dispatcher):
+    dispatcher.message.middleware(CheckRegistrationMiddleware())
+    dispatcher.callback_query.outer_middleware(CallbackDataMiddleware())
+    dispatcher.callback_query.middleware(CheckRegistrationMiddleware())
+
+    if config.PREFETCH_ENABLED:
+        dispatcher.message.middleware(PrefetchMiddleware())
+        dispatcher.callback_query.middleware(PrefetchMiddleware())
+
+    dispatcher.include_router(main_router)
+    dispatcher.shutdown.register(notifier.close)
+    dispatcher.shutdown.register(write_behind.close)
+    dispatcher.shutdown.register(lane.drain)
+
+
 async def main():
     await db.init_indexes()
+    await db.reconcile_counters()
+    spam_warmup = asyncio.create_task(db.warm_spam_index())
+    preview_backfill = asyncio.create_task(db.backfill_previews())
+
+    if isinstance(storage, MongoStorage):
+        await storage.init()
 
-    dp.message.middleware(CheckRegistrationMiddleware())
-    dp.callback_query.middleware(CheckRegistrationMiddleware())
-    dp.include_router(main_router)
+    setup_dispatcher(dp)
 
     scheduler.add_job(send_due_letters, "interval", minutes=1, args=[bot])
+    scheduler.add_job(
+        db.reconcile_counters, "interval", minutes=config.STATS_RECONCILE_MINUTES
+    )
+    scheduler.add_job(
+        db.rollup_activity, "interval", minutes=config.ROLLUP_INTERVAL_MINUTES
+    )
+    if config.ARCHIVE_AFTER_DAYS:
+        scheduler.add_job(
+            db.archive_old_letters,
+            "interval",
+            minutes=config.ARCHIVE_INTERVAL_MINUTES,
+        )
+    scheduler.add_job(
+        db.sweep_expired_letters,
+        "interval",
+        minutes=config.RETENTION_INTERVAL_MINUTES,
+    )
     scheduler.start()
 
     logger.info("Bot started")
 
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    if config.BOT_MODE == "webhook":
+        await run_webhook()
+    else:
+        await bot.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot)
+
+
+async def run_webhook():
+    server = WebhookServer(
+        dp,
+        bot,
+        secret=config.WEBHOOK_SECRET,
+        path=config.WEBHOOK_PATH,
+        workers=config.WEBHOOK_WORKERS,
+        queue_size=config.WEBHOOK_QUEUE_SIZE,
+    )
+
+    await dp.emit_startup(bot=bot)
+    await server.start(config.WEBHOOK_HOST, config.WEBHOOK_PORT)
+
+    if config.WEBHOOK_URL:
+        await bot.set_webhook(
+            config.WEBHOOK_URL.rstrip("/") + config.WEBHOOK_PATH,
+            secret_token=config.WEBHOOK_SECRET,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        await dp.emit_shutdown(bot=bot)
+        await bot.session.close()
 
 
 if __name__ == "__main__":
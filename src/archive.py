@@ -0,0 +1,72 @@
+import zlib
+from typing import AsyncIterator, Callable
+
+from bson import Binary
+
+COMPRESS_LEVEL = 6
+
+
+def pack(letter: dict) -> dict:
+    packed = dict(letter)
+    content = packed.pop("content", None)
+
+    if content is not None:
+        packed["content_z"] = Binary(zlib.compress(content.encode(), COMPRESS_LEVEL))
+
+    return packed
+
+
+def unpack(letter: dict) -> dict:
+    compressed = letter.pop("content_z", None)
+
+    if compressed is not None:
+        letter["content"] = zlib.decompress(compressed).decode()
+
+    return letter
+
+
+class MergedCursor:
+    def __init__(self, *cursors, key: Callable[[dict], tuple], limit: int):
+        self._cursors = cursors
+        self._heads = None
+        self._last = None
+        self.key = key
+        self.limit = limit
+
+    @staticmethod
+    async def _next(cursor: AsyncIterator[dict]):
+        try:
+            return await cursor.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._heads is None:
+            self._heads = [await self._next(cursor) for cursor in self._cursors]
+
+        while self.limit > 0:
+            live = [i for i, head in enumerate(self._heads) if head is not None]
+
+            if not live:
+                break
+
+            index = min(live, key=lambda i: self.key(self._heads[i]))
+            letter = self._heads[index]
+            self._heads[index] = await self._next(self._cursors[index])
+
+            if letter["_id"] == self._last:
+                continue
+
+            self._last = letter["_id"]
+            self.limit -= 1
+
+            return unpack(letter)
+
+        raise StopAsyncIteration
+
+    async def close(self):
+        for cursor in self._cursors:
+            await cursor.close()
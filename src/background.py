@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import Awaitable, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLane:
+    def __init__(self, workers: int = 8, queue_size: int = 1000):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self._worker_tasks: list[asyncio.Task] = []
+        self._closing = False
+
+    def _start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    @staticmethod
+    def _discard(call: Awaitable):
+        if asyncio.iscoroutine(call):
+            call.close()
+
+    def submit(self, call: Awaitable, name: str = None):
+        name = name or getattr(call, "__qualname__", type(call).__name__)
+
+        if self._closing:
+            self.dropped += 1
+            self._discard(call)
+            logger.warning(f"Background: shutting down, dropping {name}")
+            return
+
+        if self.queue is None:
+            self._start()
+
+        try:
+            self.queue.put_nowait((name, call))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._discard(call)
+            logger.warning(f"Background: queue is full, dropping {name}")
+            return
+
+        self.submitted += 1
+
+    async def _worker(self):
+        while True:
+            name, call = await self.queue.get()
+
+            try:
+                await call
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Background: {name} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def idle(self):
+        if self.queue is not None:
+            await self.queue.join()
+
+    async def drain(self, timeout: float = 10):
+        self._closing = True
+
+        if self.queue is None:
+            return
+
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Background: dropping {self.queue.qsize()} queued calls on shutdown"
+            )
+
+            while not self.queue.empty():
+                _, call = self.queue.get_nowait()
+                self._discard(call)
+                self.dropped += 1
+
+        for task in self._worker_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize() if self.queue else 0,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+
+lane = BackgroundLane(
+    workers=config.BACKGROUND_WORKERS, queue_size=config.BACKGROUND_QUEUE_SIZE
+)
@@ -0,0 +1,137 @@
+import base64
+import binascii
+import struct
+from typing import Any, Callable, NamedTuple, Optional
+
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.fsm.state import State
+from aiogram.types import CallbackQuery
+from bson import ObjectId
+
+MAX_LENGTH = 64
+
+FIELD_FORMATS = {"u8": "B", "u16": "H", "i64": "q", "oid": "12s"}
+
+
+class Op(NamedTuple):
+    code: str
+    names: tuple[str, ...]
+    kinds: tuple[str, ...]
+    layout: struct.Struct
+
+
+OPS: dict[str, Op] = {}
+
+
+def opcode(code: str, **fields: str) -> Op:
+    if len(code) != 1 or code in OPS:
+        raise ValueError(f"Invalid or duplicate callback opcode: {code!r}")
+
+    layout = struct.Struct(
+        "<" + "".join(FIELD_FORMATS[kind] for kind in fields.values())
+    )
+    op = OPS[code] = Op(code, tuple(fields), tuple(fields.values()), layout)
+
+    return op
+
+
+COURSE = opcode("c", course="u8")
+HOBBY_TOGGLE = opcode("t", hobby="u8", page="u8")
+HOBBY_PAGE = opcode("p", page="u8")
+HOBBY_CONFIRM = opcode("s")
+
+INBOX_PAGE = opcode("i", page="u16")
+INBOX_CLOSE = opcode("I")
+INBOX_ARCHIVE_ALL = opcode("A")
+READ_LETTER = opcode("r", letter_id="oid")
+
+BOOK_PAGE = opcode("b", page="u16")
+BOOK_THREAD = opcode("d", other_id="i64")
+BOOK_BACK = opcode("B")
+BOOK_CLOSE = opcode("x")
+
+HISTORY_PAGE = opcode("h", page="u16")
+HISTORY_CLOSE = opcode("H")
+
+REPORT_ACTION = opcode("a", action="u8", target_id="i64", letter_id="oid")
+BAN_USER = opcode("u", target_id="i64")
+
+NOOP = opcode("n")
+
+REPORT_ACTIONS = ("dismiss", "ban", "warn")
+
+
+def pack(op: Op, **fields: Any) -> str:
+    values = []
+
+    for name, kind in zip(op.names, op.kinds):
+        value = fields[name]
+        values.append(ObjectId(value).binary if kind == "oid" else value)
+
+    payload = base64.urlsafe_b64encode(op.layout.pack(*values)).rstrip(b"=")
+    data = op.code + payload.decode()
+
+    if len(data.encode()) > MAX_LENGTH:
+        raise ValueError(
+            f"Callback data for {op.code!r} is longer than {MAX_LENGTH} bytes"
+        )
+
+    return data
+
+
+def unpack(data: str) -> tuple[Op, dict[str, Any]]:
+    op = OPS.get(data[:1])
+
+    if op is None:
+        raise ValueError(f"Unknown callback opcode in {data!r}")
+
+    payload = data[1:]
+
+    try:
+        raw = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        values = op.layout.unpack(raw)
+    except (binascii.Error, struct.error, ValueError) as e:
+        raise ValueError(f"Malformed callback data {data!r}: {e}") from None
+
+    return op, {
+        name: str(ObjectId(value)) if kind == "oid" else value
+        for name, kind, value in zip(op.names, op.kinds, values)
+    }
+
+
+class CallbackTable:
+    def __init__(self):
+        self._handlers: dict[str, list[tuple[Optional[frozenset], CallableObject]]] = {}
+
+    def register(self, op: Op, *states: State) -> Callable:
+        allowed = frozenset(state.state for state in states) or None
+
+        def decorator(callback: Callable) -> Callable:
+            self._handlers.setdefault(op.code, []).append(
+                (allowed, CallableObject(callback))
+            )
+            return callback
+
+        return decorator
+
+    def resolve(self, op: Op, state: Optional[str]) -> Optional[CallableObject]:
+        for allowed, handler in self._handlers.get(op.code, ()):
+            if allowed is None or state in allowed:
+                return handler
+
+        return None
+
+
+table = CallbackTable()
+
+
+async def dispatch(callback: CallbackQuery, **data: Any) -> Any:
+    state = data.get("state")
+    current_state = await state.get_state() if state else None
+    handler = table.resolve(data["callback_op"], current_state)
+
+    if handler is None:
+        await callback.answer()
+        return
+
+    return await handler.call(callback, **data, **data["callback_args"])
@@ -0,0 +1,67 @@
+from typing import Any, Callable, Optional
+
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.fsm.state import State
+from aiogram.types import Message
+
+
+class CommandTable:
+    def __init__(self):
+        self._labels: dict[tuple[Optional[str], str], CallableObject] = {}
+        self._captures: dict[str, CallableObject] = {}
+
+    def label(self, text: str, *states: State) -> Callable:
+        keys = [(state.state, text) for state in states] or [(None, text)]
+
+        def decorator(callback: Callable) -> Callable:
+            handler = CallableObject(callback)
+
+            for key in keys:
+                if key in self._labels:
+                    raise ValueError(
+                        f"Label {text!r} is already registered for {key[0]}"
+                    )
+                self._labels[key] = handler
+
+            return callback
+
+        return decorator
+
+    def capture(self, *states: State) -> Callable:
+        def decorator(callback: Callable) -> Callable:
+            handler = CallableObject(callback)
+
+            for state in states:
+                self._captures[state.state] = handler
+
+            return callback
+
+        return decorator
+
+    def resolve(self, state: Optional[str], text: str) -> Optional[CallableObject]:
+        handler = self._labels.get((state, text))
+
+        if handler is not None or state is None:
+            return handler
+
+        if not text.startswith("/"):
+            handler = self._captures.get(state)
+
+        return handler or self._labels.get((None, text))
+
+    async def lookup(self, message: Message, raw_state: Optional[str] = None) -> Any:
+        if message.text is None:
+            return False
+
+        handler = self.resolve(raw_state, message.text)
+
+        return {"command_handler": handler} if handler else False
+
+
+table = CommandTable()
+
+
+async def dispatch(
+    message: Message, command_handler: CallableObject, **data: Any
+) -> Any:
+    return await command_handler.call(message, **data)
@@ -1,14 +1,21 @@
-from concurrent.futures import wait
+import asyncio
 import logging
-import math
+import os
+import socket
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient as MongoClient
 from pymongo.errors import ConnectionFailure, PyMongoError
-from config import DATABASE_URL
+from config import DATABASE_URL, DATABASE_NAME
+import config
 from datetime import datetime, timedelta
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
 import random
+import time
+
+from src import archive, history, spam
+from src.utils import letter_preview
+from src.writebehind import write_behind
 
 logger = logging.getLogger(__name__)
 
@@ -22,10 +29,40 @@ except Exception as e:
     logger.error(f"An unexpected error occurred while connecting to MongoDB: {e}")
     raise
 
-db = client["fit_chat_bot"]
+db = client[DATABASE_NAME]
 users_collection = db["users"]
 letters_collection = db["letters"]
+letters_archive_collection = db["letters_archive"]
 conversation_nicknames_collection = db["conversation_nicknames"]
+dialogues_collection = db["dialogues"]
+fsm_states_collection = db["fsm_states"]
+stats_collection = db["stats"]
+stats_hourly_collection = db["stats_hourly"]
+stats_daily_collection = db["stats_daily"]
+
+USER_FIELDS = ("user_id", "hobbies", "course", "settings")
+LETTER_FIELDS = (
+    "sender_id",
+    "recipient_id",
+    "content",
+    "status",
+    "is_read",
+    "created_at",
+)
+INBOX_FIELDS = ("sender_id", "preview", "is_read", "created_at")
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+SENDING_CLAIM = {"sending_claim": "", "sending_by": "", "sending_until": ""}
+
+admin_ids: Optional[set[int]] = None
+admins_loaded_at = 0.0
+spam_index = spam.NearDuplicateIndex(
+    window=config.SPAM_WINDOW_DAYS * 86400, max_entries=config.SPAM_INDEX_SIZE
+)
+
+
+def projection(*fields: str) -> dict:
+    return dict.fromkeys(fields, 1)
 
 
 async def init_indexes():
@@ -34,8 +71,25 @@ async def init_indexes():
         await letters_collection.create_index("recipient_id")
         await letters_collection.create_index("sender_id")
         await letters_collection.create_index([("deliver_at", 1), ("status", 1)])
+        await letters_collection.create_index("created_at")
+        await letters_collection.create_index([("status", 1), ("_id", 1)])
+        for field in ("delivered_at", "failed_at", "reported_at", "report_closed_at"):
+            await letters_collection.create_index(field, sparse=True)
+        await letters_collection.create_index(
+            [("sender_id", 1), ("recipient_id", 1), ("created_at", 1)]
+        )
+        await letters_archive_collection.create_index("recipient_id")
+        for field in ("failed_at", "report_closed_at"):
+            await letters_archive_collection.create_index(field, sparse=True)
+        await letters_archive_collection.create_index(
+            [("sender_id", 1), ("recipient_id", 1), ("created_at", 1)]
+        )
         await users_collection.create_index("hobbies")
         await users_collection.create_index("course")
+        await users_collection.create_index("registered_at", sparse=True)
+        await users_collection.create_index(
+            "is_admin", partialFilterExpression={"is_admin": True}
+        )
         await conversation_nicknames_collection.create_index(
             [("user_id", 1), ("other_user_id", 1)], unique=True
         )
@@ -45,6 +99,78 @@ async def init_indexes():
         logger.error(f"Error creating indexes: {e}")
 
 
+async def warm_spam_index():
+    try:
+        since = datetime.now() - timedelta(days=config.SPAM_WINDOW_DAYS)
+        cursor = letters_collection.find(
+            {"created_at": {"$gte": since}},
+            {"sender_id": 1, "content": 1, "created_at": 1},
+        ).sort("created_at", 1)
+
+        loaded = 0
+
+        async for letter in cursor:
+            loaded += 1
+            signature = spam.signature(letter["content"])
+
+            if signature is not None:
+                spam_index.add(
+                    signature, letter["sender_id"], letter["created_at"].timestamp()
+                )
+
+            if loaded % 500 == 0:
+                await asyncio.sleep(0)
+
+        logger.info(f"Spam index warmed up with {len(spam_index)} letters")
+    except PyMongoError as e:
+        logger.error(f"Error warming up spam index: {e}")
+
+
+async def backfill_previews(batch_size: int = 1000) -> int:
+    updated = 0
+    after = None
+
+    try:
+        while True:
+            query = {"preview": {"$exists": False}}
+            if after:
+                query["_id"] = {"$gt": after}
+
+            letters = (
+                await letters_collection.find(query, projection("content"))
+                .sort("_id", 1)
+                .limit(batch_size)
+                .to_list(None)
+            )
+
+            if not letters:
+                break
+
+            result = await letters_collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": letter["_id"]},
+                        {
+                            "$set": {
+                                "preview": letter_preview(letter.get("content", ""))
+                            }
+                        },
+                    )
+                    for letter in letters
+                ],
+                ordered=False,
+            )
+            updated += result.modified_count
+            after = letters[-1]["_id"]
+
+        if updated:
+            logger.info(f"Backfilled previews of {updated} letters")
+    except PyMongoError as e:
+        logger.error(f"Error backfilling letter previews: {e}")
+
+    return updated
+
+
 async def store_user(user_id: int, hobbies: list, course: str = None):
     try:
         update_data = {"hobbies": hobbies}
@@ -52,7 +178,7 @@ async def store_user(user_id: int, hobbies: list, course: str = None):
         if course:
             update_data["course"] = course
 
-        await users_collection.update_one(
+        result = await users_collection.update_one(
             {"user_id": user_id},
             {
                 "$set": update_data,
@@ -60,11 +186,15 @@ async def store_user(user_id: int, hobbies: list, course: str = None):
                     "is_active": True,
                     "is_admin": False,
                     "settings": {"filter_course": False},
+                    "registered_at": datetime.now(),
                 },
             },
             upsert=True,
         )
 
+        if result.upserted_id is not None:
+            await increment_counter("users_total", "users_active")
+
         logger.info(f"User {user_id} stored/updated successfully")
 
     except PyMongoError as e:
@@ -73,7 +203,7 @@ async def store_user(user_id: int, hobbies: list, course: str = None):
 
 async def check_user_exists(user_id: int) -> bool:
     try:
-        user = await users_collection.find_one({"user_id": user_id})
+        user = await users_collection.find_one({"user_id": user_id}, {"_id": 1})
 
         return bool(user)
 
@@ -83,9 +213,11 @@ async def check_user_exists(user_id: int) -> bool:
         return False
 
 
-async def get_user(user_id: int) -> dict:
+async def get_user(user_id: int, *fields: str) -> dict:
     try:
-        user = await users_collection.find_one({"user_id": user_id})
+        user = await users_collection.find_one(
+            {"user_id": user_id}, projection(*(fields or USER_FIELDS))
+        )
 
         return user
 
@@ -97,7 +229,7 @@ async def get_user(user_id: int) -> dict:
 
 async def can_send_letter(user_id: int) -> bool:
     try:
-        user = await get_user(user_id)
+        user = await get_user(user_id, "last_letter_sent", "daily_letters_count")
 
         if not user:
             return True
@@ -119,7 +251,7 @@ async def can_send_letter(user_id: int) -> bool:
 
 async def get_remaining_limit(user_id: int) -> int:
     try:
-        user = await get_user(user_id)
+        user = await get_user(user_id, "last_letter_sent", "daily_letters_count")
 
         if not user:
             return 3
@@ -143,7 +275,7 @@ async def find_recipient(
     sender_id: int, sender_hobbies: list, sender_course: str = None
 ) -> dict | None:
     try:
-        sender = await get_user(sender_id)
+        sender = await get_user(sender_id, "settings")
 
         if not sender:
             return None
@@ -180,7 +312,11 @@ async def find_recipient(
         if candidates:
             return random.choice(candidates)
 
-        fallback_pipeline = [{"$match": base_match}, {"$sample": {"size": 1}}]
+        fallback_pipeline = [
+            {"$match": base_match},
+            {"$sample": {"size": 1}},
+            {"$project": projection("user_id", "hobbies", "course")},
+        ]
 
         fallback_cursor = users_collection.aggregate(fallback_pipeline)
         fallback_candidates = await fallback_cursor.to_list(length=1)
@@ -208,6 +344,7 @@ async def create_letter(
             "sender_id": sender_id,
             "recipient_id": recipient_id,
             "content": content,
+            "preview": letter_preview(content),
             "status": "pending",
             "is_read": False,
             "is_archived": False,
@@ -216,10 +353,33 @@ async def create_letter(
             "deliver_at": deliver_at,
         }
 
+        signature = spam.signature(content)
+
+        if signature is not None:
+            senders = set(spam_index.senders(signature))
+            senders.discard(sender_id)
+
+            if len(senders) >= config.SPAM_CHAIN_SENDERS:
+                letter["status"] = "reported"
+                letter["reported_by"] = "auto"
+                letter["reported_at"] = letter["created_at"]
+                logger.warning(
+                    f"Letter from {sender_id} matches letters from {len(senders)} "
+                    f"other senders, holding it for review"
+                )
+
         await letters_collection.insert_one(letter)
 
+        if letter["status"] == "reported":
+            await increment_counter("letters_total", "reports_open")
+        else:
+            await increment_counter("letters_total")
+
+        if signature is not None:
+            spam_index.add(signature, sender_id)
+
         if consume_quota:
-            user = await get_user(sender_id)
+            user = await get_user(sender_id, "last_letter_sent", "daily_letters_count")
             last_sent = user.get("last_letter_sent")
             current_count = user.get("daily_letters_count", 0)
             now = datetime.now()
@@ -246,31 +406,102 @@ async def create_letter(
         raise
 
 
-async def get_letters(limit: int = 50):
+async def claim_due_letters(limit: int = 50):
     try:
         now = datetime.now()
+        claim = ObjectId()
+        due = {
+            "deliver_at": {"$lte": now},
+            "$or": [
+                {"status": "pending"},
+                {"status": "sending", "sending_until": {"$lt": now}},
+            ],
+        }
 
-        return (
-            await letters_collection.find(
-                {"status": "pending", "deliver_at": {"$lte": now}}
-            )
-            .limit(limit)
-            .to_list(length=None)
+        ids = [
+            letter["_id"]
+            async for letter in letters_collection.find(due, {"_id": 1}).limit(limit)
+        ]
+
+        if not ids:
+            return []
+
+        await letters_collection.update_many(
+            {**due, "_id": {"$in": ids}},
+            {
+                "$set": {
+                    "status": "sending",
+                    "sending_claim": claim,
+                    "sending_by": WORKER_ID,
+                    "sending_until": now
+                    + timedelta(seconds=config.MAILMAN_LEASE_SECONDS),
+                }
+            },
         )
 
+        return await letters_collection.find(
+            {"_id": {"$in": ids}, "sending_claim": claim},
+            projection("recipient_id", "content"),
+        ).to_list(length=None)
+
     except PyMongoError as e:
-        logger.error(f"Error retrieving due letters: {e}")
+        logger.error(f"Error claiming due letters: {e}")
 
         return []
 
 
-async def mark_letter_delivered(letter_id):
+async def release_letter(letter_id):
     try:
         await letters_collection.update_one(
-            {"_id": letter_id},
-            {"$set": {"status": "delivered", "delivered_at": datetime.now()}},
+            {"_id": letter_id, "status": "sending"},
+            {"$set": {"status": "pending"}, "$unset": SENDING_CLAIM},
+        )
+
+    except PyMongoError as e:
+        logger.error(f"Error releasing letter {letter_id}: {e}")
+
+
+async def bump_dialogue(user_id: int, other_user_id: int):
+    try:
+        await dialogues_collection.update_one(
+            {"_id": history.dialogue_id(user_id, other_user_id)},
+            {"$inc": {"version": 1}},
+            upsert=True,
+        )
+
+    except PyMongoError as e:
+        logger.error(f"Error bumping dialogue {user_id}:{other_user_id}: {e}")
+
+
+async def get_dialogue_version(user_id: int, other_user_id: int) -> Optional[int]:
+    try:
+        dialogue = await dialogues_collection.find_one(
+            {"_id": history.dialogue_id(user_id, other_user_id)}, {"version": 1}
+        )
+
+        return dialogue["version"] if dialogue else 0
+
+    except PyMongoError as e:
+        logger.error(f"Error reading dialogue {user_id}:{other_user_id}: {e}")
+
+        return None
+
+
+async def mark_letter_delivered(letter_id):
+    try:
+        letter = await letters_collection.find_one_and_update(
+            {"_id": letter_id, "status": {"$ne": "delivered"}},
+            {
+                "$set": {"status": "delivered", "delivered_at": datetime.now()},
+                "$unset": SENDING_CLAIM,
+            },
+            projection={"sender_id": 1, "recipient_id": 1},
         )
 
+        if letter:
+            await increment_counter("letters_delivered")
+            await bump_dialogue(letter["sender_id"], letter["recipient_id"])
+
     except PyMongoError as e:
         logger.error(f"Error marking letter as delivered: {e}")
 
@@ -286,7 +517,7 @@ async def get_inbox(user_id: int, page: int = 0, page_size: int = 5) -> List[dic
         total_count = await letters_collection.count_documents(query)
 
         cursor = (
-            letters_collection.find(query)
+            letters_collection.find(query, projection(*INBOX_FIELDS))
             .sort([("is_read", 1), ("delivered_at", -1)])
             .skip(page * page_size)
             .limit(page_size)
@@ -295,9 +526,9 @@ async def get_inbox(user_id: int, page: int = 0, page_size: int = 5) -> List[dic
         letters = await cursor.to_list(length=page_size)
 
         for letter in letters:
-            sender_id = letter.get("sender_id")
-            if sender_id:
-                letter["nickname"] = await get_conversation_nickname(user_id, sender_id)
+            letter.update(
+                write_behind.pending(letters_collection, {"_id": letter["_id"]})
+            )
 
         return letters, total_count
 
@@ -307,12 +538,30 @@ async def get_inbox(user_id: int, page: int = 0, page_size: int = 5) -> List[dic
         return [], 0
 
 
-async def get_letter(letter_id: str):
+async def get_letter(letter_id: str, *fields: str):
     try:
         if not ObjectId.is_valid(letter_id):
             return None
 
-        return await letters_collection.find_one({"_id": ObjectId(letter_id)})
+        fields = fields or LETTER_FIELDS
+        letter = await letters_collection.find_one(
+            {"_id": ObjectId(letter_id)}, projection(*fields)
+        )
+
+        if letter is None:
+            letter = await letters_archive_collection.find_one(
+                {"_id": ObjectId(letter_id)},
+                projection(*fields, *(("content_z",) if "content" in fields else ())),
+            )
+
+            if letter is not None:
+                archive.unpack(letter)
+        else:
+            letter.update(
+                write_behind.pending(letters_collection, {"_id": letter["_id"]})
+            )
+
+        return letter
 
     except PyMongoError as e:
         logger.error(f"Error retrieving letter {letter_id}: {e}")
@@ -325,7 +574,18 @@ async def delete_letter(letter_id: str):
         if not ObjectId.is_valid(letter_id):
             return
 
-        await letters_collection.delete_one({"_id": ObjectId(letter_id)})
+        letter = await letters_collection.find_one_and_delete(
+            {"_id": ObjectId(letter_id)},
+            projection={"sender_id": 1, "recipient_id": 1, "status": 1},
+        )
+
+        if letter:
+            counters = {
+                "delivered": ("letters_total", "letters_delivered"),
+                "reported": ("letters_total", "reports_open"),
+            }.get(letter["status"], ("letters_total",))
+            await increment_counter(*counters, amount=-1)
+            await bump_dialogue(letter["sender_id"], letter["recipient_id"])
 
     except PyMongoError as e:
         logger.error(f"Error deleting letter {letter_id}: {e}")
@@ -337,8 +597,8 @@ async def mark_letter_read(letter_id: str):
     if not ObjectId.is_valid(letter_id):
         return
 
-    await letters_collection.update_one(
-        {"_id": ObjectId(letter_id)}, {"$set": {"is_read": True}}
+    write_behind.set(
+        letters_collection, {"_id": ObjectId(letter_id)}, {"is_read": True}
     )
 
 
@@ -369,11 +629,16 @@ async def archive_all_letters(user_id: int):
 
 async def get_users_communicated_with(user_id: int) -> list[int]:
     try:
+        match = {
+            "$or": [{"sender_id": user_id}, {"recipient_id": user_id}],
+            "status": "delivered",
+        }
         pipeline = [
+            {"$match": match},
             {
-                "$match": {
-                    "$or": [{"sender_id": user_id}, {"recipient_id": user_id}],
-                    "status": "delivered",
+                "$unionWith": {
+                    "coll": letters_archive_collection.name,
+                    "pipeline": [{"$match": match}],
                 }
             },
             {
@@ -400,59 +665,6 @@ async def get_users_communicated_with(user_id: int) -> list[int]:
         return []
 
 
-async def get_dialogue_history(user_id: int, other_user_id: int, limit: int = 20):
-    try:
-        query = {
-            "$or": [
-                {"sender_id": user_id, "recipient_id": other_user_id},
-                {"sender_id": other_user_id, "recipient_id": user_id},
-            ],
-            "status": "delivered",
-        }
-
-        cursor = letters_collection.find(query).sort("created_at", -1).limit(limit)
-
-        return await cursor.to_list(length=limit)
-
-    except PyMongoError as e:
-        logger.error(
-            f"Error retrieving dialogue history between {user_id} and {other_user_id}: {e}"
-        )
-
-        return []
-
-
-async def get_dialogue_history_page(
-    user_id: int, other_user_id: int, page: int = 0, page_size: int = 10
-):
-    try:
-        query = {
-            "$or": [
-                {"sender_id": user_id, "recipient_id": other_user_id},
-                {"sender_id": other_user_id, "recipient_id": user_id},
-            ],
-            "status": "delivered",
-        }
-
-        total_count = await letters_collection.count_documents(query)
-        cursor = (
-            letters_collection.find(query)
-            .sort("created_at", 1)
-            .skip(page * page_size)
-            .limit(page_size)
-        )
-        items = await cursor.to_list(length=page_size)
-
-        return items, total_count
-
-    except PyMongoError as e:
-        logger.error(
-            f"Error retrieving dialogue history page between {user_id} and {other_user_id}: {e}"
-        )
-
-        return [], 0
-
-
 async def mark_letter_failed(letter_id: str, reason: str):
     try:
         if not ObjectId.is_valid(letter_id):
@@ -465,7 +677,8 @@ async def mark_letter_failed(letter_id: str, reason: str):
                     "status": "failed",
                     "failure_reason": reason,
                     "failed_at": datetime.now(),
-                }
+                },
+                "$unset": SENDING_CLAIM,
             },
         )
 
@@ -475,27 +688,42 @@ async def mark_letter_failed(letter_id: str, reason: str):
 
 async def activate_user(user_id: int):
     try:
-        await users_collection.update_one(
-            {"user_id": user_id},
+        result = await users_collection.update_one(
+            {"user_id": user_id, "is_active": False},
             {
                 "$set": {"is_active": True},
             },
+        )
+
+        if result.modified_count:
+            await increment_counter("users_active")
+            return
+
+        result = await users_collection.update_one(
+            {"user_id": user_id},
+            {"$setOnInsert": {"is_active": True}},
             upsert=True,
         )
 
+        if result.upserted_id is not None:
+            await increment_counter("users_total", "users_active")
+
     except PyMongoError as e:
         logger.error(f"Error activating user {user_id}: {e}")
 
 
 async def deactivate_user(user_id: int):
     try:
-        await users_collection.update_one(
-            {"user_id": user_id},
+        result = await users_collection.update_one(
+            {"user_id": user_id, "is_active": {"$ne": False}},
             {
                 "$set": {"is_active": False},
             },
         )
 
+        if result.modified_count:
+            await increment_counter("users_active", amount=-1)
+
     except PyMongoError as e:
         logger.error(f"Error deactivating user {user_id}: {e}")
 
@@ -510,38 +738,48 @@ async def set_admin(user_id: int, is_admin: bool = True):
             upsert=True,
         )
 
+        if admin_ids is not None:
+            if is_admin:
+                admin_ids.add(user_id)
+            else:
+                admin_ids.discard(user_id)
+
     except PyMongoError as e:
         logger.error(f"Error setting admin status for user {user_id}: {e}")
 
 
-async def get_admins() -> List[int]:
-    try:
-        cursor = users_collection.find({"is_admin": True})
-        admins = await cursor.to_list(length=None)
+async def load_admins():
+    global admin_ids, admins_loaded_at
 
-        return [admin["user_id"] for admin in admins]
+    try:
+        cursor = users_collection.find({"is_admin": True}, {"user_id": 1, "_id": 0})
+        admin_ids = {admin["user_id"] async for admin in cursor}
+        admins_loaded_at = time.monotonic()
 
     except PyMongoError as e:
         logger.error(f"Error retrieving admins: {e}")
 
-        return []
 
+async def get_admin_ids() -> set[int]:
+    if admin_ids is None or (
+        time.monotonic() - admins_loaded_at > config.ADMIN_CACHE_SECONDS
+    ):
+        await load_admins()
 
-async def is_user_admin(user_id: int) -> bool:
-    try:
-        user = await users_collection.find_one({"user_id": user_id, "is_admin": True})
+    return admin_ids or set()
 
-        return bool(user)
 
-    except PyMongoError as e:
-        logger.error(f"Error checking admin status for user {user_id}: {e}")
+async def get_admins() -> List[int]:
+    return list(await get_admin_ids())
 
-        return False
+
+async def is_user_admin(user_id: int) -> bool:
+    return user_id in await get_admin_ids()
 
 
 async def toggle_filter_course(user_id: int) -> bool:
     try:
-        user = await get_user(user_id)
+        user = await get_user(user_id, "settings")
         current_setting = (
             user.get("settings", {}).get("filter_course", False) if user else False
         )
@@ -563,7 +801,7 @@ async def toggle_filter_course(user_id: int) -> bool:
 
 async def get_user_settings(user_id: int):
     try:
-        user = await get_user(user_id)
+        user = await get_user(user_id, "settings")
 
         return (
             user.get("settings", {"filter_course": False})
@@ -582,18 +820,30 @@ async def report_user_letter(letter_id: str, reported_id: int):
         if not ObjectId.is_valid(letter_id):
             return
 
-        letter = await letters_collection.find_one({"_id": ObjectId(letter_id)})
-
-        if not letter:
-            return None
-
-        await letters_collection.update_one(
-            {"_id": ObjectId(letter_id)},
+        letter = await letters_collection.find_one_and_update(
+            {"_id": ObjectId(letter_id), "status": {"$ne": "reported"}},
             {
-                "$set": {"status": "reported", "reported_by": reported_id},
+                "$set": {
+                    "status": "reported",
+                    "reported_by": reported_id,
+                    "reported_at": datetime.now(),
+                },
             },
+            projection=projection("sender_id", "recipient_id", "status"),
+            return_document=ReturnDocument.BEFORE,
         )
 
+        if not letter:
+            return await letters_collection.find_one(
+                {"_id": ObjectId(letter_id)}, projection("sender_id", "recipient_id")
+            )
+
+        await increment_counter("reports_open")
+
+        if letter.get("status") == "delivered":
+            await increment_counter("letters_delivered", amount=-1)
+        await bump_dialogue(letter["sender_id"], letter["recipient_id"])
+
         return letter
 
     except PyMongoError as e:
@@ -604,7 +854,9 @@ async def report_user_letter(letter_id: str, reported_id: int):
 
 async def is_user_banned(user_id: int) -> bool:
     try:
-        user = await users_collection.find_one({"user_id": user_id, "is_active": False})
+        user = await users_collection.find_one(
+            {"user_id": user_id, "is_active": False}, {"_id": 1}
+        )
 
         return bool(user)
 
@@ -615,66 +867,540 @@ async def is_user_banned(user_id: int) -> bool:
 
 
 async def get_bot_stats():
+    counters = await get_counters()
+
+    return {
+        "total_users": counters["users_total"],
+        "active_users": counters["users_active"],
+        "banned_users": counters["users_total"] - counters["users_active"],
+        "total_letters": counters["letters_total"],
+        "delivered_letters": counters["letters_delivered"],
+    }
+
+
+async def get_all_users_cursor():
     try:
-        total_users = await users_collection.count_documents({})
-        actve_users = await users_collection.count_documents(
-            {"is_active": {"$ne": False}}
+        return users_collection.find(
+            {"is_active": {"$ne": False}}, projection("user_id")
         )
-        banned_users = total_users - actve_users
-        total_letters = await letters_collection.count_documents({})
-        delivered_letters = await letters_collection.count_documents(
-            {"status": "delivered"}
+
+    except PyMongoError as e:
+        logger.error(f"Error retrieving all users cursor: {e}")
+
+        return None
+
+
+async def get_user_stats(user_id: int):
+    try:
+        total_sent = 0
+        total_received = 0
+
+        for collection in (letters_collection, letters_archive_collection):
+            total_sent += await collection.count_documents({"sender_id": user_id})
+            total_received += await collection.count_documents(
+                {"recipient_id": user_id, "status": "delivered"}
+            )
+
+        return {"total_sent": total_sent, "total_received": total_received}
+
+    except PyMongoError as e:
+        logger.error(f"Error retrieving stats for user {user_id}: {e}")
+
+        return {}
+
+
+COUNTERS = (
+    "users_total",
+    "users_active",
+    "letters_total",
+    "letters_delivered",
+    "reports_open",
+)
+
+
+async def increment_counter(*names: str, amount: int = 1):
+    try:
+        await stats_collection.update_one(
+            {"_id": "counters"},
+            {"$inc": {name: amount for name in names}},
+            upsert=True,
         )
 
-        return {
-            "total_users": total_users,
-            "active_users": actve_users,
-            "banned_users": banned_users,
-            "total_letters": total_letters,
-            "delivered_letters": delivered_letters,
+    except PyMongoError as e:
+        logger.error(f"Error updating counters {names}: {e}")
+
+
+async def get_counters() -> dict:
+    try:
+        counters = await stats_collection.find_one({"_id": "counters"}) or {}
+
+    except PyMongoError as e:
+        logger.error(f"Error reading counters: {e}")
+        counters = {}
+
+    return {name: max(counters.get(name, 0), 0) for name in COUNTERS}
+
+
+async def get_counter(name: str) -> int:
+    return (await get_counters())[name]
+
+
+def _count(match: dict) -> list:
+    return [{"$match": match}, {"$count": "n"}]
+
+
+async def reconcile_counters():
+    pipeline = [
+        {"$project": {"_id": 0, "kind": {"$literal": "user"}, "is_active": 1}},
+        *(
+            {
+                "$unionWith": {
+                    "coll": collection.name,
+                    "pipeline": [
+                        {
+                            "$project": {
+                                "_id": 0,
+                                "kind": {"$literal": "letter"},
+                                "status": 1,
+                            }
+                        }
+                    ],
+                }
+            }
+            for collection in (letters_collection, letters_archive_collection)
+        ),
+        {
+            "$facet": {
+                "users_total": _count({"kind": "user"}),
+                "users_active": _count({"kind": "user", "is_active": {"$ne": False}}),
+                "letters_total": _count({"kind": "letter"}),
+                "letters_delivered": _count({"kind": "letter", "status": "delivered"}),
+                "reports_open": _count({"kind": "letter", "status": "reported"}),
+            }
+        },
+    ]
+
+    try:
+        facets = await users_collection.aggregate(pipeline).next()
+        actual = {name: (facets[name] or [{"n": 0}])[0]["n"] for name in COUNTERS}
+        stored = await get_counters()
+
+        drift = {
+            name: actual[name] - stored[name]
+            for name in COUNTERS
+            if actual[name] != stored[name]
         }
 
+        if drift:
+            logger.warning(f"Stats: correcting counter drift {drift}")
+
+        await stats_collection.update_one(
+            {"_id": "counters"},
+            {"$set": {**actual, "reconciled_at": datetime.now()}},
+            upsert=True,
+        )
+
     except PyMongoError as e:
-        logger.error(f"Error retrieving bot stats: {e}")
+        logger.error(f"Error reconciling counters: {e}")
 
-        return {}
 
+ACTIVITY_EVENTS = {
+    "letters_created": (letters_collection, "created_at"),
+    "letters_delivered": (letters_collection, "delivered_at"),
+    "letters_failed": (letters_collection, "failed_at"),
+    "letters_reported": (letters_collection, "reported_at"),
+    "registrations": (users_collection, "registered_at"),
+}
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _events(field: str, metric: str, start: datetime, end: datetime) -> list:
+    return [
+        {"$match": {field: {"$gte": start, "$lt": end}}},
+        {
+            "$project": {
+                "_id": 0,
+                "hour": {"$dateTrunc": {"date": f"${field}", "unit": "hour"}},
+                "metric": {"$literal": metric},
+            }
+        },
+    ]
+
+
+def _hourly_pipeline(start: datetime, end: datetime) -> list:
+    (first, (_, field)), *rest = ACTIVITY_EVENTS.items()
+    pipeline = _events(field, first, start, end)
+
+    for metric, (collection, field) in rest:
+        pipeline.append(
+            {
+                "$unionWith": {
+                    "coll": collection.name,
+                    "pipeline": _events(field, metric, start, end),
+                }
+            }
+        )
+
+    return pipeline + [
+        {
+            "$group": {
+                "_id": "$hour",
+                **{
+                    metric: {"$sum": {"$cond": [{"$eq": ["$metric", metric]}, 1, 0]}}
+                    for metric in ACTIVITY_EVENTS
+                },
+            }
+        },
+        {
+            "$merge": {
+                "into": stats_hourly_collection.name,
+                "on": "_id",
+                "whenMatched": "merge",
+                "whenNotMatched": "insert",
+            }
+        },
+    ]
+
+
+def _daily_active_pipeline(start: datetime, end: datetime) -> list:
+    return [
+        {"$match": {"created_at": {"$gte": start, "$lt": end}}},
+        {
+            "$group": {
+                "_id": {
+                    "day": {"$dateTrunc": {"date": "$created_at", "unit": "day"}},
+                    "sender_id": "$sender_id",
+                }
+            }
+        },
+        {"$group": {"_id": "$_id.day", "active_users": {"$sum": 1}}},
+        {
+            "$merge": {
+                "into": stats_daily_collection.name,
+                "on": "_id",
+                "whenMatched": "merge",
+                "whenNotMatched": "insert",
+            }
+        },
+    ]
+
+
+async def _first_event() -> Optional[datetime]:
+    firsts = []
+
+    for collection, field in ACTIVITY_EVENTS.values():
+        doc = await collection.find_one(
+            {field: {"$type": "date"}}, {field: 1}, sort=[(field, 1)]
+        )
+
+        if doc:
+            firsts.append(doc[field])
+
+    return min(firsts, default=None)
+
+
+async def rollup_activity():
+    try:
+        state = await stats_collection.find_one({"_id": "rollup"}) or {}
+        start = state.get("watermark") or await _first_event()
+
+        if start is None:
+            return
+
+        start = _hour(start)
+        end = min(
+            _hour(datetime.now() - timedelta(seconds=config.ROLLUP_GRACE_SECONDS)),
+            start + timedelta(hours=config.ROLLUP_MAX_HOURS),
+        )
+
+        if end <= start:
+            return
+
+        day_start = start.replace(hour=0)
+
+        await letters_collection.aggregate(_hourly_pipeline(start, end)).to_list(None)
+        await letters_collection.aggregate(
+            _daily_active_pipeline(day_start, end)
+        ).to_list(None)
+
+        await stats_collection.update_one(
+            {"_id": "rollup"}, {"$set": {"watermark": end}}, upsert=True
+        )
+        logger.info(f"Stats: rolled up activity from {start} to {end}")
+
+    except PyMongoError as e:
+        logger.error(f"Error rolling up activity: {e}")
+
+
+async def get_activity(days: int) -> list[dict]:
+    today = _hour(datetime.now()).replace(hour=0)
+    since = today - timedelta(days=days - 1)
+    rows = {
+        (since + timedelta(days=i)).date(): dict.fromkeys(
+            [*ACTIVITY_EVENTS, "active_users"], 0
+        )
+        for i in range(days)
+    }
 
-async def get_all_users_cursor():
     try:
-        return users_collection.find({"is_active": {"$ne": False}})
+        async for hour in stats_hourly_collection.find({"_id": {"$gte": since}}):
+            row = rows.get(hour["_id"].date())
+
+            if row is not None:
+                for metric in ACTIVITY_EVENTS:
+                    row[metric] += hour.get(metric, 0)
+
+        async for day in stats_daily_collection.find({"_id": {"$gte": since}}):
+            row = rows.get(day["_id"].date())
+
+            if row is not None:
+                row["active_users"] = day.get("active_users", 0)
 
     except PyMongoError as e:
-        logger.error(f"Error retrieving all users cursor: {e}")
+        logger.error(f"Error retrieving activity for {days} days: {e}")
+
+        return []
+
+    return [{"day": day, **row} for day, row in rows.items()]
+
+
+ARCHIVE_MATCH = {
+    "$or": [
+        {"status": {"$in": ["failed", "resolved"]}},
+        {"status": "delivered", "is_archived": True},
+    ]
+}
+
+
+async def archive_old_letters() -> int:
+    moved = 0
+
+    try:
+        state = await stats_collection.find_one({"_id": "archive"}) or {}
+        after = state.get("cursor")
+        cutoff = datetime.now() - timedelta(days=config.ARCHIVE_AFTER_DAYS)
+        query = {**ARCHIVE_MATCH, "created_at": {"$lt": cutoff}}
+
+        for _ in range(config.ARCHIVE_MAX_BATCHES):
+            batch_query = {**query, "_id": {"$gt": after}} if after else query
+            letters = (
+                await letters_collection.find(batch_query)
+                .sort("_id", 1)
+                .limit(config.ARCHIVE_BATCH_SIZE)
+                .to_list(None)
+            )
+            deleted = 0
+
+            if letters:
+                ids = [letter["_id"] for letter in letters]
+                archived_at = datetime.now()
+
+                await letters_archive_collection.bulk_write(
+                    [
+                        ReplaceOne(
+                            {"_id": letter["_id"]},
+                            {**archive.pack(letter), "archived_at": archived_at},
+                            upsert=True,
+                        )
+                        for letter in letters
+                    ],
+                    ordered=False,
+                )
+                result = await letters_collection.delete_many(
+                    {**query, "_id": {"$in": ids}}
+                )
+                deleted = result.deleted_count
+
+                if deleted < len(ids):
+                    kept = await letters_collection.distinct(
+                        "_id", {"_id": {"$in": ids}}
+                    )
+                    await letters_archive_collection.delete_many({"_id": {"$in": kept}})
+
+                moved += deleted
+                after = ids[-1]
+
+            if len(letters) < config.ARCHIVE_BATCH_SIZE:
+                after = None
+
+            await stats_collection.update_one(
+                {"_id": "archive"},
+                {
+                    "$set": {"cursor": after, "ran_at": datetime.now()},
+                    "$inc": {"moved": deleted},
+                },
+                upsert=True,
+            )
+
+            if after is None:
+                break
+
+        if moved:
+            logger.info(f"Archive: moved {moved} letters older than {cutoff}")
+
+    except PyMongoError as e:
+        logger.error(f"Error archiving old letters: {e}")
+
+    return moved
+
+
+RETENTION_POLICIES = {
+    "failed": ("failed_at", config.RETENTION_FAILED_DAYS),
+    "resolved": ("report_closed_at", config.RETENTION_RESOLVED_DAYS),
+}
+swept = dict.fromkeys(RETENTION_POLICIES, 0)
+
+
+async def sweep_expired_letters() -> dict:
+    deleted = dict.fromkeys(RETENTION_POLICIES, 0)
+
+    try:
+        for status, (field, days) in RETENTION_POLICIES.items():
+            if not days:
+                continue
+
+            query = {
+                "status": status,
+                field: {"$lt": datetime.now() - timedelta(days=days)},
+            }
+
+            for collection in (letters_collection, letters_archive_collection):
+                for _ in range(config.RETENTION_MAX_BATCHES):
+                    expired = collection.find(query, {"_id": 1}).limit(
+                        config.RETENTION_BATCH_SIZE
+                    )
+                    ids = [letter["_id"] async for letter in expired]
+
+                    if not ids:
+                        break
+
+                    result = await collection.delete_many(
+                        {**query, "_id": {"$in": ids}}
+                    )
+
+                    if result.deleted_count:
+                        deleted[status] += result.deleted_count
+                        swept[status] += result.deleted_count
+                        await increment_counter(
+                            "letters_total", amount=-result.deleted_count
+                        )
+
+                    if len(ids) < config.RETENTION_BATCH_SIZE:
+                        break
+
+        if any(deleted.values()):
+            await stats_collection.update_one(
+                {"_id": "retention"},
+                {
+                    "$inc": {f"deleted.{status}": n for status, n in deleted.items()},
+                    "$set": {"swept_at": datetime.now()},
+                },
+                upsert=True,
+            )
+            logger.info(f"Retention: deleted expired letters {deleted}")
+
+    except PyMongoError as e:
+        logger.error(f"Error sweeping expired letters: {e}")
+
+    return deleted
+
+
+async def get_open_reports_count() -> int:
+    return await get_counter("reports_open")
+
+
+async def claim_next_report(admin_id: int):
+    now = datetime.now()
+
+    try:
+        return await letters_collection.find_one_and_update(
+            {
+                "status": "reported",
+                "$or": [
+                    {"claimed_until": {"$exists": False}},
+                    {"claimed_until": {"$lt": now}},
+                    {"claimed_by": admin_id},
+                ],
+            },
+            {
+                "$set": {
+                    "claimed_by": admin_id,
+                    "claimed_until": now
+                    + timedelta(seconds=config.REPORT_LEASE_SECONDS),
+                }
+            },
+            sort=[("_id", 1)],
+            projection={"sender_id": 1, "reported_by": 1, "content": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    except PyMongoError as e:
+        logger.error(f"Error claiming report for admin {admin_id}: {e}")
 
         return None
 
 
-async def get_user_stats(user_id: int):
+async def resolve_sender_reports(sender_id: int, admin_id: int, resolution: str):
     try:
-        total_sent = await letters_collection.count_documents({"sender_id": user_id})
-        total_received = await letters_collection.count_documents(
-            {"recipient_id": user_id, "status": "delivered"}
+        reports = letters_collection.find(
+            {"sender_id": sender_id, "status": "reported"}, {"_id": 1}
         )
+        now = datetime.now()
+        operations = [
+            UpdateOne(
+                {"_id": report["_id"], "status": "reported"},
+                {
+                    "$set": {
+                        "status": "resolved",
+                        "report_resolution": resolution,
+                        "report_closed_by": admin_id,
+                        "report_closed_at": now,
+                    },
+                    "$unset": {"claimed_by": "", "claimed_until": ""},
+                },
+            )
+            async for report in reports
+        ]
 
-        return {"total_sent": total_sent, "total_received": total_received}
+        if not operations:
+            return 0
+
+        result = await letters_collection.bulk_write(operations, ordered=False)
+
+        if result.modified_count:
+            await increment_counter("reports_open", amount=-result.modified_count)
+
+        return result.modified_count
 
     except PyMongoError as e:
-        logger.error(f"Error retrieving stats for user {user_id}: {e}")
+        logger.error(f"Error resolving reports of sender {sender_id}: {e}")
 
-        return {}
+        return 0
 
 
-async def get_active_reports():
+async def update_report_resolution(letter_id: str, previous: str, resolution: str):
     try:
-        return await letters_collection.find({"status": "reported"}).to_list(
-            length=None
+        if not ObjectId.is_valid(letter_id):
+            return False
+
+        result = await letters_collection.update_one(
+            {
+                "_id": ObjectId(letter_id),
+                "status": "resolved",
+                "report_resolution": previous,
+            },
+            {"$set": {"report_resolution": resolution}},
         )
 
+        return bool(result.modified_count)
+
     except PyMongoError as e:
-        logger.error(f"Error retrieving active reports: {e}")
+        logger.error(f"Error updating report resolution for letter {letter_id}: {e}")
 
-        return []
+        return False
 
 
 async def warn_user(user_id: int):
@@ -699,17 +1425,42 @@ async def close_report(letter_id: str, admin_id: int, resolution: str):
         if not ObjectId.is_valid(letter_id):
             return False
 
-        await letters_collection.update_one(
-            {"_id": ObjectId(letter_id)},
-            {
-                "$set": {
-                    "status": "resolved",
-                    "report_resolution": resolution,
-                    "report_closed_by": admin_id,
-                    "report_closed_at": datetime.now(),
-                }
-            },
-        )
+        closed = {
+            "report_resolution": resolution,
+            "report_closed_by": admin_id,
+            "report_closed_at": datetime.now(),
+        }
+        release = {"claimed_by": "", "claimed_until": ""}
+        result = None
+
+        if resolution == "dismissed":
+            result = await letters_collection.update_one(
+                {
+                    "_id": ObjectId(letter_id),
+                    "status": "reported",
+                    "reported_by": "auto",
+                },
+                {
+                    "$set": {
+                        "status": "pending",
+                        "deliver_at": datetime.now(),
+                        **closed,
+                    },
+                    "$unset": release,
+                },
+            )
+
+        if not result or not result.modified_count:
+            result = await letters_collection.update_one(
+                {"_id": ObjectId(letter_id), "status": "reported"},
+                {"$set": {"status": "resolved", **closed}, "$unset": release},
+            )
+
+        if not result.modified_count:
+            return False
+
+        await increment_counter("reports_open", amount=-1)
+
         return True
 
     except PyMongoError as e:
@@ -718,9 +1469,12 @@ async def close_report(letter_id: str, admin_id: int, resolution: str):
         return False
 
 
-async def get_dialogue_history_with_pagination(
-    user_id: int, other_user_id: int, page: int = 0, letters_per_page: int = 2
-) -> tuple:
+async def get_dialogue_history_cursor(
+    user_id: int,
+    other_user_id: int,
+    after: Optional[tuple[datetime, str]] = None,
+    limit: int = 100,
+):
     try:
         query = {
             "$or": [
@@ -730,40 +1484,46 @@ async def get_dialogue_history_with_pagination(
             "status": "delivered",
         }
 
-        total_letters = await letters_collection.count_documents(query)
-        total_pages = max(1, math.ceil(total_letters / letters_per_page))
+        if after:
+            created_at, letter_id = after
+            query["$and"] = [
+                {
+                    "$or": [
+                        {"created_at": {"$gt": created_at}},
+                        {
+                            "created_at": created_at,
+                            "_id": {"$gte": ObjectId(letter_id)},
+                        },
+                    ]
+                }
+            ]
 
-        if page >= total_pages:
-            page = total_pages - 1
-        if page < 0:
-            page = 0
+        tiers = [
+            collection.find(
+                query, projection("sender_id", "content", "content_z", "created_at")
+            )
+            .sort([("created_at", 1), ("_id", 1)])
+            .limit(limit)
+            .batch_size(16)
+            for collection in (letters_archive_collection, letters_collection)
+        ]
 
-        skip = page * letters_per_page
-        cursor = (
-            letters_collection.find(query)
-            .sort("created_at", 1)
-            .skip(skip)
-            .limit(letters_per_page)
+        return archive.MergedCursor(
+            *tiers,
+            key=lambda letter: (letter["created_at"], letter["_id"]),
+            limit=limit,
         )
-        page_letters = await cursor.to_list(length=letters_per_page)
-
-        nickname = await get_conversation_nickname(user_id, other_user_id)
-        for letter in page_letters:
-            if letter.get("sender_id") == other_user_id:
-                letter["nickname"] = nickname
-
-        return page_letters, total_pages, page, total_letters
 
     except PyMongoError as e:
-        logger.error(f"Error getting dialogue history with pagination: {e}")
-        return [], 0, 0, 0
+        logger.error(f"Error opening dialogue history cursor: {e}")
+        return None
 
 
 async def get_next_anonymous_number(recipient_id: int) -> int:
     try:
-        count = await letters_collection.count_documents(
-            {"recipient_id": recipient_id, "status": "delivered"}
-        )
+        query = {"recipient_id": recipient_id, "status": "delivered"}
+        count = await letters_collection.count_documents(query)
+        count += await letters_archive_collection.count_documents(query)
         return count + 1
     except PyMongoError as e:
         logger.error(f"Error getting next anonymous number: {e}")
@@ -773,7 +1533,7 @@ async def get_next_anonymous_number(recipient_id: int) -> int:
 async def get_conversation_nickname(user_id: int, other_user_id: int) -> str:
     try:
         custom_nickname = await conversation_nicknames_collection.find_one(
-            {"user_id": user_id, "other_user_id": other_user_id}
+            {"user_id": user_id, "other_user_id": other_user_id}, projection("nickname")
         )
 
         if custom_nickname:
@@ -798,18 +1558,24 @@ async def update_letter_nickname(letter_id: str, new_nickname: str) -> bool:
         if len(new_nickname.strip()) == 0:
             return False
 
-        letter = await get_letter(letter_id)
+        letter = await get_letter(letter_id, "sender_id", "recipient_id")
         if not letter:
             return False
 
         recipient_id = letter["recipient_id"]
         sender_id = letter["sender_id"]
 
+        conversation = {"user_id": recipient_id, "other_user_id": sender_id}
+
         await conversation_nicknames_collection.update_one(
-            {"user_id": recipient_id, "other_user_id": sender_id},
-            {"$set": {"nickname": new_nickname.strip(), "updated_at": datetime.now()}},
-            upsert=True,
+            conversation, {"$set": {"nickname": new_nickname.strip()}}, upsert=True
+        )
+        write_behind.set(
+            conversation_nicknames_collection,
+            conversation,
+            {"updated_at": datetime.now()},
         )
+        await bump_dialogue(recipient_id, sender_id)
 
         return True
     except PyMongoError as e:
@@ -817,33 +1583,6 @@ async def update_letter_nickname(letter_id: str, new_nickname: str) -> bool:
         return False
 
 
-async def get_all_user_letters(user_id: int, page: int = 0, page_size: int = 4):
-    try:
-        query = {
-            "$or": [
-                {"recipient_id": user_id, "status": "delivered"},
-                {"sender_id": user_id, "status": "delivered"},
-            ]
-        }
-
-        total_count = await letters_collection.count_documents(query)
-
-        cursor = (
-            letters_collection.find(query)
-            .sort([("created_at", -1)])
-            .skip(page * page_size)
-            .limit(page_size)
-        )
-
-        letters = await cursor.to_list(length=page_size)
-
-        return letters, total_count
-
-    except PyMongoError as e:
-        logger.error(f"Error retrieving all user letters {user_id}: {e}")
-        return [], 0
-
-
 async def get_conversation_list(user_id: int, page: int = 0, page_size: int = 4):
     try:
         base_match = {
@@ -851,8 +1590,18 @@ async def get_conversation_list(user_id: int, page: int = 0, page_size: int = 4)
             "$or": [{"recipient_id": user_id}, {"sender_id": user_id}],
         }
 
-        count_pipeline = [
+        tiers = [
             {"$match": base_match},
+            {
+                "$unionWith": {
+                    "coll": letters_archive_collection.name,
+                    "pipeline": [{"$match": base_match}],
+                }
+            },
+        ]
+
+        count_pipeline = [
+            *tiers,
             {
                 "$project": {
                     "other_id": {
@@ -873,7 +1622,7 @@ async def get_conversation_list(user_id: int, page: int = 0, page_size: int = 4)
         total_count = count_docs[0]["total"] if count_docs else 0
 
         list_pipeline = [
-            {"$match": base_match},
+            *tiers,
             {
                 "$project": {
                     "other_id": {
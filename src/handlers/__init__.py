@@ -1,10 +1,13 @@
 from aiogram import Router
+from src import callbacks, commands
 from .user import router as user_router
 from .admin import router as admin_router
 from .letters import router as letters_router
 
 router = Router()
+router.message.register(commands.dispatch, commands.table.lookup)
 
 router.include_router(admin_router)
 router.include_router(user_router)
 router.include_router(letters_router)
+router.callback_query.register(callbacks.dispatch)
@@ -1,37 +1,42 @@
 import asyncio
-from aiogram import Router, F, Bot
+from aiogram import Router, Bot
 from aiogram.types import Message, CallbackQuery
-from aiogram.filters import Command, or_f
+from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 
 from src.states import AdminState
 from src.messages import MESSAGES
+import src.callbacks as callbacks
+import src.commands as commands
 import src.keyboards as keyboards
 import src.database as db
+from src.background import lane
+from src.views import views
 
 router = Router()
 
 
-@router.message(or_f(Command("admin"), F.text == "🔐 Адмін-панель"))
+@router.message(Command("admin"))
+@commands.table.label("🔐 Адмін-панель")
 async def cmd_admin(message: Message, state: FSMContext):
     if not await db.is_user_admin(message.from_user.id):
         return
     await state.set_state(AdminState.main)
     await message.answer(
-        MESSAGES["admin_welcome"], reply_markup=await keyboards.admin_menu()
+        MESSAGES["admin_welcome"], reply_markup=keyboards.admin_menu()
     )
 
 
-@router.message(AdminState.main, F.text == "🔙 Вийти з адмін-панелі")
+@commands.table.label("🔙 Вийти з адмін-панелі", AdminState.main)
 async def exit_admin(message: Message, state: FSMContext):
     is_admin = await db.is_user_admin(message.from_user.id)
     await state.clear()
     await message.answer(
-        MESSAGES["admin_exit"], reply_markup=await keyboards.reply_options(is_admin)
+        MESSAGES["admin_exit"], reply_markup=keyboards.reply_options(is_admin)
     )
 
 
-@router.message(AdminState.main, F.text == "📊 Статистика")
+@commands.table.label("📊 Статистика", AdminState.main)
 async def admin_stats(message: Message):
     stats = await db.get_bot_stats()
     await message.answer(
@@ -45,20 +50,20 @@ async def admin_stats(message: Message):
     )
 
 
-@router.message(AdminState.main, F.text == "📢 Розсилка")
+@commands.table.label("📢 Розсилка", AdminState.main)
 async def admin_broadcast(message: Message, state: FSMContext):
     await state.set_state(AdminState.waiting_for_broadcast)
     await message.answer(
-        MESSAGES["admin_broadcast"], reply_markup=await keyboards.cancel_admin()
+        MESSAGES["admin_broadcast"], reply_markup=keyboards.cancel_admin()
     )
 
 
-@router.message(AdminState.waiting_for_broadcast)
+@commands.table.capture(AdminState.waiting_for_broadcast)
 async def admin_broadcast_send(message: Message, state: FSMContext, bot: Bot):
     if message.text == "❌ Скасувати":
         await state.set_state(AdminState.main)
         await message.answer(
-            MESSAGES["admin_broadcast_exit"], reply_markup=await keyboards.admin_menu()
+            MESSAGES["admin_broadcast_exit"], reply_markup=keyboards.admin_menu()
         )
 
         return
@@ -88,28 +93,28 @@ async def admin_broadcast_send(message: Message, state: FSMContext, bot: Bot):
             except Exception:
                 blocked += 1
 
-    await status_msg.delete()
+    lane.submit(status_msg.delete())
     await message.answer(
         MESSAGES["admin_broadcast_info"].format(count=count, blocked=blocked),
-        reply_markup=await keyboards.admin_menu(),
+        reply_markup=keyboards.admin_menu(),
     )
     await state.set_state(AdminState.main)
 
 
-@router.message(AdminState.main, F.text == "🔨 Бан")
+@commands.table.label("🔨 Бан", AdminState.main)
 async def admin_ban_start(message: Message, state: FSMContext):
     await state.set_state(AdminState.waiting_for_ban)
     await message.answer(
-        MESSAGES["admin_ban_prompt"], reply_markup=await keyboards.cancel_admin()
+        MESSAGES["admin_ban_prompt"], reply_markup=keyboards.cancel_admin()
     )
 
 
-@router.message(AdminState.waiting_for_ban)
+@commands.table.capture(AdminState.waiting_for_ban)
 async def admin_ban_process(message: Message, state: FSMContext):
     if message.text == "❌ Скасувати":
         await state.set_state(AdminState.main)
         await message.answer(
-            MESSAGES["admin_ban_exit"], reply_markup=await keyboards.admin_menu()
+            MESSAGES["admin_ban_exit"], reply_markup=keyboards.admin_menu()
         )
         return
 
@@ -119,36 +124,36 @@ async def admin_ban_process(message: Message, state: FSMContext):
             await state.set_state(AdminState.main)
             return await message.answer(
                 MESSAGES["admin_ban_admin_error"].format(user_id=target_id),
-                reply_markup=await keyboards.admin_menu(),
+                reply_markup=keyboards.admin_menu(),
             )
 
         await db.deactivate_user(target_id)
         await message.answer(
             MESSAGES["admin_ban_success"].format(user_id=target_id),
-            reply_markup=await keyboards.admin_menu(),
+            reply_markup=keyboards.admin_menu(),
         )
         await state.set_state(AdminState.main)
     except ValueError:
         await message.answer(
             MESSAGES["admin_error"].format(user_id=message.text),
-            reply_markup=await keyboards.admin_menu(),
+            reply_markup=keyboards.admin_menu(),
         )
 
 
-@router.message(AdminState.main, F.text == "🕊️ Розбан")
+@commands.table.label("🕊️ Розбан", AdminState.main)
 async def admin_unban_start(message: Message, state: FSMContext):
     await state.set_state(AdminState.waiting_for_unban)
     await message.answer(
-        MESSAGES["admin_unban_prompt"], reply_markup=await keyboards.cancel_admin()
+        MESSAGES["admin_unban_prompt"], reply_markup=keyboards.cancel_admin()
     )
 
 
-@router.message(AdminState.waiting_for_unban)
+@commands.table.capture(AdminState.waiting_for_unban)
 async def admin_unban_process(message: Message, state: FSMContext):
     if message.text == "❌ Скасувати":
         await state.set_state(AdminState.main)
         await message.answer(
-            MESSAGES["admin_unban_exit"], reply_markup=await keyboards.admin_menu()
+            MESSAGES["admin_unban_exit"], reply_markup=keyboards.admin_menu()
         )
         return
 
@@ -157,23 +162,22 @@ async def admin_unban_process(message: Message, state: FSMContext):
         await db.activate_user(target_id)
         await message.answer(
             MESSAGES["admin_unban_success"].format(user_id=target_id),
-            reply_markup=await keyboards.admin_menu(),
+            reply_markup=keyboards.admin_menu(),
         )
         await state.set_state(AdminState.main)
     except ValueError:
         await message.answer(
             MESSAGES["admin_error"].format(user_id=message.text),
-            reply_markup=await keyboards.admin_menu(),
+            reply_markup=keyboards.admin_menu(),
         )
 
 
-@router.callback_query(F.data.startswith("ban_user_"))
-async def admin_quick_ban(callback: CallbackQuery):
+@callbacks.table.register(callbacks.BAN_USER)
+async def admin_quick_ban(callback: CallbackQuery, target_id: int):
     if not await db.is_user_admin(callback.from_user.id):
         return
 
     try:
-        target_id = int(callback.data.split("_")[2])
         if await db.is_user_admin(target_id):
             await callback.answer(
                 MESSAGES["admin_ban_admin_error"].format(user_id=target_id),
@@ -182,11 +186,11 @@ async def admin_quick_ban(callback: CallbackQuery):
             return
 
         await db.deactivate_user(target_id)
-        await callback.message.edit_text(
-            MESSAGES["admin_ban_success"].format(user_id=target_id)
+        await views.edit(
+            callback.message, MESSAGES["admin_ban_success"].format(user_id=target_id)
         )
     except Exception as e:
-        await callback.answer("Error processing ban")
+        lane.submit(callback.answer("Error processing ban"))
 
 
 @router.message(Command("setadmin"))
@@ -212,21 +216,58 @@ async def cmd_set_admin(message: Message):
         await message.answer(MESSAGES["admin_error"].format(user_id=target_id))
 
 
-async def show_next_report(message: Message, state: FSMContext):
-    reports = await db.get_active_reports()
+ACTIVITY_COLUMNS = (
+    "letters_created",
+    "letters_delivered",
+    "letters_failed",
+    "letters_reported",
+    "registrations",
+    "active_users",
+)
 
-    if not reports:
+
+@router.message(Command("activity"))
+async def cmd_activity(message: Message):
+    if not await db.is_user_admin(message.from_user.id):
+        return
+
+    parts = message.text.split()
+    days = parts[1] if len(parts) > 1 else "7"
+
+    if days not in ("7", "30"):
+        await message.answer(MESSAGES["activity_info"])
+        return
+
+    rows = await db.get_activity(int(days))
+    lines = [
+        row["day"].strftime("%d.%m")
+        + "".join(f"{row[column]:>6}" for column in ACTIVITY_COLUMNS)
+        for row in rows
+    ]
+
+    await message.answer(
+        MESSAGES["activity_header"].format(days=days)
+        + "<pre>"
+        + "\n".join(lines)
+        + "</pre>"
+    )
+
+
+async def show_next_report(message: Message, state: FSMContext, admin_id: int):
+    report = await db.claim_next_report(admin_id)
+
+    if not report:
         await message.answer(
             "✅ Активних скарг немає! Все чисто.",
-            reply_markup=await keyboards.admin_menu(),
+            reply_markup=keyboards.admin_menu(),
         )
         await state.set_state(AdminState.main)
         return
 
-    report = reports[0]
+    queued = max(await db.get_open_reports_count(), 1)
 
     text = (
-        f"🚨 <b>Розгляд скарги</b> ({len(reports)} в черзі)\n\n"
+        f"🚨 <b>Розгляд скарги</b> ({queued} в черзі)\n\n"
         f"✉️ <b>Лист від:</b> <code>{report['sender_id']}</code>\n"
         f"👤 <b>Поскаржився:</b> <code>{report.get('reported_by', 'Н/Д')}</code>\n\n"
         f"📝 <b>Текст листа:</b>\n<blockquote>{report['content']}</blockquote>"
@@ -235,51 +276,67 @@ async def show_next_report(message: Message, state: FSMContext):
     await message.answer(
         text,
         parse_mode="HTML",
-        reply_markup=await keyboards.admin_report_actions(
+        reply_markup=keyboards.admin_report_actions(
             report["sender_id"], str(report["_id"])
         ),
     )
 
 
-@router.message(AdminState.main, F.text == "🚨 Скарги")
+@commands.table.label("🚨 Скарги", AdminState.main)
 async def admin_check_reports(message: Message, state: FSMContext):
-    await show_next_report(message, state)
+    await show_next_report(message, state, message.from_user.id)
+
+
+@callbacks.table.register(callbacks.REPORT_ACTION)
+async def admin_report_decision(
+    callback: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    action: int,
+    target_id: int,
+    letter_id: str,
+):
+    if not await db.is_user_admin(callback.from_user.id):
+        return
+
+    if action >= len(callbacks.REPORT_ACTIONS):
+        lane.submit(callback.answer())
+        return
 
+    action = callbacks.REPORT_ACTIONS[action]
+    admin_id = callback.from_user.id
 
-@router.callback_query(F.data.startswith("adm_"))
-async def admin_report_decision(callback: CallbackQuery, state: FSMContext, bot: Bot):
-    parts = callback.data.split("_")
-    action = parts[1]
-    target_id = int(parts[2])
-    letter_id = parts[3]
+    if action == "ban" and await db.is_user_admin(target_id):
+        await callback.answer("Це адмін! Не можу забанити", show_alert=True)
+        return
 
-    if action == "dismiss":
-        await db.close_report(letter_id, callback.from_user.id, "dismissed")
-        await callback.answer("Скаргу відхилено")
+    resolution = {"dismiss": "dismissed", "ban": "banned", "warn": "warned"}[action]
 
-    elif action == "ban":
-        if await db.is_user_admin(target_id):
-            await callback.answer("Це адмін! Не можу забанити", show_alert=True)
-            return
+    if not await db.close_report(letter_id, admin_id, resolution):
+        lane.submit(callback.answer("Цю скаргу вже розглянуто"))
+
+    elif action == "dismiss":
+        lane.submit(callback.answer("Скаргу відхилено"))
 
+    elif action == "ban":
         await db.deactivate_user(target_id)
-        await db.close_report(letter_id, callback.from_user.id, "banned")
-        await callback.answer("Користувача заблоковано")
+        await db.resolve_sender_reports(target_id, admin_id, "banned")
+        lane.submit(callback.answer("Користувача заблоковано"))
 
     elif action == "warn":
         warnings = await db.warn_user(target_id)
         if warnings >= 3:
             await db.deactivate_user(target_id)
-            await db.close_report(letter_id, callback.from_user.id, "banned_by_warns")
+            await db.update_report_resolution(letter_id, "warned", "banned_by_warns")
+            await db.resolve_sender_reports(target_id, admin_id, "banned_by_warns")
             try:
                 await bot.send_message(
                     target_id, "🚫 Ви отримали 3-тє попередження і були заблоковані."
                 )
             except:
                 pass
-            await callback.answer(f"3-й варн. Забанено.")
+            lane.submit(callback.answer(f"3-й варн. Забанено."))
         else:
-            await db.close_report(letter_id, callback.from_user.id, "warned")
             try:
                 await bot.send_message(
                     target_id,
@@ -287,8 +344,8 @@ async def admin_report_decision(callback: CallbackQuery, state: FSMContext, bot:
                 )
             except:
                 pass
-            await callback.answer(f"Варн видано ({warnings}/3)")
+            lane.submit(callback.answer(f"Варн видано ({warnings}/3)"))
 
-    await callback.message.delete()
+    lane.submit(views.delete(callback.message))
 
-    await show_next_report(callback.message, state)
+    await show_next_report(callback.message, state, admin_id)
@@ -1,18 +1,26 @@
 import math
-from aiogram import Router, F, Bot
+from typing import Optional
+from aiogram import Router, Bot
 from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
 
 from src.states import LetterState, InboxState
 from src.messages import MESSAGES
-import src.utils as utils
+import src.callbacks as callbacks
+import src.commands as commands
+import src.moderation as moderation
 import src.keyboards as keyboards
 import src.database as db
+import src.history as history
+from src.prefetch import prefetcher
+from src.background import lane
+from src.notifications import notifier
+from src.views import views
 
 router = Router()
 
 
-@router.message(F.text == "✍️ Написати листа")
+@commands.table.label("✍️ Написати листа")
 async def write_letter(message: Message, state: FSMContext):
     user_id = message.from_user.id
 
@@ -28,11 +36,11 @@ async def write_letter(message: Message, state: FSMContext):
         + MESSAGES["letter_rules"]
     )
 
-    await message.answer(text, reply_markup=await keyboards.cancel_menu())
+    await message.answer(text, reply_markup=keyboards.cancel_menu())
     await state.set_state(LetterState.writing_letter)
 
 
-@router.message(LetterState.writing_letter, F.text == "🔙 Повернутися назад")
+@commands.table.label("🔙 Повернутися назад", LetterState.writing_letter)
 async def cancel_letter(message: Message, state: FSMContext):
     await state.clear()
 
@@ -40,36 +48,25 @@ async def cancel_letter(message: Message, state: FSMContext):
 
     await message.answer(
         MESSAGES["letter_cancelled"],
-        reply_markup=await keyboards.reply_options(is_admin),
+        reply_markup=keyboards.reply_options(is_admin),
     )
 
 
-@router.message(LetterState.writing_letter, F.text == "📬 Вхідні листи")
+@commands.table.label("📬 Вхідні листи", LetterState.writing_letter)
 async def open_inbox_from_writing(message: Message, state: FSMContext):
     await state.clear()
     await open_inbox(message)
 
 
-@router.message(LetterState.writing_letter, F.text)
+@commands.table.capture(LetterState.writing_letter)
 async def send_letter(message: Message, state: FSMContext):
     sender_id = message.from_user.id
     content = message.text
     is_admin = await db.is_user_admin(sender_id)
 
-    if utils.contains_bad_words(content):
-        await message.answer(MESSAGES["bad_words_warning"])
-        return
-
-    if utils.contains_links_or_urls(content):
-        await message.answer("❌ Посилання неприпустимі у листах!")
-        return
-
-    if len(content) < 10:
-        await message.answer(MESSAGES["letter_too_short_error"])
-        return
-
-    if len(content) > 1000:
-        await message.answer(MESSAGES["letter_too_long_error"].format(max_length=1000))
+    verdict = await moderation.check(content, sender_id, "letter")
+    if not verdict.ok:
+        await message.answer(verdict.text)
         return
 
     sender = await db.get_user(sender_id)
@@ -82,7 +79,7 @@ async def send_letter(message: Message, state: FSMContext):
         settings = await db.get_user_settings(sender_id)
         msg_key = "no_recipient2" if settings.get("filter_course") else "no_recipient"
         await message.answer(
-            MESSAGES[msg_key], reply_markup=await keyboards.reply_options(is_admin)
+            MESSAGES[msg_key], reply_markup=keyboards.reply_options(is_admin)
         )
         await state.clear()
         return
@@ -97,12 +94,34 @@ async def send_letter(message: Message, state: FSMContext):
     await message.answer(
         MESSAGES["letter_sent_confirm"].format(time=delivery_time.strftime("%H:%M"))
         + f"\n\n📉 Залишилось листів: <b>{remaining}/3</b>",
-        reply_markup=await keyboards.reply_options(is_admin),
+        reply_markup=keyboards.reply_options(is_admin),
     )
     await state.clear()
 
 
-@router.message(F.text == "📬 Вхідні листи")
+def prefetch_inbox_page(user_id: int, page: int, total_pages: int):
+    if page < total_pages:
+        prefetcher.schedule(
+            user_id,
+            ("inbox", page),
+            lambda: db.get_inbox(
+                user_id, page=page, page_size=keyboards.INBOX_PAGE_SIZE
+            ),
+        )
+
+
+def prefetch_book_page(user_id: int, page: int, total_pages: int):
+    if page < total_pages:
+        prefetcher.schedule(
+            user_id,
+            ("book", page),
+            lambda: db.get_conversation_list(
+                user_id, page=page, page_size=keyboards.ALL_LETTERS_PAGE_SIZE
+            ),
+        )
+
+
+@commands.table.label("📬 Вхідні листи")
 async def open_inbox(message: Message):
     user_id = message.from_user.id
     is_admin = await db.is_user_admin(user_id)
@@ -114,7 +133,7 @@ async def open_inbox(message: Message):
     if not letters:
         await message.answer(
             MESSAGES["inbox_empty"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
         return
 
@@ -124,13 +143,14 @@ async def open_inbox(message: Message):
         MESSAGES["inbox_prompt"].format(
             count=total_count, page=1, total_pages=total_pages
         ),
-        reply_markup=await keyboards.inbox_list(
+        reply_markup=keyboards.inbox_list(
             letters, page=0, total_pages=total_pages
         ),
     )
+    prefetch_inbox_page(user_id, 1, total_pages)
 
 
-@router.message(F.text == "📚 Історія листувань")
+@commands.table.label("📚 Історія листувань")
 async def open_book_of_letters(message: Message, state: FSMContext):
     user_id = message.from_user.id
     is_admin = await db.is_user_admin(user_id)
@@ -141,7 +161,7 @@ async def open_book_of_letters(message: Message, state: FSMContext):
 
     if not conversations:
         await message.answer(
-            MESSAGES["book_empty"], reply_markup=await keyboards.reply_options(is_admin)
+            MESSAGES["book_empty"], reply_markup=keyboards.reply_options(is_admin)
         )
         return
 
@@ -154,24 +174,26 @@ async def open_book_of_letters(message: Message, state: FSMContext):
     await state.update_data(book_page=0)
     await message.answer(
         text,
-        reply_markup=await keyboards.book_of_letters(
+        reply_markup=keyboards.book_of_letters(
             conversations, page=0, total_pages=total_pages
         ),
     )
+    prefetch_book_page(user_id, 1, total_pages)
 
 
-@router.callback_query(F.data.startswith("book_page_"))
-async def change_book_page(callback: CallbackQuery, state: FSMContext):
-    page = int(callback.data.split("_")[2])
+@callbacks.table.register(callbacks.BOOK_PAGE)
+async def change_book_page(callback: CallbackQuery, state: FSMContext, page: int):
     user_id = callback.from_user.id
 
-    conversations, total_count = await db.get_conversation_list(
+    conversations, total_count = await prefetcher.take(
+        user_id, ("book", page)
+    ) or await db.get_conversation_list(
         user_id, page=page, page_size=keyboards.ALL_LETTERS_PAGE_SIZE
     )
     total_pages = math.ceil(total_count / keyboards.ALL_LETTERS_PAGE_SIZE)
 
     if not conversations and page > 0:
-        await callback.answer("Сторінка більше недоступна")
+        lane.submit(callback.answer("Сторінка більше недоступна"))
         return
 
     text = MESSAGES["book_of_letters_prompt"].format(
@@ -179,76 +201,122 @@ async def change_book_page(callback: CallbackQuery, state: FSMContext):
     )
 
     await state.update_data(book_page=page)
-    await callback.message.edit_text(
+    await views.edit(
+        callback.message,
         text,
-        reply_markup=await keyboards.book_of_letters(
+        reply_markup=keyboards.book_of_letters(
             conversations, page=page, total_pages=total_pages
         ),
     )
-    await callback.answer()
+    lane.submit(callback.answer())
+    prefetch_book_page(user_id, page + 1, total_pages)
 
 
-@router.callback_query(F.data.startswith("book_thread_"))
-async def open_book_thread(callback: CallbackQuery, state: FSMContext):
-    other_id = int(callback.data.split("_")[2])
-    me_id = callback.from_user.id
-    page = 0
+async def load_history_page(
+    me_id: int, other_id: int, start: Optional[history.Cursor]
+) -> Optional[history.Page]:
+    version = await db.get_dialogue_version(me_id, other_id)
+    key = history.page_cache.key(me_id, other_id, start, version)
+    rendered = history.page_cache.get(key) if version is not None else None
 
-    page_letters, total_pages, current_page, total_letters = (
-        await db.get_dialogue_history_with_pagination(
-            me_id, other_id, page=page, letters_per_page=2
-        )
+    if rendered is not None:
+        return rendered
+
+    letters = await db.get_dialogue_history_cursor(
+        me_id, other_id, after=start.key if start else None
     )
 
-    if not page_letters:
-        await callback.answer(MESSAGES["thread_empty"], show_alert=True)
-        return
+    if letters is None:
+        return None
+
+    nickname = await db.get_conversation_nickname(me_id, other_id)
+    rendered = await history.render_page(letters, me_id, nickname, start)
+    await letters.close()
+
+    if rendered and version is not None:
+        history.page_cache.put(key, rendered)
+
+    return rendered
+
+
+async def show_history_page(
+    message: Message,
+    state: FSMContext,
+    me_id: int,
+    other_id: int,
+    page: int,
+    cursors: list,
+    from_book: bool,
+    edit: bool,
+) -> bool:
+    start = history.Cursor(*cursors[page]) if cursors[page] else None
+    rendered = await prefetcher.take(
+        me_id, ("history", other_id, start)
+    ) or await load_history_page(me_id, other_id, start)
+
+    if not rendered:
+        return False
+
+    cursors = cursors[: page + 1]
+    if rendered.next_cursor:
+        cursors.append(list(rendered.next_cursor))
 
     await state.update_data(
         history_other_id=other_id,
-        history_page=page,
         history_me_id=me_id,
-        history_from_book=True,
+        history_from_book=from_book,
+        history_page=page,
+        history_cursors=cursors,
     )
 
-    start_letter_num = page * 2 + 1
-    end_letter_num = start_letter_num + len(page_letters) - 1
-    text_lines = [
-        f"📜 <b>Історія листування</b> (листи {start_letter_num}-{end_letter_num} з {total_letters})\n〰️〰️〰️〰️〰️〰️\n"
-    ]
+    markup = keyboards.history_nav(page, bool(rendered.next_cursor), from_book)
 
-    for msg in page_letters:
-        is_me = msg.get("sender_id") == me_id
-        if is_me:
-            role = "🫵 <b>Ви</b>"
-        else:
-            nickname = await db.get_conversation_nickname(me_id, other_id)
-            role = f"🦉 <b>{nickname}</b>"
+    if edit:
+        await views.edit(
+            message, rendered.text, parse_mode="HTML", reply_markup=markup
+        )
+    else:
+        await message.answer(rendered.text, parse_mode="HTML", reply_markup=markup)
 
-        created_at = msg.get("created_at")
-        if created_at:
-            date = created_at.strftime("%d.%m %H:%M")
-        else:
-            date = "??.??"
+    if rendered.next_cursor:
+        prefetcher.schedule(
+            me_id,
+            ("history", other_id, rendered.next_cursor),
+            lambda: load_history_page(me_id, other_id, rendered.next_cursor),
+        )
 
-        content = msg.get("content", "[Текст відсутній]")
-        text_lines.append(f"{role} [{date}]:\n{content}\n")
+    return True
 
-    full_text = "\n".join(text_lines)
-    await callback.message.edit_text(
-        full_text,
-        parse_mode="HTML",
-        reply_markup=await keyboards.history_nav_book(current_page, total_pages),
+
+@callbacks.table.register(callbacks.BOOK_THREAD)
+async def open_book_thread(callback: CallbackQuery, state: FSMContext, other_id: int):
+    shown = await show_history_page(
+        callback.message,
+        state,
+        me_id=callback.from_user.id,
+        other_id=other_id,
+        page=0,
+        cursors=[None],
+        from_book=True,
+        edit=True,
     )
 
+    if not shown:
+        await callback.answer(MESSAGES["thread_empty"], show_alert=True)
+        return
+
+    lane.submit(callback.answer())
 
-@router.callback_query(F.data == "back_to_book")
+
+@callbacks.table.register(callbacks.BOOK_BACK)
 async def back_to_book(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
     page = data.get("book_page", 0)
     user_id = callback.from_user.id
 
-    conversations, total_count = await db.get_conversation_list(
+    conversations, total_count = await prefetcher.take(
+        user_id, ("book", page)
+    ) or await db.get_conversation_list(
         user_id, page=page, page_size=keyboards.ALL_LETTERS_PAGE_SIZE
     )
     total_pages = math.ceil(total_count / keyboards.ALL_LETTERS_PAGE_SIZE)
@@ -265,53 +333,54 @@ async def back_to_book(callback: CallbackQuery, state: FSMContext):
         count=total_count, page=page + 1, total=total_pages
     )
 
-    await callback.message.edit_text(
+    await views.edit(
+        callback.message,
         text,
-        reply_markup=await keyboards.book_of_letters(
+        reply_markup=keyboards.book_of_letters(
             conversations, page=page, total_pages=total_pages
         ),
     )
-    await callback.answer()
+    lane.submit(callback.answer())
 
 
-@router.callback_query(F.data == "close_book")
+@callbacks.table.register(callbacks.BOOK_CLOSE)
 async def close_book(callback: CallbackQuery, state: FSMContext):
     is_admin = await db.is_user_admin(callback.from_user.id)
     await state.clear()
-    await callback.message.delete()
+    lane.submit(views.delete(callback.message))
     await callback.message.answer(
-        MESSAGES["menu_prompt"], reply_markup=await keyboards.reply_options(is_admin)
+        MESSAGES["menu_prompt"], reply_markup=keyboards.reply_options(is_admin)
     )
 
 
-@router.callback_query(F.data.startswith("inbox_page_"))
-async def change_inbox_page(callback: CallbackQuery):
-    page = int(callback.data.split("_")[2])
+@callbacks.table.register(callbacks.INBOX_PAGE)
+async def change_inbox_page(callback: CallbackQuery, page: int):
     user_id = callback.from_user.id
 
-    letters, total_count = await db.get_inbox(
-        user_id, page=page, page_size=keyboards.INBOX_PAGE_SIZE
-    )
+    letters, total_count = await prefetcher.take(
+        user_id, ("inbox", page)
+    ) or await db.get_inbox(user_id, page=page, page_size=keyboards.INBOX_PAGE_SIZE)
     total_pages = math.ceil(total_count / keyboards.INBOX_PAGE_SIZE)
 
     if not letters and page > 0:
-        await callback.answer("Сторінка більше недоступна")
+        lane.submit(callback.answer("Сторінка більше недоступна"))
         return
 
-    await callback.message.edit_text(
+    await views.edit(
+        callback.message,
         MESSAGES["inbox_prompt"].format(
             count=total_count, page=page + 1, total_pages=total_pages
         ),
-        reply_markup=await keyboards.inbox_list(
+        reply_markup=keyboards.inbox_list(
             letters, page=page, total_pages=total_pages
         ),
     )
-    await callback.answer()
+    lane.submit(callback.answer())
+    prefetch_inbox_page(user_id, page + 1, total_pages)
 
 
-@router.callback_query(F.data.startswith("read_letter_"))
-async def read_letter(callback: CallbackQuery, state: FSMContext):
-    letter_id = callback.data.split("_")[2]
+@callbacks.table.register(callbacks.READ_LETTER)
+async def read_letter(callback: CallbackQuery, state: FSMContext, letter_id: str):
     letter = await db.get_letter(letter_id)
 
     if not letter:
@@ -320,8 +389,10 @@ async def read_letter(callback: CallbackQuery, state: FSMContext):
         letters, total_count = await db.get_inbox(callback.from_user.id)
         total_pages = math.ceil(total_count / keyboards.INBOX_PAGE_SIZE)
 
-        await callback.message.edit_reply_markup(
-            reply_markup=await keyboards.inbox_list(letters, total_pages=total_pages)
+        await views.edit(
+            callback.message,
+            callback.message.html_text,
+            reply_markup=keyboards.inbox_list(letters, total_pages=total_pages),
         )
         return
 
@@ -329,7 +400,7 @@ async def read_letter(callback: CallbackQuery, state: FSMContext):
         await db.mark_letter_read(letter_id)
 
     await state.update_data(current_letter_id=letter_id)
-    await callback.message.delete()
+    lane.submit(views.delete(callback.message))
 
     content = letter.get("content", "")
     date_sent = letter.get("created_at").strftime("%d.%m.%Y %H:%M")
@@ -343,11 +414,11 @@ async def read_letter(callback: CallbackQuery, state: FSMContext):
     )
 
     await callback.message.answer(
-        text, reply_markup=await keyboards.letter_options(letter_id)
+        text, reply_markup=keyboards.letter_options()
     )
 
 
-@router.message(F.text == "📜 Історія листування")
+@commands.table.label("📜 Історія листування")
 async def view_history(message: Message, state: FSMContext):
     data = await state.get_data()
     current_letter_id = data.get("current_letter_id")
@@ -362,60 +433,26 @@ async def view_history(message: Message, state: FSMContext):
         return
 
     me_id = message.from_user.id
-    other_id = letter["sender_id"]
-    page = 0
-
-    page_letters, total_pages, current_page, total_letters = (
-        await db.get_dialogue_history_with_pagination(
-            me_id, other_id, page=page, letters_per_page=2
-        )
+    other_id = (
+        letter["sender_id"] if letter["sender_id"] != me_id else letter["recipient_id"]
     )
 
-    if not page_letters:
-        await message.answer(MESSAGES["thread_empty"])
-        return
-
-    await state.update_data(
-        history_other_id=other_id,
-        history_page=page,
-        history_me_id=me_id,
-        history_from_book=False,
+    shown = await show_history_page(
+        message,
+        state,
+        me_id=me_id,
+        other_id=other_id,
+        page=0,
+        cursors=[None],
+        from_book=False,
+        edit=False,
     )
 
-    start_letter_num = page * 2 + 1
-    end_letter_num = start_letter_num + len(page_letters) - 1
-    text_lines = [
-        f"📜 <b>Історія листування</b> (листи {start_letter_num}-{end_letter_num} з {total_letters})\n〰️〰️〰️〰️〰️〰️\n"
-    ]
-
-    for msg in page_letters:
-        is_me = msg.get("sender_id") == me_id
-        if is_me:
-            role = "🫵 <b>Ви</b>"
-        else:
-            nickname = await db.get_conversation_nickname(me_id, other_id)
-            role = f"🦉 <b>{nickname}</b>"
-
-        created_at = msg.get("created_at")
-        if created_at:
-            date = created_at.strftime("%d.%m %H:%M")
-        else:
-            date = "??.??"
-
-        content = msg.get("content", "[Текст відсутній]")
-
-        text_lines.append(f"{role} [{date}]:\n{content}\n")
-
-    full_text = "\n".join(text_lines)
-
-    await message.answer(
-        full_text,
-        parse_mode="HTML",
-        reply_markup=await keyboards.history_nav_v2(current_page, total_pages),
-    )
+    if not shown:
+        await message.answer(MESSAGES["thread_empty"])
 
 
-@router.message(F.text == "📝 Перейменувати")
+@commands.table.label("📝 Перейменувати")
 async def rename_letter_start(message: Message, state: FSMContext):
     data = await state.get_data()
     letter_id = data.get("current_letter_id")
@@ -436,18 +473,15 @@ async def rename_letter_start(message: Message, state: FSMContext):
     current_nickname = await db.get_conversation_nickname(me_id, other_id)
     await state.update_data(renaming_letter_id=letter_id)
 
-    msg = await message.answer("*", reply_markup=ReplyKeyboardRemove())
-    await msg.delete()
-
     await message.answer(
         MESSAGES["rename_letter_prompt"]
         + f"\n\n<i>Поточне ім'я: <b>{current_nickname}</b></i>",
-        reply_markup=await keyboards.cancel_menu(),
+        reply_markup=keyboards.cancel_menu(),
     )
     await state.set_state(InboxState.renaming_letter)
 
 
-@router.message(InboxState.renaming_letter, F.text == "🔙 Повернутися назад")
+@commands.table.label("🔙 Повернутися назад", InboxState.renaming_letter)
 async def cancel_rename_letter(message: Message, state: FSMContext):
     data = await state.get_data()
     letter_id = data.get("current_letter_id")
@@ -472,10 +506,10 @@ async def cancel_rename_letter(message: Message, state: FSMContext):
         date=date_sent, content=content, nickname=nickname
     )
 
-    await message.answer(text, reply_markup=await keyboards.letter_options(letter_id))
+    await message.answer(text, reply_markup=keyboards.letter_options())
 
 
-@router.message(InboxState.renaming_letter, F.text)
+@commands.table.capture(InboxState.renaming_letter)
 async def process_rename_letter(message: Message, state: FSMContext):
     new_nickname = message.text
 
@@ -510,13 +544,13 @@ async def process_rename_letter(message: Message, state: FSMContext):
             reply_markup=ReplyKeyboardRemove(),
         )
         await message.answer(
-            text, reply_markup=await keyboards.letter_options(letter_id)
+            text, reply_markup=keyboards.letter_options()
         )
     else:
         await message.answer(MESSAGES["rename_letter_error"])
 
 
-@router.message(F.text == "✍️ Відповісти")
+@commands.table.label("✍️ Відповісти")
 async def reply_letter(message: Message, state: FSMContext):
     data = await state.get_data()
     letter_id = data.get("current_letter_id")
@@ -533,16 +567,13 @@ async def reply_letter(message: Message, state: FSMContext):
     original_sender_id = letter.get("sender_id")
     await state.update_data(reply_to_id=original_sender_id)
 
-    msg = await message.answer("*", reply_markup=ReplyKeyboardRemove())
-    await msg.delete()
-
     await message.answer(
-        MESSAGES["reply_prompt"], reply_markup=await keyboards.cancel_menu()
+        MESSAGES["reply_prompt"], reply_markup=keyboards.cancel_menu()
     )
     await state.set_state(InboxState.replying)
 
 
-@router.message(InboxState.replying, F.text)
+@commands.table.capture(InboxState.replying)
 async def send_reply(message: Message, state: FSMContext, bot: Bot):
     is_admin = await db.is_user_admin(message.from_user.id)
 
@@ -550,7 +581,7 @@ async def send_reply(message: Message, state: FSMContext, bot: Bot):
         await state.clear()
         await message.answer(
             MESSAGES["reply_cancelled"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
         return
 
@@ -560,16 +591,9 @@ async def send_reply(message: Message, state: FSMContext, bot: Bot):
     sender_id = message.from_user.id
     original_letter_id = data.get("current_letter_id")
 
-    if utils.contains_bad_words(content):
-        await message.answer(MESSAGES["bad_words_warning"])
-        return
-
-    if len(content) < 2:
-        await message.answer(MESSAGES["letter_too_short_error"])
-        return
-
-    if len(content) > 1000:
-        await message.answer(MESSAGES["letter_too_long_error"].format(max_length=1000))
+    verdict = await moderation.check(content, sender_id, "reply")
+    if not verdict.ok:
+        await message.answer(verdict.text)
         return
 
     delay = 1
@@ -587,12 +611,12 @@ async def send_reply(message: Message, state: FSMContext, bot: Bot):
 
     await message.answer(
         MESSAGES["letter_reply_sent"].format(time=delivery_time.strftime("%H:%M")),
-        reply_markup=await keyboards.reply_options(is_admin),
+        reply_markup=keyboards.reply_options(is_admin),
     )
     await state.clear()
 
 
-@router.message(F.text == "⚠️ Поскаржитись")
+@commands.table.label("⚠️ Поскаржитись")
 async def report_letter(message: Message, state: FSMContext, bot: Bot):
     is_admin = await db.is_user_admin(message.from_user.id)
     data = await state.get_data()
@@ -601,7 +625,7 @@ async def report_letter(message: Message, state: FSMContext, bot: Bot):
     if not letter_id:
         await message.answer(
             MESSAGES["report_error"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
         return
 
@@ -610,224 +634,45 @@ async def report_letter(message: Message, state: FSMContext, bot: Bot):
     if letter:
         await message.answer(
             MESSAGES["report_received"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
 
-        admin_ids = await db.get_admins()
-        for admin_id in admin_ids:
-            try:
-                await bot.send_message(admin_id, MESSAGES["new_report_notification"])
-            except Exception:
-                pass
+        notifier.report(bot)
     else:
         await message.answer(MESSAGES["report_error"])
 
 
-@router.message(F.text == "� Цей діалог")
-async def view_thread_dialog(message: Message, state: FSMContext):
-    data = await state.get_data()
-    current_letter_id = data.get("current_letter_id")
-
-    if not current_letter_id:
-        await message.answer("Спочатку відкрийте лист!")
-        return
-
-    letter = await db.get_letter(current_letter_id)
-    if not letter:
-        await message.answer("Лист не знайдено.")
-        return
-
-    me_id = message.from_user.id
-    other_id = (
-        letter["sender_id"] if letter["sender_id"] != me_id else letter["recipient_id"]
-    )
-
-    page_size = 10
-    page = 0
-    thread, total_count = await db.get_thread_page(
-        current_letter_id, page=page, page_size=page_size
-    )
-
-    if not thread:
-        await message.answer(MESSAGES["thread_empty"])
-        return
-
-    total_pages = max(1, math.ceil(total_count / page_size))
-    await state.update_data(
-        history_type="thread",
-        history_letter_id=current_letter_id,
-        history_page=page,
-        history_page_size=page_size,
-    )
-
-    text_lines = [
-        MESSAGES["thread_dialog_header"].format(page=page + 1, total_pages=total_pages)
-    ]
-
-    for msg in thread:
-        is_me = msg.get("sender_id") == me_id
-        if is_me:
-            role = "🫵 Ви"
-        else:
-            nickname = await db.get_conversation_nickname(me_id, other_id)
-            role = f"🦉 {nickname}"
-
-        created_at = msg.get("created_at")
-        if created_at:
-            date = created_at.strftime("%d.%m %H:%M")
-        else:
-            date = "??.??"
-
-        content = msg.get("content")
-        if content is None:
-            content = "[Текст відсутній]"
-
-        line = f"<b>{role}</b> [{date}]:\n{str(content)}\n"
-        text_lines.append(line)
-
-    full_text = "\n".join(text_lines)
-    if len(full_text) > 4000:
-        full_text = full_text[-4000:]
-        full_text = "...\n" + full_text
-
-    await message.answer(
-        full_text,
-        parse_mode="HTML",
-        reply_markup=await keyboards.history_nav(page, total_pages),
-    )
-
-
-@router.message(F.text == "📚 Всі листи")
-async def view_all_letters(message: Message, state: FSMContext):
-    data = await state.get_data()
-    current_letter_id = data.get("current_letter_id")
-
-    if not current_letter_id:
-        await message.answer("Спочатку відкрийте лист!")
-        return
-
-    letter = await db.get_letter(current_letter_id)
-    if not letter:
-        await message.answer("Лист не знайдено.")
-        return
-
-    me_id = message.from_user.id
-    other_id = letter["sender_id"]
-
-    page_size = 10
-    page = 0
-    history, total_count = await db.get_dialogue_history_page(
-        me_id, other_id, page=page, page_size=page_size
-    )
-
-    if not history:
-        await message.answer(MESSAGES["thread_empty"])
-        return
-
-    total_pages = max(1, math.ceil(total_count / page_size))
-    await state.update_data(
-        history_type="all",
-        history_other_id=other_id,
-        history_page=page,
-        history_page_size=page_size,
-    )
-
-    text_lines = [
-        MESSAGES["thread_all_header"].format(page=page + 1, total_pages=total_pages)
-    ]
-
-    for msg in history:
-        is_me = msg.get("sender_id") == me_id
-        if is_me:
-            role = "🫵 Ви"
-        else:
-            nickname = await db.get_conversation_nickname(me_id, other_id)
-            role = f"🦉 {nickname}"
-
-        created_at = msg.get("created_at")
-        if created_at:
-            date = created_at.strftime("%d.%m %H:%M")
-        else:
-            date = "??.??"
-
-        content = msg.get("content")
-        if content is None:
-            content = "[Текст відсутній]"
-
-        line = f"<b>{role}</b> [{date}]:\n{str(content)}\n"
-        text_lines.append(line)
-
-    full_text = "\n".join(text_lines)
-    if len(full_text) > 4000:
-        full_text = full_text[-4000:]
-        full_text = "...\n" + full_text
-
-    await message.answer(
-        full_text,
-        parse_mode="HTML",
-        reply_markup=await keyboards.history_nav(page, total_pages),
-    )
-
-
-@router.callback_query(F.data.startswith("history_page_"))
-async def change_history_page(callback: CallbackQuery, state: FSMContext):
-    page = int(callback.data.split("_")[2])
+@callbacks.table.register(callbacks.HISTORY_PAGE)
+async def change_history_page(callback: CallbackQuery, state: FSMContext, page: int):
     data = await state.get_data()
 
     other_id = data.get("history_other_id")
     me_id = data.get("history_me_id")
+    cursors = data.get("history_cursors") or []
 
-    if not other_id or not me_id:
+    if not other_id or not me_id or page >= len(cursors):
         await callback.answer(MESSAGES["session_lost"], show_alert=True)
         return
 
-    page_letters, total_pages, current_page, total_letters = (
-        await db.get_dialogue_history_with_pagination(
-            me_id, other_id, page=page, letters_per_page=2
-        )
+    shown = await show_history_page(
+        callback.message,
+        state,
+        me_id=me_id,
+        other_id=other_id,
+        page=page,
+        cursors=cursors,
+        from_book=bool(data.get("history_from_book")),
+        edit=True,
     )
 
-    if not page_letters:
-        await callback.answer("Сторінка більше недоступна")
+    if not shown:
+        lane.submit(callback.answer("Сторінка більше недоступна"))
         return
 
-    await state.update_data(history_page=page)
-
-    start_letter_num = page * 2 + 1
-    end_letter_num = start_letter_num + len(page_letters) - 1
-    text_lines = [
-        f"📜 <b>Історія листування</b> (листи {start_letter_num}-{end_letter_num} з {total_letters})\n〰️〰️〰️〰️〰️〰️\n"
-    ]
-
-    for msg in page_letters:
-        is_me = msg.get("sender_id") == me_id
-        if is_me:
-            role = "🫵 <b>Ви</b>"
-        else:
-            nickname = await db.get_conversation_nickname(me_id, other_id)
-            role = f"🦉 <b>{nickname}</b>"
-
-        created_at = msg.get("created_at")
-        if created_at:
-            date = created_at.strftime("%d.%m %H:%M")
-        else:
-            date = "??.??"
-
-        content = msg.get("content", "[Текст відсутній]")
-        text_lines.append(f"{role} [{date}]:\n{content}\n")
-
-    full_text = "\n".join(text_lines)
-    if data.get("history_from_book"):
-        nav_markup = await keyboards.history_nav_book(current_page, total_pages)
-    else:
-        nav_markup = await keyboards.history_nav_v2(current_page, total_pages)
-    await callback.message.edit_text(
-        full_text, parse_mode="HTML", reply_markup=nav_markup
-    )
-    await callback.answer()
+    lane.submit(callback.answer())
 
 
-@router.callback_query(F.data == "close_history")
+@callbacks.table.register(callbacks.HISTORY_CLOSE)
 async def close_history(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
     if data.get("history_from_book"):
@@ -856,17 +701,19 @@ async def close_history(callback: CallbackQuery, state: FSMContext):
             history_page=None,
             history_me_id=None,
             history_from_book=None,
+            history_cursors=None,
         )
-        await callback.message.edit_text(
+        await views.edit(
+            callback.message,
             text,
-            reply_markup=await keyboards.book_of_letters(
+            reply_markup=keyboards.book_of_letters(
                 conversations, page=page, total_pages=total_pages
             ),
         )
-        await callback.answer()
+        lane.submit(callback.answer())
         return
 
-    await callback.message.delete()
+    lane.submit(views.delete(callback.message))
 
     letter_id = data.get("current_letter_id")
 
@@ -890,7 +737,10 @@ async def close_history(callback: CallbackQuery, state: FSMContext):
     nickname = await db.get_conversation_nickname(me_id, other_id)
 
     await state.update_data(
-        history_other_id=None, history_page=None, history_me_id=None
+        history_other_id=None,
+        history_page=None,
+        history_me_id=None,
+        history_cursors=None,
     )
 
     await callback.message.answer(
@@ -898,11 +748,11 @@ async def close_history(callback: CallbackQuery, state: FSMContext):
             date=date_str, content=content, nickname=nickname
         ),
         parse_mode="HTML",
-        reply_markup=await keyboards.letter_options(letter_id),
+        reply_markup=keyboards.letter_options(),
     )
 
 
-@router.message(F.text == "🗃 Архівувати")
+@commands.table.label("🗃 Архівувати")
 async def archive_letter(message: Message, state: FSMContext):
     data = await state.get_data()
     letter_id = data.get("current_letter_id")
@@ -912,21 +762,20 @@ async def archive_letter(message: Message, state: FSMContext):
         await db.archive_letter(letter_id)
         await message.answer(
             MESSAGES["letter_archived"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
     else:
         await message.answer(
             MESSAGES["letter_not_found"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
 
     await state.clear()
 
 
-@router.message(F.text == "🔙 Назад до вхідних")
+@commands.table.label("🔙 Назад до вхідних")
 async def back_to_inbox(message: Message, state: FSMContext):
-    msg = await message.answer("*", reply_markup=ReplyKeyboardRemove())
-    await msg.delete()
+    await views.hide_reply_keyboard(message)
 
     await state.update_data(current_letter_id=None, reply_to_id=None)
     user_id = message.from_user.id
@@ -939,7 +788,7 @@ async def back_to_inbox(message: Message, state: FSMContext):
     if not letters:
         await message.answer(
             MESSAGES["inbox_empty"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
     else:
         total_pages = math.ceil(total_count / keyboards.INBOX_PAGE_SIZE)
@@ -947,23 +796,23 @@ async def back_to_inbox(message: Message, state: FSMContext):
             MESSAGES["inbox_prompt"].format(
                 count=total_count, page=1, total_pages=total_pages
             ),
-            reply_markup=await keyboards.inbox_list(
+            reply_markup=keyboards.inbox_list(
                 letters, page=0, total_pages=total_pages
             ),
         )
 
 
-@router.callback_query(F.data == "close_inbox")
+@callbacks.table.register(callbacks.INBOX_CLOSE)
 async def close_inbox(callback: CallbackQuery):
     is_admin = await db.is_user_admin(callback.from_user.id)
 
-    await callback.message.delete()
+    lane.submit(views.delete(callback.message))
     await callback.message.answer(
-        MESSAGES["menu_prompt"], reply_markup=await keyboards.reply_options(is_admin)
+        MESSAGES["menu_prompt"], reply_markup=keyboards.reply_options(is_admin)
     )
 
 
-@router.callback_query(F.data == "archive_all_letters")
+@callbacks.table.register(callbacks.INBOX_ARCHIVE_ALL)
 async def archive_all_inbox_letters(callback: CallbackQuery):
     user_id = callback.from_user.id
     archived_count = await db.archive_all_letters(user_id)
@@ -977,19 +826,19 @@ async def archive_all_inbox_letters(callback: CallbackQuery):
         is_admin = await db.is_user_admin(user_id)
 
         if not letters:
-            await callback.message.edit_text(MESSAGES["inbox_empty"])
-            await callback.message.delete()
+            lane.submit(views.delete(callback.message))
             await callback.message.answer(
                 MESSAGES["menu_prompt"],
-                reply_markup=await keyboards.reply_options(is_admin),
+                reply_markup=keyboards.reply_options(is_admin),
             )
         else:
             total_pages = math.ceil(total_count / keyboards.INBOX_PAGE_SIZE)
-            await callback.message.edit_text(
+            await views.edit(
+                callback.message,
                 MESSAGES["inbox_prompt"].format(
                     count=total_count, page=1, total_pages=total_pages
                 ),
-                reply_markup=await keyboards.inbox_list(
+                reply_markup=keyboards.inbox_list(
                     letters, page=0, total_pages=total_pages
                 ),
             )
@@ -997,6 +846,6 @@ async def archive_all_inbox_letters(callback: CallbackQuery):
         await callback.answer("📭 Немає листів для архівації", show_alert=True)
 
 
-@router.callback_query(F.data == "noop")
+@callbacks.table.register(callbacks.NOOP)
 async def noop_callback(callback: CallbackQuery):
-    await callback.answer()
+    lane.submit(callback.answer())
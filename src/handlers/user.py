@@ -1,17 +1,21 @@
-from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
-from aiogram.filters import CommandStart, Command, or_f
+from aiogram import Router
+from aiogram.types import Message, CallbackQuery
+from aiogram.filters import CommandStart, Command
 from aiogram.fsm.context import FSMContext
 
 from src.states import Registration, ProfileState
 from src.messages import MESSAGES
+import src.callbacks as callbacks
+import src.commands as commands
 import src.keyboards as keyboards
 import src.database as db
+from src.background import lane
+from src.views import views
 
 router = Router()
 
 
-@router.message(F.text == "curly hair")
+@commands.table.label("curly hair")
 async def curly_hair(message: Message):
     await message.answer("кірюшка баранчик лєхєнда)0))))")
 
@@ -27,7 +31,7 @@ async def cmd_start(message: Message, state: FSMContext):
         is_admin = await db.is_user_admin(message.from_user.id)
         await message.answer(
             MESSAGES["menu_prompt"],
-            reply_markup=await keyboards.reply_options(is_admin),
+            reply_markup=keyboards.reply_options(is_admin),
         )
     else:
         await message.answer(
@@ -36,86 +40,75 @@ async def cmd_start(message: Message, state: FSMContext):
         await state.set_state(Registration.academic_year)
 
 
-@router.callback_query(
-    Registration.academic_year,
-    F.data.in_(
-        [
-            "first_year",
-            "second_year",
-            "third_year",
-            "fourth_year",
-            "fifth_year",
-            "sixth_year",
-        ]
-    ),
-)
-async def academic_year(callback: CallbackQuery, state: FSMContext):
-    course_map = {
-        "first_year": "1-ий",
-        "second_year": "2-ий",
-        "third_year": "3-ий",
-        "fourth_year": "4-ий",
-        "fifth_year": "5-ий",
-        "sixth_year": "6-ий",
-    }
-
-    selected_course = course_map.get(callback.data)
+@callbacks.table.register(callbacks.COURSE, Registration.academic_year)
+async def academic_year(callback: CallbackQuery, state: FSMContext, course: int):
+    if course >= len(keyboards.COURSES):
+        lane.submit(callback.answer())
+        return
+
+    selected_course = keyboards.COURSES[course]
 
     await state.update_data(course=selected_course, hobbies=[])
     await state.set_state(Registration.hobbies_selection)
 
-    await callback.answer(f"{selected_course} курс")
-    await callback.message.edit_text(
+    lane.submit(callback.answer(f"{selected_course} курс"))
+    await views.edit(
+        callback.message,
         MESSAGES["ask_hobbies"],
-        reply_markup=await keyboards.personal_hobbies(page=0, selected=[]),
+        reply_markup=keyboards.personal_hobbies(page=0, selected=[]),
     )
 
 
-@router.callback_query(
-    or_f(Registration.hobbies_selection, ProfileState.editing_hobbies),
-    F.data.startswith("toggle_"),
+@callbacks.table.register(
+    callbacks.HOBBY_TOGGLE,
+    Registration.hobbies_selection,
+    ProfileState.editing_hobbies,
 )
-async def toggle_hobby(callback: CallbackQuery, state: FSMContext):
+async def toggle_hobby(
+    callback: CallbackQuery, state: FSMContext, hobby: int, page: int
+):
+    if hobby >= len(keyboards.ALL_HOBBIES):
+        lane.submit(callback.answer())
+        return
+
     data = await state.get_data()
     selected = data.get("hobbies", [])
 
-    parts = callback.data.split("_")
-    hobby_index = int(parts[1])
-    page = int(parts[2])
-
-    if hobby_index in selected:
-        selected.remove(hobby_index)
+    if hobby in selected:
+        selected.remove(hobby)
     else:
-        selected.append(hobby_index)
+        selected.append(hobby)
 
     await state.update_data(hobbies=selected)
 
-    await callback.message.edit_text(
+    await views.edit(
+        callback.message,
         MESSAGES["ask_hobbies"],
-        reply_markup=await keyboards.personal_hobbies(page, selected),
+        reply_markup=keyboards.personal_hobbies(page, selected),
     )
 
 
-@router.callback_query(
-    or_f(Registration.hobbies_selection, ProfileState.editing_hobbies),
-    F.data.startswith("page_"),
+@callbacks.table.register(
+    callbacks.HOBBY_PAGE,
+    Registration.hobbies_selection,
+    ProfileState.editing_hobbies,
 )
-async def change_page(callback: CallbackQuery, state: FSMContext):
+async def change_page(callback: CallbackQuery, state: FSMContext, page: int):
     data = await state.get_data()
     selected = data.get("hobbies", [])
 
-    page = int(callback.data.split("_")[1])
-
-    await callback.message.edit_text(
+    await views.edit(
+        callback.message,
         MESSAGES["ask_hobbies"],
-        reply_markup=await keyboards.personal_hobbies(page, selected),
+        reply_markup=keyboards.personal_hobbies(page, selected),
     )
-    await callback.answer()
+    lane.submit(callback.answer())
 
 
-@router.callback_query(
-    or_f(Registration.hobbies_selection, ProfileState.editing_hobbies),
-    F.data == "confirm",
+@callbacks.table.register(
+    callbacks.HOBBY_CONFIRM,
+    Registration.hobbies_selection,
+    ProfileState.editing_hobbies,
 )
 async def confirm_hobbies(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
@@ -126,31 +119,33 @@ async def confirm_hobbies(callback: CallbackQuery, state: FSMContext):
     current_state = await state.get_state()
 
     if len(selected) < 2:
-        await callback.answer("Помилка!")
-        await callback.message.edit_text(
+        lane.submit(callback.answer("Помилка!"))
+        await views.edit(
+            callback.message,
             MESSAGES["hobbies_error"],
-            reply_markup=await keyboards.personal_hobbies(page=0, selected=selected),
+            reply_markup=keyboards.personal_hobbies(page=0, selected=selected),
         )
     else:
         hobbies_list = [keyboards.ALL_HOBBIES[i] for i in selected]
         await db.store_user(callback.from_user.id, hobbies_list, course)
 
         await state.clear()
-        await callback.message.delete()
+        lane.submit(views.delete(callback.message))
 
         if current_state == Registration.hobbies_selection:
             await callback.message.answer(
                 MESSAGES["menu_prompt"],
-                reply_markup=await keyboards.reply_options(is_admin),
+                reply_markup=keyboards.reply_options(is_admin),
             )
         else:
             await callback.message.answer(
                 MESSAGES["hobbies_saved"],
-                reply_markup=await keyboards.reply_options(is_admin),
+                reply_markup=keyboards.reply_options(is_admin),
             )
 
 
-@router.message(or_f(Command("profile"), F.text == "👤 Профіль"))
+@router.message(Command("profile"))
+@commands.table.label("👤 Профіль")
 async def cmd_profile(message: Message):
     user_data = await db.get_user(message.from_user.id)
 
@@ -163,53 +158,35 @@ async def cmd_profile(message: Message):
 
         await message.answer(
             text,
-            reply_markup=await keyboards.profile_settings(settings["filter_course"]),
+            reply_markup=keyboards.profile_settings(settings["filter_course"]),
         )
     else:
         await message.answer("Профіль не знайдено. Натисніть /start для початку!")
 
 
-@router.message(F.text == "🔙 Повернутися назад")
+@commands.table.label("🔙 Повернутися назад")
 async def close_profile(message: Message):
     is_admin = await db.is_user_admin(message.from_user.id)
     await message.answer(
-        MESSAGES["menu_prompt"], reply_markup=await keyboards.reply_options(is_admin)
+        MESSAGES["menu_prompt"], reply_markup=keyboards.reply_options(is_admin)
     )
 
 
-@router.message(F.text == "📚 Змінити курс")
+@commands.table.label("📚 Змінити курс")
 async def edit_course(message: Message, state: FSMContext):
-    msg = await message.answer("*", reply_markup=ReplyKeyboardRemove())
-    await msg.delete()
+    await views.hide_reply_keyboard(message)
 
     await state.set_state(ProfileState.editing_course)
     await message.answer(MESSAGES["ask_course"], reply_markup=keyboards.academic_year)
 
 
-@router.callback_query(
-    ProfileState.editing_course,
-    F.data.in_(
-        [
-            "first_year",
-            "second_year",
-            "third_year",
-            "fourth_year",
-            "fifth_year",
-            "sixth_year",
-        ]
-    ),
-)
-async def update_course(callback: CallbackQuery, state: FSMContext):
-    course_map = {
-        "first_year": "1-ий",
-        "second_year": "2-ий",
-        "third_year": "3-ий",
-        "fourth_year": "4-ий",
-        "fifth_year": "5-ий",
-        "sixth_year": "6-ий",
-    }
-
-    new_course = course_map.get(callback.data)
+@callbacks.table.register(callbacks.COURSE, ProfileState.editing_course)
+async def update_course(callback: CallbackQuery, state: FSMContext, course: int):
+    if course >= len(keyboards.COURSES):
+        lane.submit(callback.answer())
+        return
+
+    new_course = keyboards.COURSES[course]
     user_data = await db.get_user(callback.from_user.id)
     current_hobbies = user_data.get("hobbies", [])
     is_admin = await db.is_user_admin(callback.from_user.id)
@@ -217,17 +194,16 @@ async def update_course(callback: CallbackQuery, state: FSMContext):
     await db.store_user(callback.from_user.id, current_hobbies, new_course)
     await state.clear()
 
-    await callback.message.delete()
+    lane.submit(views.delete(callback.message))
     await callback.message.answer(
         f"✅ Курс змінено на {new_course}!",
-        reply_markup=await keyboards.reply_options(is_admin),
+        reply_markup=keyboards.reply_options(is_admin),
     )
 
 
-@router.message(F.text == "🎨 Змінити хобі")
+@commands.table.label("🎨 Змінити хобі")
 async def edit_hobbies(message: Message, state: FSMContext):
-    msg = await message.answer("*", reply_markup=ReplyKeyboardRemove())
-    await msg.delete()
+    await views.hide_reply_keyboard(message)
 
     user_data = await db.get_user(message.from_user.id)
     current_hobbies_list = user_data.get("hobbies", [])
@@ -242,18 +218,19 @@ async def edit_hobbies(message: Message, state: FSMContext):
 
     await message.answer(
         MESSAGES["ask_hobbies"],
-        reply_markup=await keyboards.personal_hobbies(
+        reply_markup=keyboards.personal_hobbies(
             page=0, selected=selected_indices
         ),
     )
 
 
-@router.message(F.text.startswith("⚙️"))
+@commands.table.label("⚙️ Тільки мій курс 🟢")
+@commands.table.label("⚙️ Тільки мій курс 🔴")
 async def toggle_filter(message: Message):
     new_state = await db.toggle_filter_course(message.from_user.id)
     state_text = "🟢 УВІМКНЕНО" if new_state else "🔴 ВИМКНЕНО"
 
     await message.answer(
         f"Фільтр за курсом: {state_text}",
-        reply_markup=await keyboards.profile_settings(new_state),
+        reply_markup=keyboards.profile_settings(new_state),
     )
@@ -0,0 +1,158 @@
+import html
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterable, NamedTuple, Optional
+
+MESSAGE_LIMIT = 4096
+HEADER = "📜 <b>Історія листування</b> (листи {first}-{last})\n〰️〰️〰️〰️〰️〰️\n\n"
+HEADER_RESERVE = HEADER.format(first=99999, last=99999)
+CONTINUED = "…"
+MISSING_CONTENT = "[Текст відсутній]"
+PAGE_CACHE_SIZE = 1024
+
+
+class Cursor(NamedTuple):
+    created_at: str
+    letter_id: str
+    offset: int
+    index: int
+
+    @property
+    def key(self) -> tuple[datetime, str]:
+        return datetime.fromisoformat(self.created_at), self.letter_id
+
+
+class Page(NamedTuple):
+    text: str
+    next_cursor: Optional[Cursor]
+
+
+def utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _fit(content: str, budget: int) -> int:
+    used = 0
+
+    for index, char in enumerate(content):
+        used += utf16_len(html.escape(char))
+
+        if used > budget:
+            break
+    else:
+        return len(content)
+
+    space = content.rfind(" ", 0, index)
+
+    return space + 1 if space > index // 2 else index
+
+
+def _head(letter: dict, me_id: int, nickname: str, continued: bool) -> str:
+    if letter.get("sender_id") == me_id:
+        role = "🫵 <b>Ви</b>"
+    else:
+        role = f"🦉 <b>{html.escape(nickname)}</b>"
+
+    created_at = letter.get("created_at")
+    date = created_at.strftime("%d.%m %H:%M") if created_at else "??.??"
+
+    return f"{role} [{date}]:\n" + (CONTINUED if continued else "")
+
+
+async def render_page(
+    letters: AsyncIterable[dict],
+    me_id: int,
+    nickname: str,
+    start: Optional[Cursor] = None,
+    limit: int = MESSAGE_LIMIT,
+) -> Optional[Page]:
+    budget = limit - utf16_len(HEADER_RESERVE)
+    parts: list[str] = []
+    index = start.index if start else 0
+    next_cursor = None
+
+    async for letter in letters:
+        letter_id = str(letter["_id"])
+        offset = start.offset if start and letter_id == start.letter_id else 0
+        content = (letter.get("content") or MISSING_CONTENT)[offset:]
+
+        head = _head(letter, me_id, nickname, continued=offset > 0)
+        entry = head + html.escape(content) + "\n\n"
+        size = utf16_len(entry)
+
+        if size <= budget:
+            parts.append(entry)
+            budget -= size
+            index += 1
+            continue
+
+        created_at = letter["created_at"].isoformat()
+
+        if parts:
+            next_cursor = Cursor(created_at, letter_id, offset, index)
+            break
+
+        taken = _fit(content, budget - utf16_len(head + CONTINUED + "\n\n"))
+        parts.append(head + html.escape(content[:taken]) + CONTINUED + "\n\n")
+        index += 1
+        next_cursor = Cursor(created_at, letter_id, offset + taken, index - 1)
+        break
+
+    if not parts:
+        return None
+
+    first = (start.index if start else 0) + 1
+    header = HEADER.format(first=first, last=index)
+
+    return Page(header + "".join(parts).rstrip("\n"), next_cursor)
+
+
+def dialogue_id(user_id: int, other_user_id: int) -> str:
+    return f"{min(user_id, other_user_id)}:{max(user_id, other_user_id)}"
+
+
+class PageCache:
+    def __init__(self, maxsize: int = PAGE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple, Page] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(me_id: int, other_id: int, start: Optional[Cursor], version: int) -> tuple:
+        return me_id, other_id, start, version
+
+    def get(self, key: tuple) -> Optional[Page]:
+        page = self._items.get(key)
+
+        if page is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._items.move_to_end(key)
+
+        return page
+
+    def put(self, key: tuple, page: Page):
+        self._items[key] = page
+        self._items.move_to_end(key)
+
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+
+        return {
+            "size": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+page_cache = PageCache()
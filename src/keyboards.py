@@ -1,24 +1,47 @@
 import math
+from functools import lru_cache
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, KeyboardButton
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
 
+import src.callbacks as callbacks
+
 academic_year = InlineKeyboardMarkup(
     inline_keyboard=[
         [
-            InlineKeyboardButton(text="🐣 1-ий курс", callback_data="first_year"),
-            InlineKeyboardButton(text="🎓 2-ий курс", callback_data="second_year"),
+            InlineKeyboardButton(
+                text="🐣 1-ий курс",
+                callback_data=callbacks.pack(callbacks.COURSE, course=0),
+            ),
+            InlineKeyboardButton(
+                text="🎓 2-ий курс",
+                callback_data=callbacks.pack(callbacks.COURSE, course=1),
+            ),
         ],
         [
-            InlineKeyboardButton(text="🧠 3-ий курс", callback_data="third_year"),
-            InlineKeyboardButton(text="🦁 4-ий курс", callback_data="fourth_year"),
+            InlineKeyboardButton(
+                text="🧠 3-ий курс",
+                callback_data=callbacks.pack(callbacks.COURSE, course=2),
+            ),
+            InlineKeyboardButton(
+                text="🦁 4-ий курс",
+                callback_data=callbacks.pack(callbacks.COURSE, course=3),
+            ),
         ],
         [
-            InlineKeyboardButton(text="👨‍🎓 5-ий курс", callback_data="fifth_year"),
-            InlineKeyboardButton(text="👨‍🏫 6-ий курс", callback_data="sixth_year"),
+            InlineKeyboardButton(
+                text="👨‍🎓 5-ий курс",
+                callback_data=callbacks.pack(callbacks.COURSE, course=4),
+            ),
+            InlineKeyboardButton(
+                text="👨‍🏫 6-ий курс",
+                callback_data=callbacks.pack(callbacks.COURSE, course=5),
+            ),
         ],
     ]
 )
 
+COURSES = ["1-ий", "2-ий", "3-ий", "4-ий", "5-ий", "6-ий"]
+
 ALL_HOBBIES = [
     "🎵 Музика",
     "🎮 Ігри",
@@ -37,37 +60,68 @@ ALL_HOBBIES = [
 PAGE_SIZE = 6
 
 
-async def personal_hobbies(page: int, selected: list[int]):
+@lru_cache(maxsize=None)
+def _personal_hobbies(page: int, selected_mask: int):
     builder = InlineKeyboardBuilder()
     start = page * PAGE_SIZE
     end = start + PAGE_SIZE
     hobbies_on_page = ALL_HOBBIES[start:end]
 
     for i, hobby in enumerate(hobbies_on_page, start=start):
-        status = "✅" if i in selected else "⬜️"
+        status = "✅" if selected_mask >> i & 1 else "⬜️"
         text = f"{status} {hobby}"
-        builder.add(InlineKeyboardButton(text=text, callback_data=f"toggle_{i}_{page}"))
+        builder.add(
+            InlineKeyboardButton(
+                text=text,
+                callback_data=callbacks.pack(
+                    callbacks.HOBBY_TOGGLE, hobby=i, page=page
+                ),
+            )
+        )
 
     nav_row = []
     if page > 0:
         nav_row.append(
-            InlineKeyboardButton(text="⬅️ Туди", callback_data=f"page_{page - 1}")
+            InlineKeyboardButton(
+                text="⬅️ Туди",
+                callback_data=callbacks.pack(callbacks.HOBBY_PAGE, page=page - 1),
+            )
         )
     total_pages = math.ceil(len(ALL_HOBBIES) / PAGE_SIZE)
     if page < total_pages - 1:
         nav_row.append(
-            InlineKeyboardButton(text="Сюди ➡️", callback_data=f"page_{page + 1}")
+            InlineKeyboardButton(
+                text="Сюди ➡️",
+                callback_data=callbacks.pack(callbacks.HOBBY_PAGE, page=page + 1),
+            )
         )
 
     if nav_row:
         builder.row(*nav_row)
 
-    builder.row(InlineKeyboardButton(text="💾 Зберегти вибір", callback_data="confirm"))
+    builder.row(
+        InlineKeyboardButton(
+            text="💾 Зберегти вибір",
+            callback_data=callbacks.pack(callbacks.HOBBY_CONFIRM),
+        )
+    )
 
     return builder.adjust(2).as_markup()
 
 
-async def reply_options(is_admin: bool = False):
+def personal_hobbies(page: int, selected: list[int]):
+    start = page * PAGE_SIZE
+    selected_mask = 0
+
+    for i in selected:
+        if start <= i < start + PAGE_SIZE:
+            selected_mask |= 1 << i
+
+    return _personal_hobbies(page, selected_mask)
+
+
+@lru_cache(maxsize=None)
+def reply_options(is_admin: bool = False):
     builder = ReplyKeyboardBuilder()
 
     builder.row(KeyboardButton(text="✍️ Написати листа"))
@@ -82,19 +136,22 @@ async def reply_options(is_admin: bool = False):
     return builder.as_markup(resize_keyboard=True)
 
 
-async def cancel_menu():
+@lru_cache(maxsize=None)
+def cancel_menu():
     builder = ReplyKeyboardBuilder()
     builder.add(KeyboardButton(text="🔙 Повернутися назад"))
     return builder.as_markup(resize_keyboard=True)
 
 
-async def cancel_admin():
+@lru_cache(maxsize=None)
+def cancel_admin():
     builder = ReplyKeyboardBuilder()
     builder.add(KeyboardButton(text="❌ Скасувати"))
     return builder.as_markup(resize_keyboard=True)
 
 
-async def profile_settings(filter_enabled: bool):
+@lru_cache(maxsize=None)
+def profile_settings(filter_enabled: bool):
     builder = ReplyKeyboardBuilder()
 
     filter_status = "🟢" if filter_enabled else "🔴"
@@ -112,13 +169,14 @@ async def profile_settings(filter_enabled: bool):
 INBOX_PAGE_SIZE = 5
 
 
-async def inbox_list(letters, total_pages: int, page: int = 0):
+def inbox_list(letters, total_pages: int, page: int = 0):
     builder = InlineKeyboardBuilder()
 
     if not letters:
         builder.row(
             InlineKeyboardButton(
-                text="🔙 Згорнути скриньку", callback_data="close_inbox"
+                text="🔙 Згорнути скриньку",
+                callback_data=callbacks.pack(callbacks.INBOX_CLOSE),
             )
         )
         return builder.as_markup()
@@ -130,13 +188,15 @@ async def inbox_list(letters, total_pages: int, page: int = 0):
         created_at = letter.get("created_at")
         time_str = created_at.strftime("%H:%M") if created_at else ""
 
-        content = letter.get("content", "")
-        preview = content[:20] + "..." if len(content) > 20 else content
+        preview = letter.get("preview", "")
         btn_text = f"{icon} {time_str} | {preview}"
 
         builder.add(
             InlineKeyboardButton(
-                text=btn_text, callback_data=f"read_letter_{letter['_id']}"
+                text=btn_text,
+                callback_data=callbacks.pack(
+                    callbacks.READ_LETTER, letter_id=letter["_id"]
+                ),
             )
         )
 
@@ -146,13 +206,17 @@ async def inbox_list(letters, total_pages: int, page: int = 0):
     if page > 0:
         nav_row.append(
             InlineKeyboardButton(
-                text="⬅️ Назад", callback_data=f"inbox_page_{page - 1}"
+                text="⬅️ Назад",
+                callback_data=callbacks.pack(callbacks.INBOX_PAGE, page=page - 1),
             )
         )
 
     if page < total_pages - 1:
         nav_row.append(
-            InlineKeyboardButton(text="Далі ➡️", callback_data=f"inbox_page_{page + 1}")
+            InlineKeyboardButton(
+                text="Далі ➡️",
+                callback_data=callbacks.pack(callbacks.INBOX_PAGE, page=page + 1),
+            )
         )
 
     if nav_row:
@@ -160,17 +224,22 @@ async def inbox_list(letters, total_pages: int, page: int = 0):
 
     builder.row(
         InlineKeyboardButton(
-            text="🗂 Архівувати всі", callback_data="archive_all_letters"
+            text="🗂 Архівувати всі",
+            callback_data=callbacks.pack(callbacks.INBOX_ARCHIVE_ALL),
         )
     )
     builder.row(
-        InlineKeyboardButton(text="🔙 Згорнути скриньку", callback_data="close_inbox")
+        InlineKeyboardButton(
+            text="🔙 Згорнути скриньку",
+            callback_data=callbacks.pack(callbacks.INBOX_CLOSE),
+        )
     )
 
     return builder.as_markup()
 
 
-async def letter_options(letter_id):
+@lru_cache(maxsize=None)
+def letter_options():
     builder = ReplyKeyboardBuilder()
 
     builder.row(KeyboardButton(text="✍️ Відповісти"))
@@ -186,39 +255,8 @@ async def letter_options(letter_id):
     return builder.as_markup(resize_keyboard=True)
 
 
-async def history_nav_v2(page: int, total_pages: int):
-    builder = InlineKeyboardBuilder()
-
-    nav_row = []
-    if page > 0:
-        nav_row.append(
-            InlineKeyboardButton(
-                text="⬅️ Назад", callback_data=f"history_page_{page - 1}"
-            )
-        )
-
-    nav_row.append(
-        InlineKeyboardButton(text=f"{page + 1}/{total_pages}", callback_data="noop")
-    )
-
-    if page < total_pages - 1:
-        nav_row.append(
-            InlineKeyboardButton(
-                text="Далі ➡️", callback_data=f"history_page_{page + 1}"
-            )
-        )
-
-    builder.row(*nav_row)
-    builder.row(
-        InlineKeyboardButton(
-            text="🔙 Повернутися до листа", callback_data="close_history"
-        )
-    )
-
-    return builder.as_markup()
-
-
-async def admin_menu():
+@lru_cache(maxsize=None)
+def admin_menu():
     builder = ReplyKeyboardBuilder()
 
     builder.row(KeyboardButton(text="🚨 Скарги"), KeyboardButton(text="📊 Статистика"))
@@ -229,33 +267,44 @@ async def admin_menu():
     return builder.as_markup(resize_keyboard=True)
 
 
-async def admin_report_actions(sender_id: int, letter_id: str):
+def report_action(action: str, sender_id: int, letter_id: str) -> str:
+    return callbacks.pack(
+        callbacks.REPORT_ACTION,
+        action=callbacks.REPORT_ACTIONS.index(action),
+        target_id=sender_id,
+        letter_id=letter_id,
+    )
+
+
+def admin_report_actions(sender_id: int, letter_id: str):
     builder = InlineKeyboardBuilder()
 
     builder.add(
         InlineKeyboardButton(
-            text="🔨 Бан", callback_data=f"adm_ban_{sender_id}_{letter_id}"
+            text="🔨 Бан", callback_data=report_action("ban", sender_id, letter_id)
         )
     )
     builder.add(
         InlineKeyboardButton(
-            text="⚠️ Варн", callback_data=f"adm_warn_{sender_id}_{letter_id}"
+            text="⚠️ Варн", callback_data=report_action("warn", sender_id, letter_id)
         )
     )
     builder.add(
         InlineKeyboardButton(
-            text="🗑 Відхилити", callback_data=f"adm_dismiss_{sender_id}_{letter_id}"
+            text="🗑 Відхилити",
+            callback_data=report_action("dismiss", sender_id, letter_id),
         )
     )
 
     return builder.adjust(2).as_markup()
 
 
-async def letter_ban(user_id):
+def letter_ban(user_id):
     builder = InlineKeyboardBuilder()
     builder.add(
         InlineKeyboardButton(
-            text="🚫 Заблокувати користувача", callback_data=f"ban_user_{user_id}"
+            text="🚫 Заблокувати користувача",
+            callback_data=callbacks.pack(callbacks.BAN_USER, target_id=user_id),
         )
     )
     return builder.as_markup()
@@ -264,11 +313,15 @@ async def letter_ban(user_id):
 ALL_LETTERS_PAGE_SIZE = 4
 
 
-async def book_of_letters(conversations, total_pages: int, page: int = 0):
+def book_of_letters(conversations, total_pages: int, page: int = 0):
     builder = InlineKeyboardBuilder()
 
     if not conversations:
-        builder.row(InlineKeyboardButton(text="🔙 Закрити", callback_data="close_book"))
+        builder.row(
+            InlineKeyboardButton(
+                text="🔙 Закрити", callback_data=callbacks.pack(callbacks.BOOK_CLOSE)
+            )
+        )
         return builder.as_markup()
 
     for convo in conversations:
@@ -277,7 +330,10 @@ async def book_of_letters(conversations, total_pages: int, page: int = 0):
 
         builder.add(
             InlineKeyboardButton(
-                text=btn_text, callback_data=f"book_thread_{convo['other_id']}"
+                text=btn_text,
+                callback_data=callbacks.pack(
+                    callbacks.BOOK_THREAD, other_id=convo["other_id"]
+                ),
             )
         )
 
@@ -286,60 +342,78 @@ async def book_of_letters(conversations, total_pages: int, page: int = 0):
     nav_row = []
     if page > 0:
         nav_row.append(
-            InlineKeyboardButton(text="⬅️ Назад", callback_data=f"book_page_{page - 1}")
+            InlineKeyboardButton(
+                text="⬅️ Назад",
+                callback_data=callbacks.pack(callbacks.BOOK_PAGE, page=page - 1),
+            )
         )
 
     if page < total_pages - 1:
         nav_row.append(
-            InlineKeyboardButton(text="Далі ➡️", callback_data=f"book_page_{page + 1}")
+            InlineKeyboardButton(
+                text="Далі ➡️",
+                callback_data=callbacks.pack(callbacks.BOOK_PAGE, page=page + 1),
+            )
         )
 
     if nav_row:
         builder.row(*nav_row)
 
     builder.row(
-        InlineKeyboardButton(text="🔙 Закрити Книгу", callback_data="close_book")
+        InlineKeyboardButton(
+            text="🔙 Закрити Книгу", callback_data=callbacks.pack(callbacks.BOOK_CLOSE)
+        )
     )
 
     return builder.as_markup()
 
 
-async def book_letter_back():
+@lru_cache(maxsize=None)
+def book_letter_back():
     builder = InlineKeyboardBuilder()
     builder.row(
         InlineKeyboardButton(
-            text="🔙 Повернутися до історії", callback_data="back_to_book"
+            text="🔙 Повернутися до історії",
+            callback_data=callbacks.pack(callbacks.BOOK_BACK),
         )
     )
     return builder.as_markup()
 
 
-async def history_nav_book(page: int, total_pages: int):
+@lru_cache(maxsize=1024)
+def history_nav(page: int, has_next: bool, from_book: bool = False):
     builder = InlineKeyboardBuilder()
 
     nav_row = []
     if page > 0:
         nav_row.append(
             InlineKeyboardButton(
-                text="⬅️ Назад", callback_data=f"history_page_{page - 1}"
+                text="⬅️ Назад",
+                callback_data=callbacks.pack(callbacks.HISTORY_PAGE, page=page - 1),
             )
         )
 
     nav_row.append(
-        InlineKeyboardButton(text=f"{page + 1}/{total_pages}", callback_data="noop")
+        InlineKeyboardButton(
+            text=f"{page + 1}", callback_data=callbacks.pack(callbacks.NOOP)
+        )
     )
 
-    if page < total_pages - 1:
+    if has_next:
         nav_row.append(
             InlineKeyboardButton(
-                text="Далі ➡️", callback_data=f"history_page_{page + 1}"
+                text="Далі ➡️",
+                callback_data=callbacks.pack(callbacks.HISTORY_PAGE, page=page + 1),
             )
         )
 
     builder.row(*nav_row)
     builder.row(
         InlineKeyboardButton(
-            text="🔙 Повернутися до історії", callback_data="close_history"
+            text=(
+                "🔙 Повернутися до історії" if from_book else "🔙 Повернутися до листа"
+            ),
+            callback_data=callbacks.pack(callbacks.HISTORY_CLOSE),
         )
     )
 
@@ -0,0 +1,122 @@
+import re
+from typing import Iterator
+
+COUNTRY_TLDS = (
+    "ac ad ae af ag ai al am ao aq ar as at au aw ax az ba bb bd be bf bg bh bi bj "
+    "bm bn bo br bs bt bw by bz ca cc cd cf cg ch ci ck cl cm cn co cr cu cv cw cx "
+    "cy cz de dj dk dm do dz ec ee eg er es et eu fi fj fk fm fo fr ga gd ge gf gg "
+    "gh gi gl gm gn gp gq gr gs gt gu gw gy hk hm hn hr ht hu id ie il im in io iq "
+    "ir is it je jm jo jp ke kg kh ki km kn kp kr kw ky kz la lb lc li lk lr ls lt "
+    "lu lv ly ma mc md me mg mh mk ml mm mn mo mp mq mr ms mt mu mv mw mx my mz na "
+    "nc ne nf ng ni nl no np nr nu nz om pa pe pf pg ph pk pl pm pn pr ps pt pw py "
+    "qa re ro rs ru rw sa sb sc sd se sg sh si sk sl sm sn so sr ss st su sv sx sy "
+    "sz tc td tf tg th tj tk tl tm tn to tr tt tv tw tz ua ug uk us uy uz va vc ve "
+    "vg vi vn vu wf ws ye yt za zm zw"
+)
+
+GENERIC_TLDS = (
+    "com net org info biz edu gov mil int name pro mobi tel travel jobs museum aero "
+    "app dev io ai xyz online site top shop store club live tech space website blog "
+    "news link click fun icu vip work life world today email agency media digital "
+    "cloud page one art studio games game video music porn sex xxx adult dating "
+    "chat social network group team zone plus best bet casino win money finance "
+    "academy school university education download stream tube"
+)
+
+IDN_TLDS = "укр рф бел срб мкд қаз мон бг ею"
+
+TLDS = frozenset((COUNTRY_TLDS + " " + GENERIC_TLDS + " " + IDN_TLDS).split())
+
+URL_PREFIXES = ("http://", "https://", "ftp://", "www.", "t.me/", "telegram.me/")
+
+TOKEN_PATTERN = re.compile(r"\S+")
+
+PIECE_PATTERN = re.compile(r"[^:,;!?()\[\]{}<>\"'«»„“”…|]+")
+
+EDGE_PUNCTUATION = "()[]{}<>\"'«»„“”.,!?;:…"
+
+HOST_TERMINATORS = "/?#:"
+
+
+def _is_label(label: str) -> bool:
+    if not label or label[0] == "-" or label[-1] == "-":
+        return False
+
+    for char in label:
+        if not (char.isalnum() or char == "-"):
+            return False
+
+    return True
+
+
+def _is_domain(token: str) -> bool:
+    end = len(token)
+    for terminator in HOST_TERMINATORS:
+        index = token.find(terminator)
+        if index != -1 and index < end:
+            end = index
+
+    host = token[:end]
+    labels = host.split(".")
+
+    if len(labels) < 2 or labels[-1] not in TLDS:
+        return False
+
+    return all(_is_label(label) for label in labels)
+
+
+def _mention(token: str) -> int:
+    index = token.find("@")
+
+    while index != -1:
+        if index + 1 < len(token) and (
+            token[index + 1].isalnum() or token[index + 1] == "_"
+        ):
+            return index
+        index = token.find("@", index + 1)
+
+    return -1
+
+
+def _url_prefix(token: str) -> int:
+    found = -1
+
+    for prefix in URL_PREFIXES:
+        index = token.find(prefix)
+        if index != -1 and (found == -1 or index < found):
+            found = index
+
+    return found
+
+
+def iter_links(text: str) -> Iterator[tuple[int, int, str]]:
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        start = match.start()
+
+        mention = _mention(token)
+        if mention != -1:
+            yield start + mention, match.end(), "mention"
+            continue
+
+        lowered = token.lower()
+        prefix = _url_prefix(lowered)
+        head = lowered if prefix == -1 else lowered[:prefix]
+
+        for piece in PIECE_PATTERN.finditer(head):
+            stripped = piece.group().strip(EDGE_PUNCTUATION)
+            if _is_domain(stripped):
+                offset = start + piece.start() + piece.group().index(stripped)
+                yield offset, offset + len(stripped), "domain"
+
+        if prefix != -1:
+            url = token[prefix:].rstrip(EDGE_PUNCTUATION)
+            yield start + prefix, start + prefix + len(url), "url"
+
+
+def find_links(text: str) -> list[tuple[int, int, str]]:
+    return list(iter_links(text))
+
+
+def contains_links(text: str) -> bool:
+    return next(iter_links(text), None) is not None
@@ -128,6 +128,12 @@ MESSAGES = {
         "🧼 <b>Ой-ой! Мило в студію!</b>\n"
         "Мій детектор ввічливості зашкалює. Давай без грубих слів, ми ж тут про романтику?"
     ),
+    "callback_outdated": "⌛️ Ця кнопка застаріла. Відкрий меню ще раз.",
+    "links_warning": "❌ Посилання неприпустимі у листах!",
+    "spam_warning": (
+        "🔁 <b>Дежавю!</b>\n"
+        "Ти вже надсилав майже такий самий лист. Напиши щось нове — так цікавіше!"
+    ),
     "ban_info": (
         "🚫 <b>Ваш акаунт заблоковано.</b>\n"
         "Схоже, ви серйозно порушили правила спільноти.\n"
@@ -159,6 +165,7 @@ MESSAGES = {
         "📝 <b>Зміст листа:</b>\n<blockquote>{content}</blockquote>"
     ),
     "new_report_notification": "🚨 <b>Шеф, у нас проблема!</b>\nНадійшла нова скарга. Терміново перевірте адмін-панель.",
+    "reports_digest": "🚨 <b>Ще {count} нових скарг</b> за останні хвилини. Перевірте адмін-панель.",
     "report_error": "❌ <b>Збій системи.</b> Не вдалося надіслати скаргу.",
     "admin_welcome": (
         "🕶 <b>Центр Керування (Admin Mode)</b>\n\n"
@@ -202,6 +209,11 @@ MESSAGES = {
     "setadmin_info": "⚠️ <b>Інструкція:</b>\nНадішли: <code>/setadmin 123456789</code>",
     "setadmin_error": "❌ ID має складатися тільки з цифр.",
     "setadmin_success": "✅ Користувач <code>{user_id}</code> отримав <b>адмінські права</b>! 🎉",
+    "activity_info": "⚠️ <b>Інструкція:</b>\nНадішли: <code>/activity 7</code> або <code>/activity 30</code>",
+    "activity_header": (
+        "📈 <b>Активність за {days} днів</b>\n"
+        "✉️ написано · 📬 доставлено · ❌ збої · 🚩 скарги · 🆕 реєстрації · 👥 активні\n"
+    ),
     "today_time_format": "Сьогодні о {time}",
     "yesterday_time_format": "Вчора о {time}",
 }
@@ -2,7 +2,9 @@ from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
+import src.callbacks as callbacks
 import src.database as db
+from src.prefetch import prefetcher
 from src.messages import MESSAGES
 
 
@@ -47,3 +49,48 @@ class CheckRegistrationMiddleware(BaseMiddleware):
             await event.message.answer("⚠️ Натисніть /start для початку!")
 
         return
+
+
+class CallbackDataMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: CallbackQuery,
+        data: Dict[str, Any],
+    ) -> Any:
+        try:
+            op, args = callbacks.unpack(event.data or "")
+        except ValueError:
+            await event.answer(MESSAGES["callback_outdated"], show_alert=True)
+            return
+
+        data["callback_op"] = op
+        data["callback_args"] = args
+
+        return await handler(event, data)
+
+
+class PrefetchMiddleware(BaseMiddleware):
+    PAGE_OPS = frozenset(
+        op.code
+        for op in (
+            callbacks.INBOX_PAGE,
+            callbacks.BOOK_PAGE,
+            callbacks.HISTORY_PAGE,
+            callbacks.NOOP,
+        )
+    )
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        op = data.get("callback_op")
+
+        if user and (op is None or op.code not in self.PAGE_OPS):
+            prefetcher.cancel(user.id)
+
+        return await handler(event, data)
@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+import src.database as db
+import src.utils as utils
+from src import spam
+from src.messages import MESSAGES
+
+logger = logging.getLogger(__name__)
+
+MIN_LENGTH = {"letter": 10, "reply": 2}
+MAX_LENGTH = 1000
+
+VERDICT_CACHE_SIZE = 4096
+OFFLOAD_THRESHOLD: Optional[int] = None
+
+
+class Verdict(NamedTuple):
+    ok: bool
+    reason: Optional[str] = None
+    spans: tuple = ()
+
+    @property
+    def text(self) -> str:
+        return MESSAGES[self.reason].format(max_length=MAX_LENGTH)
+
+
+OK = Verdict(True)
+
+
+def check_length(content: str, kind: str) -> Verdict:
+    if len(content) < MIN_LENGTH[kind]:
+        return Verdict(False, "letter_too_short_error")
+
+    if len(content) > MAX_LENGTH:
+        return Verdict(False, "letter_too_long_error")
+
+    return OK
+
+
+def check_profanity(content: str, kind: str) -> Verdict:
+    spans = utils.find_bad_words(content)
+
+    return Verdict(False, "bad_words_warning", tuple(spans)) if spans else OK
+
+
+def check_links(content: str, kind: str) -> Verdict:
+    spans = utils.find_links(content)
+
+    return Verdict(False, "links_warning", tuple(spans)) if spans else OK
+
+
+CONTENT_STAGES: list[tuple[str, Callable[[str, str], Verdict]]] = [
+    ("length", check_length),
+    ("profanity", check_profanity),
+    ("links", check_links),
+]
+
+
+class VerdictCache:
+    def __init__(self, maxsize: int = VERDICT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple, Verdict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(content: str, kind: str) -> tuple:
+        return kind, hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    def get(self, key: tuple) -> Optional[Verdict]:
+        verdict = self._items.get(key)
+
+        if verdict is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._items.move_to_end(key)
+
+        return verdict
+
+    def put(self, key: tuple, verdict: Verdict):
+        self._items[key] = verdict
+        self._items.move_to_end(key)
+
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+
+verdict_cache = VerdictCache()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="moderation")
+
+
+def _check_content(content: str, kind: str) -> Verdict:
+    for name, stage in CONTENT_STAGES:
+        verdict = stage(content, kind)
+
+        if not verdict.ok:
+            logger.debug(f"Moderation: {kind} rejected at stage {name}")
+            return verdict
+
+    return OK
+
+
+async def _offload(func, content: str, *args):
+    if OFFLOAD_THRESHOLD is None or len(content) < OFFLOAD_THRESHOLD:
+        return func(content, *args)
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _executor, func, content, *args
+    )
+
+
+async def check(content: str, sender_id: int, kind: str = "letter") -> Verdict:
+    key = verdict_cache.key(content, kind)
+    verdict = verdict_cache.get(key)
+
+    if verdict is None:
+        verdict = await _offload(_check_content, content, kind)
+        verdict_cache.put(key, verdict)
+
+    if not verdict.ok:
+        return verdict
+
+    signature = spam.signature(content)
+
+    if signature is not None and sender_id in db.spam_index.senders(signature):
+        return Verdict(False, "spam_warning")
+
+    return OK
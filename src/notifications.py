@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from aiogram import Bot
+
+import config
+import src.database as db
+from src.background import lane
+from src.messages import MESSAGES
+
+logger = logging.getLogger(__name__)
+
+
+class AdminNotifier:
+    def __init__(self, window: float = 60, rate: float = 20):
+        self.window = window
+        self.interval = 1 / rate
+        self.pending = 0
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self._bot: Optional[Bot] = None
+        self._timer: Optional[asyncio.Task] = None
+        self._next_slot = 0.0
+
+    def report(self, bot: Bot):
+        self._bot = bot
+
+        if self._timer is None:
+            lane.submit(self._fan_out(MESSAGES["new_report_notification"]))
+            self._timer = asyncio.create_task(self._window_loop())
+        else:
+            self.pending += 1
+            self.coalesced += 1
+
+    async def _window_loop(self):
+        try:
+            while True:
+                await asyncio.sleep(self.window)
+
+                if not self.pending:
+                    break
+
+                await self.flush()
+        finally:
+            self._timer = None
+
+    async def flush(self):
+        count, self.pending = self.pending, 0
+
+        if count:
+            await self._fan_out(MESSAGES["reports_digest"].format(count=count))
+
+    async def _throttle(self):
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _send(self, admin_id: int, text: str):
+        await self._throttle()
+
+        try:
+            await self._bot.send_message(admin_id, text)
+            self.sent += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Notifier: cannot notify admin {admin_id}: {e}")
+
+    async def _fan_out(self, text: str):
+        admin_ids = await db.get_admins()
+
+        await asyncio.gather(*(self._send(admin_id, text) for admin_id in admin_ids))
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
+        if self._bot is not None:
+            await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "sent": self.sent,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+        }
+
+
+notifier = AdminNotifier(
+    window=config.ADMIN_NOTIFY_WINDOW_SECONDS, rate=config.ADMIN_NOTIFY_RATE
+)
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    def __init__(self, enabled: bool = False, concurrency: int = 8, ttl: float = 30.0):
+        self.enabled = enabled
+        self.ttl = ttl
+        self._budget = asyncio.Semaphore(concurrency)
+        self._tasks: dict[int, tuple[tuple, asyncio.Task]] = {}
+        self._slots: dict[int, tuple[tuple, float, Any]] = {}
+        self.scheduled = 0
+        self.skipped = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.hits = 0
+        self.misses = 0
+
+    def schedule(
+        self, user_id: int, key: tuple, loader: Callable[[], Awaitable[Any]]
+    ):
+        if not self.enabled:
+            return
+
+        self.cancel(user_id)
+
+        if self._budget.locked():
+            self.skipped += 1
+            return
+
+        task = asyncio.create_task(self._run(user_id, key, loader))
+        self._tasks[user_id] = (key, task)
+        self.scheduled += 1
+
+    async def _run(self, user_id: int, key: tuple, loader: Callable):
+        try:
+            async with self._budget:
+                value = await loader()
+
+            self._slots[user_id] = (key, time.monotonic() + self.ttl, value)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Prefetch of {key} for user {user_id} failed: {e}")
+        finally:
+            current = self._tasks.get(user_id)
+
+            if current and current[1] is asyncio.current_task():
+                del self._tasks[user_id]
+
+    def cancel(self, user_id: int):
+        pending = self._tasks.pop(user_id, None)
+        self._slots.pop(user_id, None)
+
+        if pending and not pending[1].done():
+            pending[1].cancel()
+            self.cancelled += 1
+
+    async def take(self, user_id: int, key: tuple) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        pending = self._tasks.get(user_id)
+
+        if pending and pending[0] == key:
+            await asyncio.wait({pending[1]})
+
+        slot = self._slots.pop(user_id, None)
+
+        if slot is None or slot[0] != key or slot[1] < time.monotonic():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return slot[2]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": len(self._tasks),
+            "scheduled": self.scheduled,
+            "skipped": self.skipped,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+prefetcher = Prefetcher(
+    enabled=config.PREFETCH_ENABLED,
+    concurrency=config.PREFETCH_CONCURRENCY,
+    ttl=config.PREFETCH_TTL_SECONDS,
+)
@@ -0,0 +1,209 @@
+import unicodedata
+from typing import Iterable, Iterator
+
+HOMOGLYPHS = {
+    "a": "а",
+    "b": "в",
+    "c": "с",
+    "e": "е",
+    "ё": "е",
+    "h": "н",
+    "i": "і",
+    "k": "к",
+    "m": "м",
+    "o": "о",
+    "p": "р",
+    "r": "г",
+    "t": "т",
+    "u": "и",
+    "x": "х",
+    "y": "у",
+    "0": "о",
+    "3": "з",
+    "4": "ч",
+    "6": "б",
+    "@": "а",
+    "$": "с",
+}
+
+
+_FOLDED: dict[str, str] = {}
+
+
+def _fold(char: str) -> str:
+    folded = _FOLDED.get(char)
+
+    if folded is None:
+        parts = []
+
+        for part in unicodedata.normalize("NFKD", char.casefold()):
+            if unicodedata.combining(part):
+                continue
+
+            part = HOMOGLYPHS.get(part, part)
+
+            if part.isalpha():
+                parts.append(part)
+
+        folded = _FOLDED[char] = "".join(parts)
+
+    return folded
+
+
+def normalize(text: str) -> tuple[str, list[int]]:
+    chars: list[str] = []
+    positions: list[int] = []
+    folded_chars = _FOLDED
+    last = ""
+    run_letters = 0
+    previous_run_letters = 0
+    in_run = False
+
+    for index, char in enumerate(text):
+        folded = folded_chars.get(char)
+        if folded is None:
+            folded = _fold(char)
+
+        if not folded:
+            if in_run:
+                previous_run_letters = run_letters
+                in_run = False
+            continue
+
+        if not in_run:
+            spelled_out = previous_run_letters == 1 and _is_single_letter(text, index)
+
+            if chars and not spelled_out:
+                chars.append(" ")
+                positions.append(index)
+                last = " "
+
+            in_run = True
+            run_letters = 0
+
+        run_letters += 1
+
+        if folded == last:
+            continue
+
+        if len(folded) == 1:
+            chars.append(folded)
+            positions.append(index)
+            last = folded
+            continue
+
+        for part in folded:
+            if part != last:
+                chars.append(part)
+                positions.append(index)
+                last = part
+
+    return "".join(chars), positions
+
+
+def _is_single_letter(text: str, index: int) -> bool:
+    return index + 1 >= len(text) or not _fold(text[index + 1])
+
+
+class AhoCorasick:
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[tuple[int, ...]] = [()]
+        self.patterns: list[str] = []
+        self._pattern_index: dict[str, int] = {}
+
+        for pattern in patterns:
+            self._add(pattern)
+
+        self._build()
+
+    def _add(self, pattern: str):
+        if not pattern or pattern in self._pattern_index:
+            return
+
+        node = 0
+        for char in pattern:
+            next_node = self.goto[node].get(char)
+
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+
+            node = next_node
+
+        self._pattern_index[pattern] = len(self.patterns)
+        self.output[node] += (len(self.patterns),)
+        self.patterns.append(pattern)
+
+    def _build(self):
+        queue = list(self.goto[0].values())
+
+        for node in queue:
+            for char, child in self.goto[node].items():
+                fallback = self.fail[node]
+
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] += self.output[self.fail[child]]
+                queue.append(child)
+
+        self.alphabet = frozenset(char for pattern in self.patterns for char in pattern)
+        self.delta = [dict(transitions) for transitions in self.goto]
+
+    def _transition(self, node: int, char: str) -> int:
+        while node and char not in self.goto[node]:
+            node = self.fail[node]
+
+        return self.goto[node].get(char, 0)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        delta, output, alphabet = self.delta, self.output, self.alphabet
+        node = 0
+
+        for index, char in enumerate(text):
+            if char not in alphabet:
+                node = 0
+                continue
+
+            next_node = delta[node].get(char)
+
+            if next_node is None:
+                next_node = delta[node][char] = self._transition(node, char)
+
+            node = next_node
+
+            for pattern_index in output[node]:
+                yield index, pattern_index
+
+
+class ProfanityFilter:
+    def __init__(self, words: Iterable[str]):
+        self.words: dict[str, str] = {}
+
+        for word in words:
+            pattern = normalize(word)[0]
+            if pattern:
+                self.words.setdefault(pattern, word)
+
+        self.automaton = AhoCorasick(self.words)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str]]:
+        normalized, positions = normalize(text)
+
+        for end, pattern_index in self.automaton.iter_matches(normalized):
+            pattern = self.automaton.patterns[pattern_index]
+            start = end - len(pattern) + 1
+            yield positions[start], positions[end] + 1, self.words[pattern]
+
+    def find(self, text: str) -> list[tuple[int, int, str]]:
+        return list(self.iter_matches(text))
+
+    def contains(self, text: str) -> bool:
+        return next(self.iter_matches(text), None) is not None
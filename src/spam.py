@@ -0,0 +1,123 @@
+import random
+import re
+import time
+from array import array
+from collections import deque
+from functools import lru_cache
+from operator import eq
+from typing import Optional
+
+from src.profanity import normalize
+
+HASH_MASK = (1 << 61) - 1
+SIGNATURE_SIZE = 16
+BANDS = 4
+ROWS = SIGNATURE_SIZE // BANDS
+MIN_SIMILARITY = 0.5
+MIN_FEATURES = 8
+
+WORD_PATTERN = re.compile(r"\w+")
+
+_random = random.Random(0x5EED)
+_MASKS = [_random.getrandbits(61) for _ in range(SIGNATURE_SIZE)]
+
+
+def _features(content: str) -> set[int]:
+    words = WORD_PATTERN.findall(normalize(content)[0])
+    features = set(words)
+    features.update(zip(words, words[1:]))
+
+    return {hash(feature) & HASH_MASK for feature in features}
+
+
+@lru_cache(maxsize=1024)
+def signature(content: str) -> Optional[array]:
+    hashes = _features(content)
+
+    if len(hashes) < MIN_FEATURES:
+        return None
+
+    return array("Q", [min(h ^ mask for h in hashes) for mask in _MASKS])
+
+
+def _band_keys(sig: array) -> list[int]:
+    return [hash(tuple(sig[band * ROWS : (band + 1) * ROWS])) for band in range(BANDS)]
+
+
+def similarity(first: array, second: array) -> float:
+    return sum(map(eq, first, second)) / SIGNATURE_SIZE
+
+
+class NearDuplicateIndex:
+    def __init__(self, window: float, max_entries: int):
+        self.window = window
+        self.max_entries = max_entries
+        self._entries: deque[tuple[int, float]] = deque()
+        self._signatures: dict[int, tuple[array, int]] = {}
+        self._bands: list[dict[int, int | list[int]]] = [{} for _ in range(BANDS)]
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, sig: array, sender_id: int, created_at: Optional[float] = None):
+        entry_id = self._next_id
+        self._next_id += 1
+
+        self._entries.append((entry_id, created_at or time.time()))
+        self._signatures[entry_id] = (sig, sender_id)
+
+        for buckets, key in zip(self._bands, _band_keys(sig)):
+            bucket = buckets.get(key)
+
+            if bucket is None:
+                buckets[key] = entry_id
+            elif isinstance(bucket, list):
+                bucket.append(entry_id)
+            else:
+                buckets[key] = [bucket, entry_id]
+
+        self._evict()
+
+    def _evict(self):
+        deadline = time.time() - self.window
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._entries[0][1] < deadline
+        ):
+            entry_id, _ = self._entries.popleft()
+            sig, _ = self._signatures.pop(entry_id)
+
+            for buckets, key in zip(self._bands, _band_keys(sig)):
+                bucket = buckets[key]
+
+                if not isinstance(bucket, list):
+                    del buckets[key]
+                    continue
+
+                bucket.remove(entry_id)
+
+                if len(bucket) == 1:
+                    buckets[key] = bucket[0]
+
+    def senders(self, sig: array) -> list[int]:
+        self._evict()
+        candidates: set[int] = set()
+
+        for buckets, key in zip(self._bands, _band_keys(sig)):
+            bucket = buckets.get(key)
+
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            elif bucket is not None:
+                candidates.add(bucket)
+
+        senders = []
+
+        for entry_id in candidates:
+            other, sender_id = self._signatures[entry_id]
+
+            if similarity(sig, other) >= MIN_SIMILARITY:
+                senders.append(sender_id)
+
+        return senders
@@ -0,0 +1,215 @@
+import asyncio
+import copy
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+INDEX_OPTIONS_CONFLICT = 85
+
+
+class _Entry:
+    __slots__ = ("state", "data", "dirty", "touched")
+
+    def __init__(self, state: Optional[str], data: Dict[str, Any]):
+        self.state = state
+        self.data = data
+        self.dirty = False
+        self.touched = time.monotonic()
+
+
+class MongoStorage(BaseStorage):
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        state_ttl: int = 72 * 3600,
+        cache_ttl: float = 1.0,
+        flush_interval: float = 0.05,
+        max_dirty: int = 500,
+    ):
+        self.collection = collection
+        self.state_ttl = state_ttl
+        self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self._cache: Dict[str, _Entry] = {}
+        self._dirty: set[str] = set()
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._closing = False
+
+    @staticmethod
+    def _key(key: StorageKey) -> str:
+        return ":".join(
+            str(part) if part is not None else ""
+            for part in (
+                key.bot_id,
+                key.chat_id,
+                key.user_id,
+                key.thread_id,
+                getattr(key, "business_connection_id", None),
+                key.destiny,
+            )
+        )
+
+    async def init(self):
+        try:
+            await self.collection.create_index(
+                "updated_at", expireAfterSeconds=self.state_ttl
+            )
+        except OperationFailure as e:
+            if e.code != INDEX_OPTIONS_CONFLICT:
+                logger.error(f"Error creating FSM storage indexes: {e}")
+                return
+
+            await self._retune_ttl()
+        except PyMongoError as e:
+            logger.error(f"Error creating FSM storage indexes: {e}")
+
+    async def _retune_ttl(self):
+        try:
+            await self.collection.database.command(
+                "collMod",
+                self.collection.name,
+                index={
+                    "keyPattern": {"updated_at": 1},
+                    "expireAfterSeconds": self.state_ttl,
+                },
+            )
+            logger.info(f"FSM storage: state TTL changed to {self.state_ttl}s")
+        except PyMongoError as e:
+            logger.error(f"Error changing FSM storage TTL: {e}")
+
+    async def _load(self, key: StorageKey) -> _Entry:
+        doc_id = self._key(key)
+        entry = self._cache.get(doc_id)
+
+        if entry is None:
+            doc = await self.collection.find_one({"_id": doc_id})
+            entry = self._cache.get(doc_id)
+
+            if entry is None:
+                entry = _Entry(
+                    doc.get("state") if doc else None,
+                    doc.get("data", {}) if doc else {},
+                )
+                self._cache[doc_id] = entry
+
+        entry.touched = time.monotonic()
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+        return entry
+
+    def _mark_dirty(self, key: StorageKey, entry: _Entry):
+        entry.dirty = True
+        self._dirty.add(self._key(key))
+
+        if len(self._dirty) >= self.max_dirty:
+            self._wakeup.set()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        entry = await self._load(key)
+        entry.state = state.state if isinstance(state, State) else state
+        self._mark_dirty(key, entry)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        entry = await self._load(key)
+
+        return entry.state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        entry = await self._load(key)
+        entry.data = copy.deepcopy(dict(data))
+        self._mark_dirty(key, entry)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        entry = await self._load(key)
+
+        return copy.deepcopy(entry.data)
+
+    async def flush(self):
+        if not self._dirty:
+            return
+
+        keys, self._dirty = self._dirty, set()
+        now = datetime.now()
+        operations = []
+
+        for doc_id in keys:
+            entry = self._cache.get(doc_id)
+            if entry is None:
+                continue
+
+            entry.dirty = False
+
+            if entry.state is None and not entry.data:
+                operations.append(DeleteOne({"_id": doc_id}))
+            else:
+                operations.append(
+                    UpdateOne(
+                        {"_id": doc_id},
+                        {
+                            "$set": {
+                                "state": entry.state,
+                                "data": entry.data,
+                                "updated_at": now,
+                            }
+                        },
+                        upsert=True,
+                    )
+                )
+
+        if not operations:
+            return
+
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            logger.error(f"Error flushing {len(operations)} FSM states: {e}")
+
+            for doc_id in keys:
+                entry = self._cache.get(doc_id)
+                if entry is not None:
+                    entry.dirty = True
+                    self._dirty.add(doc_id)
+
+    def _evict(self):
+        deadline = time.monotonic() - self.cache_ttl
+        stale = [
+            doc_id
+            for doc_id, entry in self._cache.items()
+            if not entry.dirty and entry.touched < deadline
+        ]
+
+        for doc_id in stale:
+            del self._cache[doc_id]
+
+    async def _flush_loop(self):
+        while self._cache and not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            await self.flush()
+            self._evict()
+
+    async def close(self) -> None:
+        self._closing = True
+        self._wakeup.set()
+
+        if self._flusher is not None:
+            await self._flusher
+
+        await self.flush()
@@ -1,4 +1,5 @@
-import re
+from src import links
+from src.profanity import ProfanityFilter
 
 BAD_WORDS = [
     "бля",
@@ -45,26 +46,28 @@ BAD_WORDS = [
     "pornhub",
 ]
 
-URL_PATTERN = re.compile(
-    r"(?:http[s]?://[^\s]+|"
-    r"www\.[^\s]+|"
-    r"ftp://[^\s]+|"
-    r"t\.me/[^\s]+|"
-    r"@\w+|"
-    r"(?:https?://)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}[^\s]*)",
-    re.IGNORECASE,
-)
+PROFANITY_FILTER = ProfanityFilter(BAD_WORDS)
+PREVIEW_LENGTH = 20
+
+
+def find_bad_words(text: str) -> list[tuple[int, int, str]]:
+    return PROFANITY_FILTER.find(text)
 
 
 def contains_bad_words(text: str) -> bool:
-    text_lower = text.lower()
+    return PROFANITY_FILTER.contains(text)
 
-    for word in BAD_WORDS:
-        if word in text_lower:
-            return True
 
-    return False
+def find_links(text: str) -> list[tuple[int, int, str]]:
+    return links.find_links(text)
 
 
 def contains_links_or_urls(text: str) -> bool:
-    return bool(URL_PATTERN.search(text))
+    return links.contains_links(text)
+
+
+def letter_preview(content: str) -> str:
+    if len(content) > PREVIEW_LENGTH:
+        return content[:PREVIEW_LENGTH] + "..."
+
+    return content
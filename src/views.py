@@ -0,0 +1,124 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional, Union
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import (
+    InlineKeyboardMarkup,
+    Message,
+    ReplyKeyboardRemove,
+)
+
+from src.background import lane
+
+logger = logging.getLogger(__name__)
+
+VIEW_CACHE_SIZE = 8192
+NOT_MODIFIED = "message is not modified"
+
+
+class Views:
+    def __init__(self, maxsize: int = VIEW_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._rendered: OrderedDict[tuple[int, int], tuple[bytes, bytes]] = (
+            OrderedDict()
+        )
+        self.text_edits = 0
+        self.markup_edits = 0
+        self.skipped = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def _digest(value: Optional[Union[str, InlineKeyboardMarkup]]) -> bytes:
+        if value is None:
+            return b""
+
+        if not isinstance(value, str):
+            value = value.model_dump_json(exclude_none=True)
+
+        return hashlib.blake2b(value.encode(), digest_size=8).digest()
+
+    @staticmethod
+    def _key(message: Message) -> tuple[int, int]:
+        return message.chat.id, message.message_id
+
+    def _remember(self, message: Message, text: bytes, markup: bytes):
+        key = self._key(message)
+        self._rendered[key] = (text, markup)
+        self._rendered.move_to_end(key)
+
+        if len(self._rendered) > self.maxsize:
+            self._rendered.popitem(last=False)
+
+    def _current(self, message: Message) -> tuple[bytes, bytes]:
+        if getattr(message, "text", None):
+            return self._digest(message.html_text), self._digest(
+                getattr(message, "reply_markup", None)
+            )
+
+        return self._rendered.get(self._key(message), (b"", b""))
+
+    def remember(
+        self,
+        message: Message,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+    ):
+        self._remember(message, self._digest(text), self._digest(reply_markup))
+
+    def forget(self, message: Message):
+        self._rendered.pop(self._key(message), None)
+
+    async def edit(
+        self,
+        message: Message,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+        **kwargs,
+    ) -> bool:
+        text_digest = self._digest(text)
+        markup_digest = self._digest(reply_markup)
+        current_text, current_markup = self._current(message)
+
+        if text_digest == current_text and markup_digest == current_markup:
+            self.skipped += 1
+            return False
+
+        try:
+            if text_digest == current_text:
+                self.markup_edits += 1
+                await message.edit_reply_markup(reply_markup=reply_markup)
+            else:
+                self.text_edits += 1
+                await message.edit_text(text, reply_markup=reply_markup, **kwargs)
+
+        except TelegramBadRequest as e:
+            if NOT_MODIFIED not in e.message:
+                raise
+
+            self.not_modified += 1
+
+        self._remember(message, text_digest, markup_digest)
+
+        return True
+
+    async def delete(self, message: Message):
+        self.forget(message)
+        await message.delete()
+
+    async def hide_reply_keyboard(self, message: Message):
+        placeholder = await message.answer("*", reply_markup=ReplyKeyboardRemove())
+        lane.submit(placeholder.delete())
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._rendered),
+            "text_edits": self.text_edits,
+            "markup_edits": self.markup_edits,
+            "skipped": self.skipped,
+            "not_modified": self.not_modified,
+        }
+
+
+views = Views()
@@ -0,0 +1,133 @@
+import asyncio
+import hmac
+import logging
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from pydantic import ValidationError
+
+import src.database as db
+from src import history
+from src.background import lane
+from src.notifications import notifier
+from src.prefetch import prefetcher
+from src.views import views
+from src.writebehind import write_behind
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookServer:
+    def __init__(
+        self,
+        dp: Dispatcher,
+        bot: Bot,
+        secret: str,
+        path: str = "/webhook",
+        workers: int = 32,
+        queue_size: int = 1000,
+    ):
+        self.dp = dp
+        self.bot = bot
+        self.secret = secret
+        self.path = path
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.received = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self._worker_tasks: list[asyncio.Task] = []
+        self._runner: web.AppRunner | None = None
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self.path, self.handle_update)
+        app.router.add_get(f"{self.path}/health", self.handle_health)
+        return app
+
+    async def handle_update(self, request: web.Request) -> web.Response:
+        token = request.headers.get(SECRET_HEADER, "")
+
+        if not hmac.compare_digest(token, self.secret):
+            return web.Response(status=401)
+
+        try:
+            raw = await request.json()
+            update = Update.model_validate(raw, context={"bot": self.bot})
+        except (ValueError, ValidationError):
+            return web.Response(status=400)
+
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            logger.warning(
+                f"Webhook: queue is full, rejecting update {update.update_id}"
+            )
+            return web.Response(status=503, headers={"Retry-After": "1"})
+
+        self.received += 1
+
+        return web.Response()
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "queued": self.queue.qsize(),
+                "received": self.received,
+                "rejected": self.rejected,
+                "processed": self.processed,
+                "failed": self.failed,
+                "history_cache": history.page_cache.stats(),
+                "prefetch": prefetcher.stats(),
+                "views": views.stats(),
+                "background": lane.stats(),
+                "admin_notifications": notifier.stats(),
+                "retention_deleted": db.swept,
+                "write_behind": write_behind.stats(),
+            }
+        )
+
+    async def _worker(self):
+        while True:
+            update = await self.queue.get()
+
+            try:
+                await self.dp.feed_update(self.bot, update)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Webhook: failed to process update {update.update_id}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def start(self, host: str, port: int):
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+        logger.info(f"Webhook: listening on {host}:{port}{self.path}")
+
+    async def stop(self, timeout: float = 10):
+        if self._runner:
+            await self._runner.cleanup()
+
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Webhook: dropping {self.queue.qsize()} queued updates on shutdown"
+            )
+
+        for task in self._worker_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
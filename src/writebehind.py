@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class _Write:
+    __slots__ = ("collection", "filter", "fields", "upsert")
+
+    def __init__(self, collection: AsyncIOMotorCollection, filter: dict, upsert: bool):
+        self.collection = collection
+        self.filter = filter
+        self.fields: dict = {}
+        self.upsert = upsert
+
+
+class WriteBehind:
+    def __init__(self, interval: float = 0.5, max_ops: int = 500):
+        self.interval = interval
+        self.max_ops = max_ops
+        self._pending: dict[tuple, _Write] = {}
+        self._flushing: dict[tuple, _Write] = {}
+        self._timer: Optional[asyncio.Task] = None
+        self._burst: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.queued = 0
+        self.coalesced = 0
+        self.written = 0
+        self.flushes = 0
+        self.failed = 0
+
+    @staticmethod
+    def _key(collection: AsyncIOMotorCollection, filter: dict) -> tuple:
+        return collection.name, *sorted(filter.items())
+
+    def set(
+        self,
+        collection: AsyncIOMotorCollection,
+        filter: dict,
+        fields: dict,
+        upsert: bool = False,
+    ):
+        key = self._key(collection, filter)
+        write = self._pending.get(key)
+
+        if write is None:
+            write = self._pending[key] = _Write(collection, filter, upsert)
+        else:
+            self.coalesced += 1
+
+        write.fields.update(fields)
+        write.upsert = write.upsert or upsert
+        self.queued += 1
+
+        if len(self._pending) >= self.max_ops:
+            if self._burst is None or self._burst.done():
+                self._burst = asyncio.create_task(self.flush())
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_loop())
+
+    def pending(self, collection: AsyncIOMotorCollection, filter: dict) -> dict:
+        key = self._key(collection, filter)
+        fields = {}
+
+        for writes in (self._flushing, self._pending):
+            if key in writes:
+                fields.update(writes[key].fields)
+
+        return fields
+
+    async def _flush_loop(self):
+        try:
+            while self._pending:
+                await asyncio.sleep(self.interval)
+                await self.flush()
+        finally:
+            self._timer = None
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+
+            self._flushing, self._pending = self._pending, {}
+            batches: dict[str, list[_Write]] = {}
+
+            for write in self._flushing.values():
+                batches.setdefault(write.collection.name, []).append(write)
+
+            for writes in batches.values():
+                try:
+                    await writes[0].collection.bulk_write(
+                        [
+                            UpdateOne(
+                                write.filter,
+                                {"$set": write.fields},
+                                upsert=write.upsert,
+                            )
+                            for write in writes
+                        ],
+                        ordered=False,
+                    )
+                    self.written += len(writes)
+                except PyMongoError as e:
+                    self.failed += len(writes)
+                    logger.error(
+                        f"Write-behind: cannot write {len(writes)} updates "
+                        f"to {writes[0].collection.name}, retrying: {e}"
+                    )
+
+                    for write in writes:
+                        key = self._key(write.collection, write.filter)
+                        newer = self._pending.get(key)
+
+                        if newer is not None:
+                            write.fields.update(newer.fields)
+                            write.upsert = write.upsert or newer.upsert
+
+                        self._pending[key] = write
+
+            self._flushing = {}
+            self.flushes += 1
+
+            if self._pending and self._timer is None:
+                self._timer = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        await self.flush()
+
+        if self._timer is not None:
+            self._timer.cancel()
+
+        if self._pending:
+            logger.warning(
+                f"Write-behind: dropping {len(self._pending)} unwritten updates"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._pending) + len(self._flushing),
+            "queued": self.queued,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failed": self.failed,
+        }
+
+
+write_behind = WriteBehind(
+    interval=config.WRITE_BEHIND_INTERVAL_MS / 1000,
+    max_ops=config.WRITE_BEHIND_MAX_OPS,
+)